@@ -0,0 +1,106 @@
+# benchmarks/bench_density_extractor.py
+"""衡量文本密度快速提取对正文提取耗时的影响。
+
+在同一份语料上分别只运行 newspaper3k/readability/gne 级联，以及先运行快速提取、
+置信度不足时再级联，比较耗时、快速提取的命中率以及与级联结果的一致程度：
+
+    # 录制的语料（python -m benchmarks.hn_simulator record --path benchmarks/corpus）
+    python -m benchmarks.bench_density_extractor --corpus benchmarks/corpus
+    # 随机生成的语料
+    python -m benchmarks.bench_density_extractor --pages 200 --json density.json
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import json, time, argparse
+
+from src.url_extractor import ContentExtractor
+from util.extractor_stats import ExtractorStats, EXTRACTORS
+from util.content_cache import ContentCache
+from util.circuit_breaker import CircuitBreaker
+from util.download import decode_html, parse_content_type
+from benchmarks.hn_simulator import Corpus
+from benchmarks.utils import NullLogger, percentiles
+
+from config.config import DENSITY_MIN_CONFIDENCE
+
+
+def load_pages(corpus: Corpus) -> list:
+    """返回语料中的网页：[(HTML, URL), ...]，PDF 跳过。"""
+    pages = []
+    for item_id, (content_type, body) in sorted(corpus.pages.items()):
+        if 'pdf' in content_type:
+            continue
+        url = corpus.items.get(item_id, {}).get('url') or f'https://example.com/posts/{item_id}'
+        pages.append((decode_html(body, parse_content_type(content_type)[1]), url))
+    return pages
+
+
+def similarity(a: str, b: str) -> float:
+    """两段正文词集合的 Jaccard 相似度。"""
+    left, right = set(a.split()), set(b.split())
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def run_mode(pages: list, min_confidence: float) -> dict:
+    extractor = ContentExtractor(extractor_stats=ExtractorStats(':memory:', logger=NullLogger()),
+                                 content_cache=ContentCache(':memory:', logger=NullLogger()),
+                                 circuit_breaker=CircuitBreaker(':memory:', logger=NullLogger()))
+    extractor.logger = NullLogger()
+    extractor.density_min_confidence = min_confidence
+    # 预热 lxml 与各提取库，避免首次调用的导入与初始化计入耗时
+    extractor.try_extractors(pages[0][0], pages[0][1], 'en', EXTRACTORS)
+    latencies, contents, names = [], [], []
+    for html, url in pages:
+        started = time.perf_counter()
+        content, name, _ = extractor.try_extractors(html, url, 'en', EXTRACTORS)
+        latencies.append(time.perf_counter() - started)
+        contents.append(content)
+        names.append(name)
+    return {'latencies': latencies, 'contents': contents, 'names': names}
+
+
+def run(pages: list, min_confidence: float = DENSITY_MIN_CONFIDENCE) -> dict:
+    cascade = run_mode(pages, 2.0)
+    fast = run_mode(pages, min_confidence)
+    hits = [i for i, name in enumerate(fast['names']) if name == 'density']
+    report = {'pages': len(pages), 'min_confidence': min_confidence}
+    for mode, result in (('cascade', cascade), ('fast_path', fast)):
+        total = sum(result['latencies'])
+        report[mode] = {
+            'total_s': round(total, 3),
+            'pages_per_s': round(len(pages) / total, 1) if total else 0.0,
+            'extracted': sum(1 for content in result['contents'] if content),
+            **{key: round(value * 1000, 2) for key, value in percentiles(result['latencies']).items()},
+        }
+    report['fast_path_hit_rate'] = round(len(hits) / len(pages), 3) if pages else 0.0
+    report['agreement'] = round(
+        sum(similarity(fast['contents'][i], cascade['contents'][i]) for i in hits) / len(hits), 3
+    ) if hits else 0.0
+    report['speedup'] = round(report['cascade']['total_s'] / report['fast_path']['total_s'], 2) \
+        if report['fast_path']['total_s'] else 0.0
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='hn_simulator record/save 保存的语料目录，不指定时随机生成')
+    parser.add_argument('--pages', type=int, default=200, help='随机生成的页面数')
+    parser.add_argument('--min-confidence', type=float, default=DENSITY_MIN_CONFIDENCE)
+    parser.add_argument('--json', help='把结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    corpus = Corpus.load(args.corpus) if args.corpus else Corpus.synthetic(args.pages, pdf_ratio=0.0)
+    report = run(load_pages(corpus), args.min_confidence)
+    for mode in ('cascade', 'fast_path'):
+        stats = report[mode]
+        print(f"{mode:<10s} pages={report['pages']:<5d} extracted={stats['extracted']:<5d} "
+              f"total={stats['total_s']:.3f}s throughput={stats['pages_per_s']:.1f} pages/s "
+              f"p50={stats['p50']:.2f}ms p95={stats['p95']:.2f}ms")
+    print(f"fast path hit rate={report['fast_path_hit_rate']:.1%} agreement={report['agreement']:.3f} "
+          f"speedup={report['speedup']:.2f}x")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
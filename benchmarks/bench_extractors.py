@@ -0,0 +1,264 @@
+# benchmarks/bench_extractors.py
+"""离线对比各正文提取器的速度与输出质量。
+
+对语料中的每个网页分别运行 density、newspaper3k、readability、gne，对每个 PDF
+运行 PyMuPDF，报告单篇耗时分布、峰值内存、正文长度以及与参考正文的一致程度
+（词级 F1），结果写成 JSON，便于在不同版本之间对比：
+
+    # 录制的语料，参考正文放在 {corpus}/references/{id}.txt（可选）
+    python -m benchmarks.bench_extractors --corpus benchmarks/corpus --json extractors.json
+    # 随机生成的语料，参考正文为生成时的 <article> 与 PDF 全文
+    python -m benchmarks.bench_extractors --pages 200 --pdf-ratio 0.1 --json extractors.json
+    # 与上一版本的报告对比
+    python -m benchmarks.bench_extractors --corpus benchmarks/corpus --baseline extractors.json
+
+每个提取器在单独的进程中运行。内存报告两项：rss_mb 为该进程从导入提取库之前
+到处理完全部文档的最大常驻内存增量，包含库本身与 lxml、PyMuPDF 在 C 层分配的
+内存；peak_mb 为单篇文档处理期间 Python 堆的峰值（tracemalloc），取各篇的
+中位数与最大值。tracemalloc 会拖慢执行，因此在计时之后单独再跑一遍。
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import json, time, platform, argparse, resource, tempfile, statistics, tracemalloc
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.hn_simulator import Corpus
+from benchmarks.utils import NullLogger, percentiles
+
+HTML_EXTRACTORS = ('density', 'newspaper3k', 'readability', 'gne')
+PDF_EXTRACTORS = ('PyMuPDF',)
+PACKAGES = ('newspaper3k', 'readability-lxml', 'gne', 'PyMuPDF', 'lxml')
+
+
+def load_documents(corpus: Corpus, corpus_path: Optional[str] = None) -> List[Dict]:
+    """把语料整理为文档列表：[{id, kind, url, body, reference}, ...]。
+
+    参考正文优先读取 {corpus_path}/references/{id}.txt；随机生成的语料没有该目录，
+    网页取 <article> 的文本，PDF 取全部页面的文本。
+    """
+    from util.download import decode_html, parse_content_type
+    from util.html_document import HtmlDocument, node_to_text
+
+    documents = []
+    for item_id, (content_type, body) in sorted(corpus.pages.items()):
+        kind = 'pdf' if 'pdf' in content_type else 'html'
+        url = corpus.items.get(item_id, {}).get('url') or f'https://example.com/posts/{item_id}'
+        if kind == 'html':
+            body = decode_html(body, parse_content_type(content_type)[1])
+        reference = None
+        path = os.path.join(corpus_path, 'references', f'{item_id}.txt') if corpus_path else None
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                reference = f.read()
+        elif corpus_path is None and kind == 'html':
+            article = HtmlDocument(body).tree.find('.//article')
+            reference = node_to_text(article) if article is not None else None
+        elif corpus_path is None:
+            reference = _pdf_text(body, max_pages=10 ** 6, max_chars=10 ** 9)
+        documents.append({'id': item_id, 'kind': kind, 'url': url, 'body': body, 'reference': reference})
+    return documents
+
+
+def _pdf_text(body: bytes, **kwargs) -> str:
+    from util.pdf_extractor import extract_pdf_text
+    handle, path = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(body)
+        return extract_pdf_text(path, **kwargs)
+    finally:
+        os.remove(path)
+
+
+def token_f1(candidate: str, reference: str) -> float:
+    """按词计算候选正文相对参考正文的 F1。"""
+    left, right = Counter(candidate.split()), Counter(reference.split())
+    overlap = sum((left & right).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(left.values())
+    recall = overlap / sum(right.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _max_rss_mb() -> float:
+    """当前进程常驻内存的最高水位（MB）。
+
+    Linux 上 ru_maxrss 会跨 exec 继承父进程的最高水位，spawn 出的子进程读到的是
+    父进程的峰值，因此优先读取随地址空间重置的 /proc/self/status 中的 VmHWM。
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def run_extractor(name: str, documents: List[Dict]) -> Dict:
+    """在当前进程中对 documents 运行一个提取器，返回每篇的耗时与正文，以及内存占用。"""
+    # 常驻内存的基线取在导入提取库之前，ru_maxrss 是进程的最高水位，之后只会增加
+    baseline = _max_rss_mb()
+    from src.url_extractor import ContentExtractor
+    from util.extractor_stats import ExtractorStats
+    from util.content_cache import ContentCache
+    from util.circuit_breaker import CircuitBreaker
+    from util.html_document import HtmlDocument
+
+    extractor = ContentExtractor(extractor_stats=ExtractorStats(':memory:', logger=NullLogger()),
+                                 content_cache=ContentCache(':memory:', logger=NullLogger()),
+                                 circuit_breaker=CircuitBreaker(':memory:', logger=NullLogger()))
+    extractor.logger = NullLogger()
+    extractor.density_min_confidence = 0.0
+
+    def extract(document: Dict) -> str:
+        if name == 'PyMuPDF':
+            return _pdf_text(document['body'])
+        html, url = document['body'], document['url']
+        if name == 'density':
+            return extractor.extract_content_by_density(HtmlDocument(html, url))
+        if name == 'newspaper3k':
+            return extractor.extract_content_by_newspaper(html, url, 'en')
+        if name == 'readability':
+            return extractor.extract_content_by_readability(HtmlDocument(html, url))
+        return extractor.extract_content_by_gne(HtmlDocument(html, url))
+
+    # 预热：导入与首次调用的初始化不计入耗时与内存
+    if documents:
+        extract(documents[0])
+    results = []
+    for document in documents:
+        started = time.perf_counter()
+        content = extract(document)
+        results.append((document['id'], time.perf_counter() - started, content))
+
+    # 单篇文档的 Python 堆峰值：每篇开始前重置峰值，结束后读取
+    peaks = []
+    tracemalloc.start()
+    try:
+        for document in documents:
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            extract(document)
+            peaks.append((tracemalloc.get_traced_memory()[1] - current) / (1024 * 1024))
+    finally:
+        tracemalloc.stop()
+    return {'results': results, 'peak_rss_mb': round(_max_rss_mb() - baseline, 1), 'peak_mb': peaks}
+
+
+def summarize(name: str, documents: List[Dict], run: Dict) -> Dict:
+    references = {document['id']: document['reference'] for document in documents}
+    latencies = [latency for _, latency, _ in run['results']]
+    lengths = [len(content) for _, _, content in run['results']]
+    scores = [token_f1(content, references[item_id]) for item_id, _, content in run['results']
+              if references[item_id] is not None]
+    return {
+        'documents': len(run['results']),
+        'extracted': sum(1 for length in lengths if length),
+        'latency_ms': {
+            **{key: round(value * 1000, 2) for key, value in percentiles(latencies).items()},
+            'mean': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+            'max': round(max(latencies) * 1000, 2) if latencies else 0.0,
+        },
+        'rss_mb': run['peak_rss_mb'],
+        'peak_mb': {
+            'median': round(statistics.median(run['peak_mb']), 2) if run['peak_mb'] else 0.0,
+            'max': round(max(run['peak_mb']), 2) if run['peak_mb'] else 0.0,
+        },
+        'length': {
+            'mean': round(statistics.fmean(lengths), 1) if lengths else 0.0,
+            'median': statistics.median(lengths) if lengths else 0,
+        },
+        'agreement_f1': {
+            'scored': len(scores),
+            'mean': round(statistics.fmean(scores), 3) if scores else None,
+            'median': round(statistics.median(scores), 3) if scores else None,
+        },
+    }
+
+
+def run(documents: List[Dict], extractors: Tuple[str, ...] = HTML_EXTRACTORS + PDF_EXTRACTORS,
+        per_document: bool = False) -> Dict:
+    """依次在独立进程中运行各提取器，返回报告。"""
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'packages': {package: _version(package) for package in PACKAGES},
+        },
+        'corpus': {
+            'html': sum(1 for document in documents if document['kind'] == 'html'),
+            'pdf': sum(1 for document in documents if document['kind'] == 'pdf'),
+            'with_reference': sum(1 for document in documents if document['reference'] is not None),
+        },
+        'extractors': {},
+    }
+    for name in extractors:
+        kind = 'pdf' if name in PDF_EXTRACTORS else 'html'
+        selected = [document for document in documents if document['kind'] == kind]
+        if not selected:
+            continue
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            result = executor.submit(run_extractor, name, selected).result()
+        report['extractors'][name] = summarize(name, selected, result)
+        if per_document:
+            report['extractors'][name]['per_document'] = {
+                str(item_id): {'latency_ms': round(latency * 1000, 2), 'length': len(content)}
+                for item_id, latency, content in result['results']
+            }
+    return report
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def print_report(report: Dict, baseline: Optional[Dict] = None) -> None:
+    for name, stats in report['extractors'].items():
+        latency, agreement = stats['latency_ms'], stats['agreement_f1']
+        line = (f"{name:<12s} docs={stats['documents']:<5d} extracted={stats['extracted']:<5d} "
+                f"p50={latency['p50']:.2f}ms p95={latency['p95']:.2f}ms p99={latency['p99']:.2f}ms "
+                f"rss={stats['rss_mb']:.1f}MB peak={stats['peak_mb']['median']:.2f}/{stats['peak_mb']['max']:.2f}MB "
+                f"len={stats['length']['mean']:.0f} "
+                f"f1={agreement['mean'] if agreement['mean'] is not None else '-'}")
+        previous = (baseline or {}).get('extractors', {}).get(name)
+        if previous:
+            line += (f"  Δp50={latency['p50'] - previous['latency_ms']['p50']:+.2f}ms"
+                     f" Δf1={(agreement['mean'] or 0) - (previous['agreement_f1']['mean'] or 0):+.3f}")
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help='hn_simulator record/save 保存的语料目录，不指定时随机生成')
+    parser.add_argument('--pages', type=int, default=100, help='随机生成的新闻条数')
+    parser.add_argument('--pdf-ratio', type=float, default=0.1, help='随机生成的语料中 PDF 的比例')
+    parser.add_argument('--extractors', nargs='+', default=list(HTML_EXTRACTORS + PDF_EXTRACTORS),
+                        choices=HTML_EXTRACTORS + PDF_EXTRACTORS)
+    parser.add_argument('--per-document', action='store_true', help='在报告中保留每篇文档的耗时与长度')
+    parser.add_argument('--json', help='把报告写入 JSON 文件')
+    parser.add_argument('--baseline', help='与之对比的旧报告')
+    args = parser.parse_args()
+
+    corpus = Corpus.load(args.corpus) if args.corpus else Corpus.synthetic(args.pages, pdf_ratio=args.pdf_ratio)
+    report = run(load_documents(corpus, args.corpus), tuple(args.extractors), args.per_document)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
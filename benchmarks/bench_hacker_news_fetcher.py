@@ -0,0 +1,40 @@
+# benchmarks/bench_hacker_news_fetcher.py
+"""对比 HackerNewsFetcher 串行抓取与线程池并发抓取的耗时。
+
+在本地启动带固定延迟的 Hacker News API 模拟器，避免依赖外部网络：
+
+    python -m benchmarks.bench_hacker_news_fetcher --top-n 200 --latency 0.05
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, argparse
+
+from util.hacker_news_fetcher import HackerNewsFetcher
+from benchmarks.hn_simulator import Corpus, HNSimulator
+from benchmarks.utils import NullLogger
+
+
+def run(top_n: int, latency: float, workers: list) -> dict:
+    results = {}
+    with HNSimulator(Corpus.synthetic(top_n, with_pages=False), latency=latency) as simulator:
+        for max_workers in workers:
+            fetcher = HackerNewsFetcher(top_n=top_n, logger=NullLogger(),
+                                        max_workers=max_workers, base_url=simulator.api_base)
+            start = time.perf_counter()
+            news_list = fetcher.fetch_latest_news()
+            elapsed = time.perf_counter() - start
+            assert len(news_list) == top_n
+            results[max_workers] = elapsed
+            print(f"max_workers={max_workers:<4d} items={len(news_list):<5d} "
+                  f"elapsed={elapsed:.3f}s  speedup={results[workers[0]] / elapsed:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top-n', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05, help='每个请求的模拟延迟（秒）')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8, 16, 32])
+    args = parser.parse_args()
+    run(args.top_n, args.latency, args.workers)
@@ -0,0 +1,55 @@
+# benchmarks/bench_parse_pool.py
+"""对比在线程池与进程池中解析网页正文的吞吐量。
+
+解析使用随机生成的文章页面，不涉及网络，只衡量 CPU 密集部分：
+
+    python -m benchmarks.bench_parse_pool --pages 200 --workers 1 2 4 8
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from src.url_extractor import parse_html, init_parse_worker
+from util.extractor_stats import EXTRACTORS
+from util.parse_pool import ParsePool
+from benchmarks.hn_simulator import Corpus
+from benchmarks.utils import NullLogger
+
+
+def load_pages(count: int) -> list:
+    corpus = Corpus.synthetic(count, pdf_ratio=0.0)
+    return [(body.decode('utf-8'), f'https://example.com/posts/{item_id}')
+            for item_id, (content_type, body) in corpus.pages.items()]
+
+
+def run(pages: list, workers: list) -> dict:
+    # 关闭日志，避免日志 IO 干扰计时
+    init_parse_worker(NullLogger())
+    results = {}
+    for max_workers in workers:
+        for mode in ('threads', 'processes'):
+            if mode == 'threads':
+                executor = ThreadPoolExecutor(max_workers=max_workers)
+                submit = executor.submit
+            else:
+                executor = ParsePool(max_workers, initializer=init_parse_worker, initargs=(NullLogger(),))
+                submit = executor.submit
+            start = time.perf_counter()
+            futures = [submit(parse_html, html, url, 'en', EXTRACTORS) for html, url in pages]
+            parsed = sum(1 for future in futures if future.result()[0])
+            elapsed = time.perf_counter() - start
+            executor.shutdown()
+            results[(mode, max_workers)] = elapsed
+            print(f"{mode:<10s} workers={max_workers:<3d} pages={parsed:<5d} "
+                  f"elapsed={elapsed:.3f}s throughput={len(pages) / elapsed:.1f} pages/s")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+    run(load_pages(args.pages), args.workers)
@@ -0,0 +1,148 @@
+# benchmarks/bench_text_clean.py
+"""对比逐步清理与合并后的 TextCleaner.clean_text 在大文档上的耗时。
+
+逐步清理依次调用各个 remove_* 方法（即合并之前 clean_text 的做法），每一步都
+扫描并复制整篇文本；clean_text 跳过不含触发字符的步骤并合并扫描。两者的结果
+必须一致：
+
+    # 默认：中英混合的网页片段拼成 1MB 左右的文档
+    python -m benchmarks.bench_text_clean --size-kb 1024 --documents 20
+    # 纯文本（不含标签与链接）
+    python -m benchmarks.bench_text_clean --plain --json text_clean.json
+    # 批量清理 20000 篇 4KB 的文章，对比不同进程数的吞吐量
+    python -m benchmarks.bench_text_clean --batch 20000 --size-kb 4 --workers 0 1 2 4
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import json, time, random, argparse, resource
+from typing import List
+
+from util.text_clean import TextCleaner, init_clean_worker
+from util.parse_pool import ParsePool
+from benchmarks.utils import percentiles
+
+from config.config import CLEAN_CHUNK_SIZE
+
+HTML_FRAGMENTS = [
+    '<p>', '</p>', '<a href="https://example.com/posts/1">', '</a>', '<br/>',
+    'https://news.ycombinator.com/item?id=41234567 ', 'contact: editor@example.com ',
+    'server 192.168.10.254 ', '<div class="content">', '</div>',
+]
+TEXT_FRAGMENTS = [
+    'The quick brown fox jumps over the lazy dog. ', 'Performance matters, but correctness first. ',
+    '机器学习模型在生产环境中的部署需要考虑延迟与吞吐量。', '今天天气很好，我们去公园散步吧！', '哈哈哈', '  ',
+    'Ｆｕｌｌ　ｗｉｄｔｈ　ＡＢＣ１２３', '--', '\n\n', '①②③', '℃', '•••', 'naïve café résumé ', '\x00\x1f',
+]
+
+
+def make_documents(count: int, size: int, plain: bool = False, seed: int = 0) -> List[str]:
+    """生成 count 篇约 size 个字符的文档。"""
+    rng = random.Random(seed)
+    fragments = TEXT_FRAGMENTS if plain else TEXT_FRAGMENTS + HTML_FRAGMENTS
+    documents = []
+    for _ in range(count):
+        parts, length = [], 0
+        while length < size:
+            fragment = rng.choice(fragments)
+            parts.append(fragment)
+            length += len(fragment)
+        documents.append(''.join(parts))
+    return documents
+
+
+def clean_stepwise(cleaner: TextCleaner, text: str) -> str:
+    """合并之前的清理顺序：每一步扫描整篇文本。"""
+    if not text:
+        return ''
+    text = cleaner.remove_html_tags(text)
+    text = cleaner.remove_urls(text)
+    text = cleaner.remove_exception_char(text)
+    text = cleaner.remove_email(text)
+    text = cleaner.convert_full2half(text)
+    text = cleaner.remove_redundant_char(text)
+    return cleaner.remove_ip_address(text)
+
+
+def run(documents: List[str]) -> dict:
+    cleaner = TextCleaner()
+    modes = {'stepwise': lambda text: clean_stepwise(cleaner, text), 'fused': cleaner.clean_text}
+    # 预热：CleanTable 在第一次遇到某个字符时才缓存映射
+    for clean in modes.values():
+        clean(documents[0])
+    chars = sum(len(document) for document in documents)
+    report = {'documents': len(documents), 'chars': chars}
+    outputs = {}
+    for mode, clean in modes.items():
+        latencies, results = [], []
+        for document in documents:
+            started = time.perf_counter()
+            results.append(clean(document))
+            latencies.append(time.perf_counter() - started)
+        outputs[mode] = results
+        total = sum(latencies)
+        report[mode] = {
+            'total_s': round(total, 3),
+            'mb_per_s': round(chars / total / 1e6, 2) if total else 0.0,
+            **{key: round(value * 1000, 2) for key, value in percentiles(latencies).items()},
+        }
+    report['identical'] = outputs['stepwise'] == outputs['fused']
+    report['speedup'] = round(report['stepwise']['total_s'] / report['fused']['total_s'], 2) \
+        if report['fused']['total_s'] else 0.0
+    return report
+
+
+def run_batch(documents: List[str], workers: List[int], chunk_size: int) -> dict:
+    """用 clean_batch 清理全部文档，对比不同进程数的吞吐量；进程池的启动不计入耗时。"""
+    cleaner = TextCleaner()
+    chars = sum(len(document) for document in documents)
+    report = {'documents': len(documents), 'chars': chars, 'chunk_size': chunk_size, 'workers': {}}
+    expected = None
+    for count in workers:
+        with ParsePool(count, initializer=init_clean_worker) as pool:
+            started = time.perf_counter()
+            results = list(cleaner.clean_batch(iter(documents), chunk_size=chunk_size, pool=pool))
+            elapsed = time.perf_counter() - started
+        expected = expected if expected is not None else results
+        report['workers'][count] = {
+            'total_s': round(elapsed, 3),
+            'docs_per_s': round(len(documents) / elapsed, 1) if elapsed else 0.0,
+            'mb_per_s': round(chars / elapsed / 1e6, 2) if elapsed else 0.0,
+            'identical': results == expected,
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--documents', type=int, default=20, help='文档数')
+    parser.add_argument('--size-kb', type=int, default=1024, help='每篇文档的字符数（千）')
+    parser.add_argument('--plain', action='store_true', help='只生成纯文本，不含标签、链接与邮箱')
+    parser.add_argument('--batch', type=int, default=0, help='批量清理的文档数，指定时改为对比 clean_batch 的进程数')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4], help='clean_batch 的进程数')
+    parser.add_argument('--chunk-size', type=int, default=CLEAN_CHUNK_SIZE, help='clean_batch 每个任务的文档数')
+    parser.add_argument('--json', help='把结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    if args.batch:
+        report = run_batch(make_documents(args.batch, args.size_kb * 1024, args.plain), args.workers,
+                           args.chunk_size)
+        for count, stats in report['workers'].items():
+            print(f"workers={count:<3d} docs={report['documents']:<6d} total={stats['total_s']:.3f}s "
+                  f"throughput={stats['docs_per_s']:.1f} docs/s ({stats['mb_per_s']:.2f}M chars/s) "
+                  f"identical={stats['identical']} rss={stats['peak_rss_mb']:.1f}MB")
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        sys.exit(0)
+
+    report = run(make_documents(args.documents, args.size_kb * 1024, args.plain))
+    for mode in ('stepwise', 'fused'):
+        stats = report[mode]
+        print(f"{mode:<9s} docs={report['documents']:<4d} total={stats['total_s']:.3f}s "
+              f"throughput={stats['mb_per_s']:.2f}M chars/s p50={stats['p50']:.2f}ms p95={stats['p95']:.2f}ms")
+    print(f"identical={report['identical']} speedup={report['speedup']:.2f}x")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
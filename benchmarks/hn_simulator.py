@@ -0,0 +1,344 @@
+# benchmarks/hn_simulator.py
+"""本地的 Hacker News API 与文章站点模拟器。
+
+从录制的语料（或随机生成的语料）提供 topstories.json、item/{id}.json、
+updates.json 等接口以及文章 HTML/PDF 页面，可配置延迟、错误率与慢速响应，
+用于在没有网络的情况下压测 HackerNewsFetcher 与 ContentExtractor。
+
+    # 录制真实数据作为语料
+    python -m benchmarks.hn_simulator record --top-n 50 --path benchmarks/corpus
+    # 启动模拟器
+    python -m benchmarks.hn_simulator serve --latency 0.05 --error-rate 0.02
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import re, json, time, random, argparse, threading
+from typing import Dict, List, Optional, Tuple
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+FEED_NAMES = ['top', 'new', 'best', 'ask', 'show', 'job']
+
+WORDS = (
+    'latency throughput cache kernel compiler database query index shard replica '
+    'network packet socket thread process memory allocator garbage collector '
+    'benchmark profile vector scalar branch predictor pipeline register '
+    'startup founder product market customer revenue growth hiring remote '
+    'open source license community maintainer release version patch review'
+).split()
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return ' '.join(
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + '.'
+        for _ in range(sentences)
+    )
+
+
+def _article_html(rng: random.Random, title: str, paragraphs: int) -> str:
+    nav = ''.join(f'<li><a href="/section/{i}">{rng.choice(WORDS)}</a></li>' for i in range(12))
+    body = ''.join(f'<p>{_paragraph(rng, rng.randint(3, 7))}</p>' for _ in range(paragraphs))
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head><body>'
+        f'<header><nav><ul>{nav}</ul></nav></header>'
+        f'<div class="sidebar"><h3>Related</h3><ul>{nav}</ul></div>'
+        f'<article><h1>{title}</h1>{body}</article>'
+        f'<footer><p>Copyright example.com. All rights reserved.</p><ul>{nav}</ul></footer>'
+        f'</body></html>'
+    )
+
+
+def _article_pdf(rng: random.Random, title: str, pages: int) -> bytes:
+    import fitz
+    document = fitz.open()
+    for _ in range(pages):
+        page = document.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 550, 800), f'{title}\n\n{_paragraph(rng, 12)}')
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+class Corpus:
+    """模拟器使用的语料：条目、新闻列表、用户资料与文章页面。
+
+    Attributes:
+        items: 条目 ID 到条目详情的映射。
+        feeds: 新闻列表名称（top、new 等）到条目 ID 列表的映射。
+        users: 用户名到用户资料的映射。
+        pages: 条目 ID 到（Content-Type, 页面内容）的映射。
+    """
+
+    def __init__(self, items: Dict[int, Dict], feeds: Dict[str, List[int]],
+                 users: Optional[Dict[str, Dict]] = None,
+                 pages: Optional[Dict[int, Tuple[str, bytes]]] = None):
+        self.items = items
+        self.feeds = feeds
+        self.users = users or {}
+        self.pages = pages or {}
+
+    @classmethod
+    def synthetic(cls, n_items: int = 500, pdf_ratio: float = 0.05, seed: int = 0,
+                  with_pages: bool = True) -> 'Corpus':
+        """生成随机语料。
+
+        Args:
+            n_items: 新闻条数。
+            pdf_ratio: 链接指向 PDF 的新闻比例。
+            seed: 随机种子。
+            with_pages: 是否生成文章页面。
+        """
+        rng = random.Random(seed)
+        items, pages, users = {}, {}, {}
+        base_id = 40000000
+        for offset in range(n_items):
+            item_id = base_id + offset
+            title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 9))).title()
+            by = f'user{rng.randint(1, 200)}'
+            is_pdf = rng.random() < pdf_ratio
+            items[item_id] = {
+                'id': item_id, 'type': 'story', 'by': by, 'time': 1700000000 + offset * 60,
+                'title': title, 'score': rng.randint(1, 900), 'descendants': 0, 'kids': [],
+                'url': f'https://example.com/{"papers" if is_pdf else "posts"}/{item_id}{".pdf" if is_pdf else ""}',
+            }
+            users.setdefault(by, {'id': by, 'created': 1500000000, 'karma': rng.randint(1, 10000)})
+            if with_pages:
+                pages[item_id] = (
+                    ('application/pdf', _article_pdf(rng, title, rng.randint(1, 4))) if is_pdf
+                    else ('text/html; charset=utf-8', _article_html(rng, title, rng.randint(4, 20)).encode('utf-8'))
+                )
+        ids = sorted(items, reverse=True)
+        feeds = {name: ids[:] for name in FEED_NAMES}
+        feeds['top'] = sorted(ids, key=lambda item_id: -items[item_id]['score'])
+        return cls(items, feeds, users, pages)
+
+    @classmethod
+    def load(cls, path: str) -> 'Corpus':
+        """从目录读取语料，目录结构与 save 相同。"""
+        with open(os.path.join(path, 'items.json'), encoding='utf-8') as f:
+            data = json.load(f)
+        pages = {}
+        pages_dir = os.path.join(path, 'pages')
+        if os.path.isdir(pages_dir):
+            for name in os.listdir(pages_dir):
+                item_id, ext = os.path.splitext(name)
+                content_type = 'application/pdf' if ext == '.pdf' else 'text/html; charset=utf-8'
+                with open(os.path.join(pages_dir, name), 'rb') as f:
+                    pages[int(item_id)] = (content_type, f.read())
+        items = {int(item_id): item for item_id, item in data['items'].items()}
+        return cls(items, data['feeds'], data.get('users', {}), pages)
+
+    def save(self, path: str) -> None:
+        """把语料写入目录：items.json 与 pages/{id}.html|pdf。"""
+        os.makedirs(os.path.join(path, 'pages'), exist_ok=True)
+        with open(os.path.join(path, 'items.json'), 'w', encoding='utf-8') as f:
+            json.dump({'items': self.items, 'feeds': self.feeds, 'users': self.users}, f, ensure_ascii=False)
+        for item_id, (content_type, body) in self.pages.items():
+            ext = '.pdf' if 'pdf' in content_type else '.html'
+            with open(os.path.join(path, 'pages', f'{item_id}{ext}'), 'wb') as f:
+                f.write(body)
+
+    @classmethod
+    def record(cls, top_n: int = 50) -> 'Corpus':
+        """从真实的 Hacker News API 与文章站点录制语料（需要网络）。"""
+        import requests
+        from util.hacker_news_fetcher import HackerNewsFetcher
+        fetcher = HackerNewsFetcher(top_n=top_n)
+        feeds = fetcher.fetch_feeds(FEED_NAMES)
+        items = {item['id']: item for stories in feeds.values() for item in stories}
+        pages = {}
+        for item_id, item in items.items():
+            if not item.get('url'):
+                continue
+            try:
+                response = requests.get(item['url'], timeout=10)
+                content_type = response.headers.get('Content-Type', '')
+                if response.ok and ('html' in content_type or 'pdf' in content_type):
+                    pages[item_id] = (content_type, response.content)
+            except requests.RequestException:
+                continue
+        return cls(items, {name: [item['id'] for item in stories] for name, stories in feeds.items()}, {}, pages)
+
+
+class HNSimulator:
+    """基于 ThreadingHTTPServer 的 Hacker News API 模拟器。
+
+    接口：
+        /v0/{feed}stories.json、/v0/item/{id}.json、/v0/user/{id}.json、
+        /v0/maxitem.json、/v0/updates.json、/articles/{id}（HTML 或 PDF）。
+    返回的条目中 url 会被改写为模拟器自身的文章地址（语料中有页面时）。
+
+    Attributes:
+        corpus: 使用的语料。
+        latency: 每个请求的基础延迟（秒）。
+        jitter: 在基础延迟上随机增加的最大延迟（秒）。
+        error_rate: 返回 500 的概率。
+        throttle_rate: 返回 429 的概率。
+        slow_rate: 以慢速分块发送响应的概率。
+        requests: 已处理的请求数。
+    """
+
+    def __init__(self, corpus: Optional[Corpus] = None, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, slow_rate: float = 0.0,
+                 drip_chunk: int = 1024, drip_delay: float = 0.01, seed: int = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.corpus = corpus or Corpus.synthetic()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.slow_rate = slow_rate
+        self.drip_chunk = drip_chunk
+        self.drip_delay = drip_delay
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def api_base(self) -> str:
+        return f'{self.url}/v0'
+
+    def article_url(self, item_id: int) -> str:
+        """返回模拟器上某条新闻的文章地址，PDF 文章带 .pdf 后缀。"""
+        content_type = self.corpus.pages[item_id][0]
+        return f'{self.url}/articles/{item_id}{".pdf" if "pdf" in content_type else ""}'
+
+    def start(self) -> 'HNSimulator':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'HNSimulator':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def _roll(self) -> Tuple[float, str]:
+        """为一次请求决定延迟与故障类型（ok、error、throttle、slow）。"""
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.random() * self.jitter
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return delay, 'error'
+        if roll < self.error_rate + self.throttle_rate:
+            return delay, 'throttle'
+        if roll < self.error_rate + self.throttle_rate + self.slow_rate:
+            return delay, 'slow'
+        return delay, 'ok'
+
+    def _route(self, path: str) -> Tuple[int, str, bytes]:
+        corpus = self.corpus
+        match = re.fullmatch(r'/v0/(\w+)stories\.json', path)
+        if match and match.group(1) in corpus.feeds:
+            return 200, 'application/json', json.dumps(corpus.feeds[match.group(1)]).encode()
+        match = re.fullmatch(r'/v0/item/(\d+)\.json', path)
+        if match:
+            item = corpus.items.get(int(match.group(1)))
+            if item is not None and item['id'] in corpus.pages:
+                item = dict(item, url=self.article_url(item['id']))
+            return 200, 'application/json', json.dumps(item).encode()
+        match = re.fullmatch(r'/v0/user/([^/]+)\.json', path)
+        if match:
+            return 200, 'application/json', json.dumps(corpus.users.get(match.group(1))).encode()
+        if path == '/v0/maxitem.json':
+            return 200, 'application/json', json.dumps(max(corpus.items)).encode()
+        if path == '/v0/updates.json':
+            with self._lock:
+                changed = self._rng.sample(sorted(corpus.items), min(20, len(corpus.items)))
+                profiles = self._rng.sample(sorted(corpus.users), min(5, len(corpus.users)))
+            return 200, 'application/json', json.dumps({'items': changed, 'profiles': profiles}).encode()
+        match = re.fullmatch(r'/articles/(\d+)(?:\.pdf)?', path)
+        if match and int(match.group(1)) in corpus.pages:
+            content_type, body = corpus.pages[int(match.group(1))]
+            return 200, content_type, body
+        return 404, 'text/plain', b'not found'
+
+    def _make_handler(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                delay, fault = simulator._roll()
+                if delay:
+                    time.sleep(delay)
+                if fault == 'error':
+                    status, content_type, body = 500, 'text/plain', b'internal error'
+                elif fault == 'throttle':
+                    status, content_type, body = 429, 'text/plain', b'too many requests'
+                else:
+                    status, content_type, body = simulator._route(self.path.split('?', 1)[0])
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                if fault == 'throttle':
+                    self.send_header('Retry-After', '1')
+                self.end_headers()
+                try:
+                    if fault == 'slow':
+                        for start in range(0, len(body), simulator.drip_chunk):
+                            self.wfile.write(body[start:start + simulator.drip_chunk])
+                            self.wfile.flush()
+                            time.sleep(simulator.drip_delay)
+                    else:
+                        self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    record = subparsers.add_parser('record', help='从真实 API 录制语料')
+    record.add_argument('--top-n', type=int, default=50)
+    record.add_argument('--path', default=os.path.join(os.path.dirname(__file__), 'corpus'))
+    serve = subparsers.add_parser('serve', help='启动模拟器')
+    serve.add_argument('--corpus', default=None, help='语料目录，默认随机生成')
+    serve.add_argument('--items', type=int, default=500, help='随机语料的条目数')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--latency', type=float, default=0.0)
+    serve.add_argument('--jitter', type=float, default=0.0)
+    serve.add_argument('--error-rate', type=float, default=0.0)
+    serve.add_argument('--throttle-rate', type=float, default=0.0)
+    serve.add_argument('--slow-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        Corpus.record(args.top_n).save(args.path)
+        print(f"语料已保存到 {args.path}")
+        return
+    corpus = Corpus.load(args.corpus) if args.corpus else Corpus.synthetic(args.items)
+    simulator = HNSimulator(corpus, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                            throttle_rate=args.throttle_rate, slow_rate=args.slow_rate, port=args.port)
+    print(f"模拟器已启动：{simulator.api_base}")
+    simulator.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/import_time.py
+"""报告导入模块的耗时，找出拖慢启动的依赖。
+
+在新的解释器中以 python -X importtime 导入指定模块，解析其输出，按累计耗时列出
+最慢的模块；可以多次运行取最小值，超过预算时以非零状态退出：
+
+    # 导入 src.main 时最慢的 20 个模块
+    python -m benchmarks.import_time src.main --top 20
+    # 运行 5 次取最小值，超过 IMPORT_TIME_BUDGET_MS 时失败
+    python -m benchmarks.import_time src.main src.url_extractor --repeat 5 --budget-ms 300 --json import_time.json
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import re, json, argparse, subprocess
+from typing import Dict, List
+
+from config.config import IMPORT_TIME_BUDGET_MS
+
+ROOT = os.path.abspath(os.path.dirname(__file__) + '/' + '..')
+# -X importtime 的输出行：import time: self [us] | cumulative | imported package
+IMPORTTIME_LINE = re.compile(r'^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$')
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """解析 -X importtime 的输出，返回 [{name, self_us, cumulative_us, depth}, ...]，顺序与输出一致。"""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        entries.append({'name': name, 'self_us': int(self_us), 'cumulative_us': int(cumulative_us),
+                        'depth': max(0, (len(indent) - 1) // 2)})
+    return entries
+
+
+def measure(module: str, python: str = sys.executable) -> Dict:
+    """在新的解释器中导入 module 一次，返回导入的全部模块及 module 本身的累计耗时（毫秒）。"""
+    completed = subprocess.run([python, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=ROOT, capture_output=True, text=True, check=True)
+    entries = parse_importtime(completed.stderr)
+    total_us = next((entry['cumulative_us'] for entry in entries if entry['name'] == module), 0)
+    return {'module': module, 'total_ms': round(total_us / 1000, 1), 'entries': entries}
+
+
+def run(module: str, repeat: int = 1, top: int = 15) -> Dict:
+    """导入 repeat 次取耗时最少的一次，返回总耗时、导入的模块数与最慢的 top 个模块。"""
+    best = min((measure(module) for _ in range(max(1, repeat))), key=lambda result: result['total_ms'])
+    slowest = sorted((entry for entry in best['entries'] if entry['depth'] <= 1),
+                     key=lambda entry: entry['cumulative_us'], reverse=True)
+    return {
+        'module': module,
+        'total_ms': best['total_ms'],
+        'modules': len(best['entries']),
+        'top': [{'name': entry['name'], 'cumulative_ms': round(entry['cumulative_us'] / 1000, 1),
+                 'self_ms': round(entry['self_us'] / 1000, 1)} for entry in slowest[:top]],
+        'imported': sorted({entry['name'] for entry in best['entries']}),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=['src.main'], help='要导入的模块')
+    parser.add_argument('--repeat', type=int, default=3, help='导入次数，取最小值')
+    parser.add_argument('--top', type=int, default=15, help='列出最慢的模块数')
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_TIME_BUDGET_MS, help='导入耗时上限（毫秒）')
+    parser.add_argument('--json', help='把结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    reports = [run(module, args.repeat, args.top) for module in args.modules]
+    over_budget = False
+    for report in reports:
+        status = 'ok' if report['total_ms'] <= args.budget_ms else 'OVER BUDGET'
+        over_budget = over_budget or status != 'ok'
+        print(f"{report['module']}: {report['total_ms']:.1f}ms, {report['modules']} modules "
+              f"(budget {args.budget_ms:.0f}ms, {status})")
+        for entry in report['top']:
+            print(f"  {entry['cumulative_ms']:8.1f}ms {entry['self_ms']:8.1f}ms  {entry['name']}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+    sys.exit(1 if over_budget else 0)
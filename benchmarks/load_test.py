@@ -0,0 +1,115 @@
+# benchmarks/load_test.py
+"""基于本地模拟器的 HackerNewsFetcher / ContentExtractor 压测。
+
+对每个 top_n 启动一次模拟器，报告吞吐量与单次请求延迟的 p50/p95/p99：
+
+    python -m benchmarks.load_test --top-n 10 100 1000 --latency 0.02 --error-rate 0.01
+    python -m benchmarks.load_test --top-n 50 --extract --json report.json
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import json, time, argparse
+from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+
+from util.hacker_news_fetcher import HackerNewsFetcher
+from util.http_transport import HttpTransport
+from benchmarks.hn_simulator import Corpus, HNSimulator
+from benchmarks.utils import NullLogger, percentiles
+
+
+def load_test_fetcher(simulator: HNSimulator, top_n: int, max_workers: int) -> Dict:
+    """用 fetch_latest_news 抓取 top_n 条新闻，统计吞吐量与请求延迟。"""
+    fetcher = HackerNewsFetcher(top_n=top_n, logger=NullLogger(), max_workers=max_workers,
+                                base_url=simulator.api_base, transport=HttpTransport())
+    latencies: List[float] = []
+    fetcher.session.hooks['response'].append(
+        lambda response, *args, **kwargs: latencies.append(response.elapsed.total_seconds())
+    )
+    start = time.perf_counter()
+    news_list = fetcher.fetch_latest_news()
+    elapsed = time.perf_counter() - start
+    return {
+        'stage': 'fetch',
+        'top_n': top_n,
+        'items': len(news_list),
+        'requests': len(latencies),
+        'elapsed': round(elapsed, 4),
+        'throughput': round(len(news_list) / elapsed, 2) if elapsed else 0.0,
+        **{key: round(value * 1000, 2) for key, value in percentiles(latencies).items()},
+        'throttle': fetcher.throttle.stats(),
+    }
+
+
+def load_test_extractor(simulator: HNSimulator, top_n: int, max_workers: int) -> Dict:
+    """并发提取 top_n 篇文章的正文，统计吞吐量与单篇文章的耗时。"""
+    from src.url_extractor import ContentExtractor
+    from util.content_cache import ContentCache
+    from util.circuit_breaker import CircuitBreaker
+    # 使用内存中的缓存与熔断状态，避免受上一次压测结果的影响
+    extractor = ContentExtractor(content_cache=ContentCache(':memory:'), circuit_breaker=CircuitBreaker(':memory:'))
+    extractor.logger = NullLogger()
+    item_ids = simulator.corpus.feeds['top'][:top_n]
+    urls = [simulator.article_url(item_id) for item_id in item_ids if item_id in simulator.corpus.pages]
+    latencies: List[float] = []
+
+    def timed_extract(url):
+        start = time.perf_counter()
+        text = extractor.extract_content(url, 'en')
+        latencies.append(time.perf_counter() - start)
+        return text
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        texts = list(executor.map(timed_extract, urls))
+    elapsed = time.perf_counter() - start
+    return {
+        'stage': 'extract',
+        'top_n': top_n,
+        'items': sum(1 for text in texts if text),
+        'requests': len(urls),
+        'elapsed': round(elapsed, 4),
+        'throughput': round(len(urls) / elapsed, 2) if elapsed else 0.0,
+        **{key: round(value * 1000, 2) for key, value in percentiles(latencies).items()},
+        'quality': dict(extractor.quality_dict),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top-n', type=int, nargs='+', default=[10, 100, 500, 1000])
+    parser.add_argument('--corpus', default=None, help='语料目录，默认随机生成')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--slow-rate', type=float, default=0.0)
+    parser.add_argument('--extract', action='store_true', help='同时压测正文提取')
+    parser.add_argument('--json', default=None, help='把结果写入 JSON 文件')
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = Corpus.load(args.corpus)
+    else:
+        corpus = Corpus.synthetic(max(args.top_n), with_pages=args.extract)
+    report = []
+    for top_n in args.top_n:
+        with HNSimulator(corpus, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         throttle_rate=args.throttle_rate, slow_rate=args.slow_rate) as simulator:
+            stages = [load_test_fetcher(simulator, top_n, args.workers)]
+            if args.extract:
+                stages.append(load_test_extractor(simulator, top_n, args.workers))
+        for result in stages:
+            report.append(result)
+            print(f"{result['stage']:<8s} top_n={top_n:<5d} items={result['items']:<5d} "
+                  f"elapsed={result['elapsed']:.3f}s throughput={result['throughput']:.1f}/s "
+                  f"p50={result['p50']:.1f}ms p95={result['p95']:.1f}ms p99={result['p99']:.1f}ms")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# benchmarks/utils.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+from typing import Dict, List
+
+
+class NullLogger:
+    """不输出任何内容的 logger，避免日志 IO 干扰计时。"""
+
+    def log_info(self, message, print_screen=True):
+        pass
+
+    def log_exception(self, print_screen=True):
+        pass
+
+
+def percentiles(values: List[float], points=(50, 95, 99)) -> Dict[str, float]:
+    """计算 p50/p95/p99 等分位数（最近秩法），values 为空时返回 0。"""
+    ordered = sorted(values)
+    result = {}
+    for point in points:
+        if not ordered:
+            result[f'p{point}'] = 0.0
+            continue
+        rank = max(0, min(len(ordered) - 1, int(round(point / 100 * len(ordered) + 0.5)) - 1))
+        result[f'p{point}'] = ordered[rank]
+    return result
@@ -3,6 +3,105 @@ sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
 
 TIMEOUT = 3
 
+# Hacker News API
+HN_API_BASE = 'https://hacker-news.firebaseio.com/v0'
+HN_TIMEOUT = 10         # 单次请求超时（秒）
+HN_MAX_WORKERS = 16     # 并发抓取条目的线程数，1 表示串行
+# updates.json 只包含最近一小段时间内的变更，两次同步间隔超过该值（秒）时
+# 无法保证没有遗漏，增量模式会退回按字段有效期判断缓存是否过期
+HN_UPDATES_WINDOW = 5 * 60
+
+# 抓取与正文提取流水线
+PIPELINE_MAX_WORKERS = 8        # 正文提取的并发数
+
+# 自适应限流：每个主机一个令牌桶加 AIMD 并发控制
+THROTTLE_INITIAL_RATE = 50.0        # 初始速率（请求/秒）
+THROTTLE_MIN_RATE = 1.0             # 速率下限
+THROTTLE_MAX_RATE = 200.0           # 速率上限
+THROTTLE_INITIAL_CONCURRENCY = 16   # 初始并发上限
+THROTTLE_MAX_CONCURRENCY = 64       # 并发上限的最大值
+THROTTLE_COOLDOWN = 1.0             # 两次减速之间的最短间隔（秒）
+
+# HTTP 传输层
+HTTP_CONNECT_TIMEOUT = 3.05     # 建立连接的超时时间（秒）
+HTTP_READ_TIMEOUT = TIMEOUT     # 默认的读取超时时间（秒）
+HTTP_POOL_HOSTS = 100           # 最多保留连接池的主机数
+HTTP_POOL_MAXSIZE = 64          # 每个主机连接池的最大连接数，不小于 THROTTLE_MAX_CONCURRENCY
+
+# 按主机调度正文抓取
+HOST_MAX_CONCURRENCY = 2        # 同一主机的最大并发数
+HOST_MIN_DELAY = 0.5            # 同一主机相邻两次请求的最短间隔（秒）
+ROBOTS_TTL = 24 * 60 * 60       # robots.txt 缓存有效期（秒）
+ROBOTS_MAX_CRAWL_DELAY = 10     # 遵守的 Crawl-delay 上限（秒）
+ROBOTS_OBEY_DISALLOW = False    # 是否跳过 robots.txt 禁止的 URL（抓取由用户提交的链接触发，默认只遵守 Crawl-delay）
+
+# 正文解析进程池
+PARSE_MAX_WORKERS = os.cpu_count() or 1     # 解析进程数，0 表示在下载线程中直接解析
+
+# 批量文本清理
+CLEAN_MAX_WORKERS = os.cpu_count() or 1     # 清理进程数，0 表示在当前进程中清理
+CLEAN_CHUNK_SIZE = 256          # 每个任务包含的文本条数
+CLEAN_MAX_PENDING = 2           # 每个进程最多排队的任务数，内存占用与 条数 × 进程数 × 该值 成正比
+
+# 文本密度快速提取
+DENSITY_MIN_CONFIDENCE = 0.7    # 快速提取的置信度不低于该值时跳过 newspaper3k 等提取器，大于 1 表示关闭
+DENSITY_MIN_CHARS = 500         # 置信度不再因正文长度打折的字数
+
+# 下载与 PDF 提取
+DOWNLOAD_CHUNK_SIZE = 64 * 1024         # 流式下载每次读取的字节数
+HTML_MAX_BYTES = 5 * 1024 * 1024        # 网页正文下载的最大字节数，超过时放弃
+
+# 下载重试
+FETCH_RETRIES = 3               # 下载网页的最多尝试次数
+FETCH_RETRY_DELAY = 0.5         # 第一次重试前等待时长的上限（秒），之后每次翻倍并加随机抖动
+FETCH_RETRY_MAX_DELAY = 5       # 单次等待时长的上限（秒）
+FETCH_TIME_BUDGET = 20          # 下载一个网页（含所有重试）的时间预算（秒）
+PDF_MAX_BYTES = 50 * 1024 * 1024        # 允许下载的 PDF 最大字节数
+PDF_MAX_PAGES = 50                      # 最多提取的页数
+PDF_MAX_CHARS = 200000                  # 提取到的文本达到该字符数后停止
+PDF_PARALLEL_MIN_PAGES = 8              # 批量提取时页数不少于该值则在解析进程池中分段并行提取，单条提取始终顺序提取
+
+# 评论树抓取
+COMMENT_MAX_DEPTH = 2           # 最大深度，顶层评论为 1
+COMMENT_MAX_PER_STORY = 20      # 每条新闻最多抓取的评论数
+COMMENT_TIME_BUDGET = 15        # 一次抓取所有新闻评论的时间预算（秒）
+
+# 本地缓存
+CACHE_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), '../cache')
+ITEM_CACHE_PATH = os.path.join(CACHE_DIR, 'hn_items.sqlite3')
+ITEM_CACHE_MAX_ITEMS = 50000    # 条目缓存的最大条目数
+ITEM_VOLATILE_TTL = 15 * 60     # score、descendants 等易变字段的有效期（秒）
+
+# 正文提取结果缓存
+CONTENT_CACHE_PATH = os.path.join(CACHE_DIR, 'contents.sqlite3')
+CONTENT_CACHE_TTL = 6 * 60 * 60             # 无需向服务端验证即可使用的时长（秒）
+CONTENT_CACHE_MAX_ENTRIES = 5000            # 最大条目数
+CONTENT_CACHE_MAX_BYTES = 200 * 1024 * 1024 # 正文总字节数上限
+
+# 失败主机熔断与负缓存
+BREAKER_PATH = os.path.join(CACHE_DIR, 'circuit_breaker.sqlite3')
+BREAKER_FAILURE_THRESHOLD = 3   # 主机连续失败多少次后熔断
+BREAKER_HOST_TTL = 10 * 60      # 主机第一次熔断的冷却时间（秒），此后每次熔断翻倍
+BREAKER_URL_TTL = 60 * 60       # URL 第一次失败后的冷却时间（秒），此后每次失败翻倍
+BREAKER_MAX_TTL = 7 * 24 * 3600 # 冷却时间上限（秒）
+BREAKER_PROBE_TIMEOUT = 5 * 60  # half-open 探测请求的最长占用时间（秒），超时未返回时放行下一个探测
+BREAKER_URL_RETENTION = 30 * 24 * 3600  # URL 冷却结束后失败记录保留的时间（秒），过期后删除
+BREAKER_MAX_URLS = 10000        # 最多保存的 URL 失败记录数，超出时删除最久未更新的记录
+
+# 正文提取器统计
+EXTRACTOR_STATS_PATH = os.path.join(CACHE_DIR, 'extractor_stats.sqlite3')
+EXTRACTOR_EXPLORE_RATE = 0.1    # 不按历史最优顺序、随机先试其他提取器的概率
+EXTRACTOR_MIN_ATTEMPTS = 3      # 主机累计尝试次数达到该值后才按历史数据排序
+
+# 历史条目回填
+BACKFILL_DB_PATH = os.path.join(CACHE_DIR, 'hn_archive.sqlite3')
+BACKFILL_BATCH_SIZE = 500       # 每批写入的条目数，同时也是断点保存的粒度
+BACKFILL_MAX_WORKERS = 32       # 并发请求数
+BACKFILL_RPS = 200              # 每秒最多发出的请求数，0 表示沿用限流器的默认上限 THROTTLE_MAX_RATE
+
+# 启动
+IMPORT_TIME_BUDGET_MS = 300     # 导入 src.main 的耗时上限（毫秒），提取库在第一次使用时才导入
+
 # 从环境变量中获取配置
 PROXIES = {
     'https' : f"http://{os.environ['PROXY']}",
@@ -14,4 +113,4 @@ EMAIL_ADDRESS = os.environ['EMAIL_ADDRESS'] if 'EMAIL_ADDRESS' in os.environ els
 EMAIL_PASSWORD = os.environ['EMAIL_PASSWORD'] if 'EMAIL_PASSWORD' in os.environ else ''
 TO_EMAILS = os.environ['TO_EMAILS'] if 'TO_EMAILS' in os.environ else ''
 TO_EMAILS = TO_EMAILS.strip(',')
-TO_EMAILS = TO_EMAILS.split(',')
\ No newline at end of file
+TO_EMAILS = TO_EMAILS.split(',')
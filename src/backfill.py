@@ -0,0 +1,43 @@
+# src/backfill.py
+"""回填 Hacker News 历史条目到本地归档。
+
+    python -m src.backfill                      # 从断点继续，没有断点时从 maxitem 开始
+    python -m src.backfill --start 41000000 --end 40000000 --workers 64 --rps 400
+"""
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import argparse
+from util.hacker_news_fetcher import HackerNewsFetcher
+from util.item_store import ItemStore
+from util.backfill_crawler import BackfillCrawler
+
+from config.config import BACKFILL_DB_PATH, BACKFILL_BATCH_SIZE, BACKFILL_MAX_WORKERS, BACKFILL_RPS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--start', type=int, default=None, help='起始 ID，默认从断点或 maxitem 开始')
+    parser.add_argument('--end', type=int, default=1, help='结束 ID（包含）')
+    parser.add_argument('--limit', type=int, default=None, help='本次最多处理的 ID 数')
+    parser.add_argument('--db', default=BACKFILL_DB_PATH, help='归档数据库路径')
+    parser.add_argument('--batch-size', type=int, default=BACKFILL_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=BACKFILL_MAX_WORKERS)
+    parser.add_argument('--rps', type=float, default=BACKFILL_RPS, help='每秒最多请求数，0 表示沿用限流器的默认上限 THROTTLE_MAX_RATE')
+    parser.add_argument('--retry-failed', action='store_true', help='只重试之前失败的 ID')
+    args = parser.parse_args()
+
+    # 归档库不做容量淘汰
+    item_store = ItemStore(args.db, max_items=sys.maxsize)
+    fetcher = HackerNewsFetcher(max_workers=args.workers)
+    crawler = BackfillCrawler(fetcher, item_store, batch_size=args.batch_size,
+                              max_workers=args.workers, requests_per_second=args.rps)
+    if args.retry_failed:
+        crawler.retry_failed()
+    else:
+        crawler.run(start_id=args.start, end_id=args.end, max_items=args.limit)
+    item_store.close()
+
+
+if __name__ == "__main__":
+    main()
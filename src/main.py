@@ -2,33 +2,38 @@
 import sys,os
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
 
-import os, time, jieba
+import os, time
 from util.email_sender import EmailSender
 from util.hacker_news_fetcher import HackerNewsFetcher
+from util.item_store import ItemStore
+from util.comment_tree_fetcher import CommentTreeFetcher
+from util.news_pipeline import NewsPipeline
 from util.markdown_formatter import MarkdownFormatter
 
 from util.log_utils import logger
+from util.rate_limiter import throttle_stats
+from util.utils import retry_stats
+from util.http_transport import transport, download_transport
 from src.url_extractor import ContentExtractor
 
-jieba.cut("初始化")
-
 from config.config import SMTP_PORT, SMTP_SERVER, EMAIL_ADDRESS, EMAIL_PASSWORD, TO_EMAILS
 
 
-content_extractor = ContentExtractor()
-
 def main():
     email_sender = EmailSender(SMTP_SERVER, SMTP_PORT, EMAIL_ADDRESS, EMAIL_PASSWORD)
+    # 在 main 中创建，导入本模块时不打开 cache/ 下的 SQLite 文件
+    content_extractor = ContentExtractor()
     # 初始化 HackerNewsFetcher
-    fetcher = HackerNewsFetcher(top_n=10)
-    news_list = fetcher.fetch_latest_news()
+    fetcher = HackerNewsFetcher(top_n=10, item_store=ItemStore())
+    # 边获取边提取正文，评论与正文并行抓取
+    pipeline = NewsPipeline(fetcher, content_extractor, CommentTreeFetcher(fetcher), lang='en')
+    news_list = pipeline.run()
     if news_list:
-        for news in news_list:
-            url = news.get('url', '')
-            if url:
-                text = content_extractor.extract_content(url, 'en')
-                news['text'] = news.get('text', '') + '\n\n' + text
-                logger.log_info(f"新闻内容已提取: {url}")
+        logger.log_info(f"限流状态：{throttle_stats()}")
+        logger.log_info(f"连接统计：{transport.stats()}，正文下载：{download_transport.stats()}")
+        logger.log_info(f"重试统计：{retry_stats()}")
+        logger.log_info(f"提取统计：{content_extractor.quality_dict}")
+        logger.log_info(f"熔断状态：{content_extractor.circuit_breaker.stats()}")
         body = MarkdownFormatter.format_news(news_list)
         subject = f" 《Hacker News 最新新闻》 - ({time.strftime('%Y-%m-%d %H:%M')})"
         email_sender.send_email(subject, body, TO_EMAILS)
@@ -1,157 +1,414 @@
 import sys,os
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
 
-import certifi
-import requests, fitz
-from io import BytesIO
+import copy, time, threading
+import requests
 from pprint import pprint
-from fake_headers import Headers
 from urllib.parse import urlparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Future
 
-from gne import GeneralNewsExtractor
-from newspaper import Article
-from newspaper.configuration import Configuration
-from readability import Document
-
-from config.config import PROXIES, TIMEOUT
-
-from util.utils import retry
+# newspaper3k、readability、gne 与 fake_headers 导入较慢，在第一次使用时才导入，
+# 只用到快速提取的进程不必加载它们
+from util.utils import retry, is_retryable
+from util.http_transport import download_transport
+from util.host_scheduler import HostScheduler, DisallowedByRobots
 from util.text_clean import TextCleaner
+from util.extractor_stats import ExtractorStats, EXTRACTORS
+from util.parse_pool import ParsePool
+from util.content_cache import ContentCache
+from util.circuit_breaker import CircuitBreaker
+from util.html_document import HtmlDocument, node_to_text
+from util.density_extractor import DensityExtractor
+from util.pdf_extractor import spool_to_tempfile, extract_pdf_text
+from util.download import (
+    PDF, ResponseTooLarge, parse_content_type, sniff_kind, read_body, decode_html,
+)
 
 from util.log_utils import logger
 
-FAIL_ENCODING = 'ISO-8859-1'
+from config.config import (
+    PARSE_MAX_WORKERS, HTML_MAX_BYTES, DOWNLOAD_CHUNK_SIZE, DENSITY_MIN_CONFIDENCE,
+    FETCH_RETRIES, FETCH_RETRY_DELAY, FETCH_RETRY_MAX_DELAY, FETCH_TIME_BUDGET,
+)
 
 class ContentExtractor:
-    def __init__(self) -> None:
-        self.header_generator = Headers(
-            headers=False  # don`t generate misc headers
-        )
-        self.newspaper_config = Configuration()
-        self.request_args = {
-            'proxies': PROXIES,
-            'timeout': TIMEOUT,
-            'verify': certifi.where(),
-        }
+    def __init__(self, extractor_stats=None, content_cache=None, circuit_breaker=None) -> None:
+        self._header_generator = None
+        self._newspaper_config = None
+        self._gne_extractor = None
+        # 快速提取：置信度不低于 density_min_confidence 时不再尝试其他提取器
+        self.density_extractor = DensityExtractor()
+        self.density_min_confidence = DENSITY_MIN_CONFIDENCE
+        # 下载正文经过配置的代理，证书与超时由传输层统一配置
+        self.transport = download_transport
         self.scrape_count = 0
         self.logger = logger
         self.text_cleaner = TextCleaner()
+        # 按主机记录各提取器的表现，决定提取顺序
+        self.extractor_stats = extractor_stats if extractor_stats is not None else ExtractorStats()
+        # 提取结果缓存，键为规范化后的 URL
+        self.content_cache = content_cache if content_cache is not None else ContentCache()
+        # 按主机熔断并记录失败 URL，冷却期内不再下载
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self._parse_pool = None
+        self._pool_lock = threading.Lock()
         self.quality_dict = {
+            "density": 0,
             "newspaper3k": 0,
             "readability": 0,
             "gne": 0,
             "failed": 0,
+            "skipped": 0,
+            "cache_hit": 0,
+            "cache_revalidated": 0,
+            "cache_miss": 0,
+            "cache_hit_rate": 0.0,
         }
     
-    def fetch_html(self, url: str) -> str:
+    @property
+    def header_generator(self):
+        """请求头生成器，第一次下载时创建。"""
+        if self._header_generator is None:
+            from fake_headers import Headers
+            self._header_generator = Headers(
+                headers=False  # don`t generate misc headers
+            )
+        return self._header_generator
+
+    @property
+    def newspaper_config(self):
+        """newspaper3k 的基础配置，第一次使用 newspaper3k 时创建，各语言复制后再设置。"""
+        if self._newspaper_config is None:
+            from newspaper.configuration import Configuration
+            self._newspaper_config = Configuration()
+        return self._newspaper_config
+
+    @property
+    def gne_extractor(self):
+        """常驻的 gne 提取器，解析进程中每个进程一个，第一次使用 gne 时创建。"""
+        if self._gne_extractor is None:
+            from util.gne_extractor import TreeNewsExtractor
+            self._gne_extractor = TreeNewsExtractor()
+        return self._gne_extractor
+
+    @retry(retries=FETCH_RETRIES, delay=FETCH_RETRY_DELAY, max_delay=FETCH_RETRY_MAX_DELAY,
+           budget=FETCH_TIME_BUDGET, logger=logger)
+    def fetch_page(self, url: str, etag=None, last_modified=None):
         """
-        从给定的 URL 中获取 HTML 内容。
+        从给定的 URL 中获取 HTML 内容，只重试下载而不重复解析。
+
+        超时、连接错误与 5xx/429 按指数退避重试，总耗时不超过 FETCH_TIME_BUDGET
+        与调用方截止时间中较早的一个；4xx 等其他错误直接返回空字符串。
+
+        响应以流的方式读取：先读第一块，根据 Content-Type 与开头的魔数判断类别。
+        PDF 转交 PyMuPDF 提取文本；视频、压缩包等无法提取正文的类型立即放弃；
+        网页最多读取 HTML_MAX_BYTES 字节，并按检测到的编码解码一次。
+        提供 etag 或 last_modified 时发送条件请求，服务端返回 304 时 HTML 为空。
 
         Args:
             url (str): 目标 URL。
-            request_args (Optional[Dict[str, Any]]): 请求的附加参数。
+            etag (Optional[str]): 上次响应的 ETag。
+            last_modified (Optional[str]): 上次响应的 Last-Modified。
 
         Returns:
-            str: 获取到的 HTML 内容。
+            Optional[Tuple[str, Dict]]: (HTML 或 PDF 文本, 响应信息)，响应信息包含 status、
+                etag、last_modified、kind（PDF、HTML 或 None）与 skipped（内容因非文本或过大而
+                跳过）；请求失败时返回空字符串。
         """
         if not url:
             return ""
 
         headers = self.header_generator.generate()
         headers["Host"] = urlparse(url).netloc
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
         cookies=None
         if 'baidu.com' in headers["Host"]:
             cookies = {'BA_HECTOR': '2g812k2g2k802k212la0812h1inl9r41q'}
 
         try:
-            response = requests.get(url, headers=headers, cookies=cookies, **self.request_args)
+            response = self.transport.get(url, headers=headers, cookies=cookies, stream=True)
+            if response.status_code == 304:
+                response.close()
+                self.logger.log_info(f"【ContentExtractor】Not modified: {url}")
+                return "", {'status': 304, 'etag': etag, 'last_modified': last_modified, 'kind': None}
+            if response.status_code >= 400:
+                response.close()
             response.raise_for_status()  # 检查响应状态码是否为 200
-            html = self._get_html_from_response(response)
+            mime, charset = parse_content_type(response.headers.get('Content-Type'))
+            chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+            head = next(chunks, b'')
+            meta = {
+                'status': response.status_code,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'kind': sniff_kind(mime, head),
+                # 主机正常响应但内容无法使用（非文本或超过大小上限）
+                'skipped': False,
+            }
+            # 以下分支都返回非空元组，内容本身的问题不会触发重试
+            if meta['kind'] == PDF:
+                return self._extract_pdf_response(url, response, head, chunks), meta
+            if meta['kind'] is None:
+                response.close()
+                self.logger.log_info(f"【ContentExtractor】Skip non-text content ({mime}): {url}")
+                meta['skipped'] = True
+                return "", meta
+            try:
+                body = read_body(response, HTML_MAX_BYTES, prefix=head, chunks=chunks)
+            except ResponseTooLarge as e:
+                self.logger.log_info(f"【ContentExtractor】Skip {url}: {e}")
+                meta['skipped'] = True
+                return "", meta
+            html = decode_html(body, charset)
             self.logger.log_info(f"【ContentExtractor】Successfully fetched HTML from {url}")
-            return html
+            return html, meta
         except requests.RequestException as e:
+            if is_retryable(e):
+                raise   # 交给 retry 退避后重试
             if self.logger:
                 self.logger.log_exception()
             else:
                 pprint(f"【ContentExtractor】Failed to fetch HTML from {url}: {e}")
             return ""
 
+    def fetch_html(self, url: str) -> str:
+        """
+        从给定的 URL 中获取 HTML 内容。
+
+        Args:
+            url (str): 目标 URL。
+
+        Returns:
+            str: 获取到的 HTML 内容，失败或不是网页时返回空字符串。
+        """
+        page = self.fetch_page(url)
+        return page[0] if page and page[1]['kind'] != PDF else ""
+
+    def extract_content(self, url, lang='zh'):
+        """
+        下载 URL 并提取正文，每个 URL 只下载一次。
+
+        按 Content-Type 或魔数识别出的 PDF 交给 PyMuPDF 处理；网页下载并解码一次后，
+        先按文本密度快速提取，置信度不足时再按该主机的历史表现依次交给 newspaper3k、
+        readability、gne 解析。
+
+        Args:
+            url (str): 目标 URL。
+            lang (str): 正文语言，供 newspaper3k 使用。
+
+        Returns:
+            str: 提取到的正文，失败时返回空字符串。
+        """
+        entry = self._lookup_cache(url)
+        if entry is not None and entry['fresh']:
+            return entry['content']
+        if not self._breaker_allows(url):
+            return entry['content'] if entry is not None else ""
+        try:
+            return self._extract_uncached(url, lang, entry)
+        finally:
+            # 抛出异常时同样释放 half-open 的探测请求
+            self.circuit_breaker.release(url)
+
+    def _breaker_allows(self, url):
+        """熔断器是否放行该 URL，拒绝时计入 quality_dict['skipped']。"""
+        if self.circuit_breaker.allow(url):
+            return True
+        self.logger.log_info(f"【Circuit Open】Skip {url}")
+        self.quality_dict['skipped'] += 1
+        return False
+
+    def _extract_uncached(self, url, lang, entry):
+        """缓存未命中或已过期时下载并提取，entry 为过期的缓存条目或 None。"""
+        page = self.fetch_page(url, *self._validators(entry))
+        html = page[0] if page else ""
+        if page and page[1]['kind'] == PDF:
+            parsed = _pdf_result(page)
+        elif html:
+            order = self.extractor_stats.rank(urlparse(url).netloc, EXTRACTORS)
+            parsed = self.try_extractors(html, url, lang, order)
+        else:
+            parsed = ("", None, [])
+        # return self.text_cleaner.clean_text(content)
+        return self._finish_page(url, entry, page, parsed)
+
+    def _lookup_cache(self, url):
+        """查询提取结果缓存并更新 quality_dict 中的缓存统计。"""
+        entry = self.content_cache.get(url)
+        if entry is None:
+            self.quality_dict['cache_miss'] += 1
+        elif entry['fresh']:
+            self.quality_dict['cache_hit'] += 1
+            self.logger.log_info(f"【ContentCache】Hit: {url}")
+        self.quality_dict['cache_hit_rate'] = self.content_cache.stats()['hit_rate']
+        return entry
+
     @staticmethod
-    def _get_html_from_response(response):
-        if response.encoding != FAIL_ENCODING:
-            # return response as a unicode string
-            html = response.text
+    def _validators(entry):
+        """返回过期缓存条目的 (ETag, Last-Modified)，用于条件请求。"""
+        if entry is None:
+            return None, None
+        return entry['etag'], entry['last_modified']
+
+    def _finish_page(self, url, entry, page, parsed):
+        """
+        处理一次下载与解析的结果：304 时沿用缓存，否则记录提取统计并写入缓存。
+
+        Args:
+            url (str): 页面 URL。
+            entry (Optional[Dict]): 下载前查到的过期缓存条目。
+            page: fetch_page 的返回值。
+            parsed (tuple): try_extractors 的返回值。
+
+        Returns:
+            str: 正文，失败时返回空字符串。
+        """
+        if entry is not None and page and page[1]['status'] == 304:
+            self.circuit_breaker.record_success(url)
+            self.content_cache.touch(url)
+            self.quality_dict['cache_revalidated'] += 1
+            self.quality_dict['cache_hit_rate'] = self.content_cache.stats()['hit_rate']
+            return entry['content']
+        content, name, attempts = parsed
+        self._record_attempts(url, name, attempts)
+        if content:
+            meta = page[1]
+            self.content_cache.put(url, content, meta['etag'], meta['last_modified'])
+            self.circuit_breaker.record_success(url)
+        elif page and page[1].get('skipped'):
+            # 非文本或过大的响应只记录该 URL，不计入主机的连续失败
+            self.circuit_breaker.record_failure(url, count_host=False)
+            self.quality_dict['failed'] = self.quality_dict.get('failed', 0) + 1
         else:
-            html = response.content
-            if 'charset' not in response.headers.get('content-type'):
-                encodings = requests.utils.get_encodings_from_content(response.text)
-                if len(encodings) > 0:
-                    response.encoding = encodings[0]
-                    html = response.text
-
-        return html or ''
-    
-    @retry(retries=2, delay=0.2)
-    def extract_content(self, url, lang='zh'):
+            self.logger.log_info(f"【Failed Host】{urlparse(url).netloc}")
+            self.circuit_breaker.record_failure(url)
+            self.quality_dict['failed'] = self.quality_dict.get('failed', 0) + 1
+        return content
+
+    def extract_content_from_html(self, html, url='', lang='zh'):
+        """
+        从已下载的 HTML 中提取正文，不再发出网络请求。
+
+        提取器的尝试顺序由 extractor_stats 按该主机的历史表现决定，
+        每次尝试的结果都会记录下来。
+
+        Args:
+            html (str): 已解码的 HTML。
+            url (str): 页面 URL，用于 newspaper3k 解析相对链接与日志。
+            lang (str): 正文语言，供 newspaper3k 使用。
+
+        Returns:
+            str: 提取到的正文，所有提取器都失败时返回空字符串。
+        """
         host = urlparse(url).netloc
-        content = ''
-        if url.endswith('.pdf'):
-            content = self.extract_pdf_content(url)
+        order = self.extractor_stats.rank(host, EXTRACTORS)
+        content, name, attempts = self.try_extractors(html, url, lang, order)
+        self._record_attempts(url, name, attempts)
+        return content
+
+    def try_extractors(self, html, url='', lang='zh', order=EXTRACTORS):
+        """
+        先用文本密度快速提取，置信度足够时直接返回；否则按 order 依次尝试各提取器。
+        不记录统计，可在解析进程中执行。
+
+        HTML 只解析一次，快速提取、readability 与 gne 使用同一棵 lxml 树。
+
+        Returns:
+            tuple: (正文, 成功的提取器名称或 None, [(提取器, 是否成功, 正文长度, 耗时), ...])
+        """
+        document = HtmlDocument(html, url)
+        extractors = {
+            'newspaper3k': lambda: self.extract_content_by_newspaper(html, url, lang),
+            'readability': lambda: self.extract_content_by_readability(document),
+            'gne': lambda: self.extract_content_by_gne(document),
+        }
+        attempts = []
+        if self.density_min_confidence <= 1:
+            started = time.monotonic()
+            content = self.extract_content_by_density(document)
+            attempts.append(('density', bool(content), len(content), time.monotonic() - started))
             if content:
-                self.logger.log_info(f"【PyMuPDF】Successfully extracted content from {url}")
-                self.quality_dict['PDF'] = self.quality_dict.get('PDF', 0) + 1
+                return content, 'density', attempts
+        for name in order:
+            started = time.monotonic()
+            content = extractors[name]()
+            attempts.append((name, bool(content), len(content), time.monotonic() - started))
+            if content:
+                return content, name, attempts
+        return "", None, attempts
+
+    def _record_attempts(self, url, name, attempts):
+        host = urlparse(url).netloc
+        for extractor, success, length, latency in attempts:
+            self.extractor_stats.record(host, extractor, success, length, latency)
+        if name:
+            self.logger.log_info(f"【{name}】Successfully extracted content from {url}")
+            self.quality_dict[name] = self.quality_dict.get(name, 0) + 1
+
+    def extract_content_by_density(self, document):
+        """
+        按文本密度快速提取正文，置信度低于 density_min_confidence 时返回空字符串。
+
+        Args:
+            document (Union[HtmlDocument, str]): 共享的文档或 HTML。
+
+        Returns:
+            str: 正文，置信度不足或失败时返回空字符串。
+        """
+        if isinstance(document, str):
+            document = HtmlDocument(document)
+        try:
+            content, confidence = self.density_extractor.extract(document)
+            if content and confidence >= self.density_min_confidence:
+                self.logger.log_info(f"【density】Confidence {confidence}, extracted content from {document.url}")
+                return content
             else:
-                self.logger.log_info(f"【PyMuPDF】Failed to extract content from {url}")
                 return ""
-        else:
-            try:
-                self.newspaper_config.headers = self.header_generator.generate()
-                self.newspaper_config.set_language(lang)
-                article = Article(url, config=self.newspaper_config)
-                article.download()
-                article.parse()
-                content = article.text
-                assert content, f"Empty content from {url}"
-                self.logger.log_info(f"【newspaper3k】Successfully extracted content from {url}")
-                self.quality_dict['newspaper3k'] = self.quality_dict.get('newspaper3k', 0) + 1
-            except Exception as e:
-                if self.logger:
-                    self.logger.log_exception()
-                else:
-                    pprint(f"【newspaper3k】Failed to extract content from {url}: {e}")
-                html = self.fetch_html(url)
-                if not html:
-                    if self.logger:
-                        self.logger.log_info(f"【Failed Host】{host}")
-                    else:
-                        pprint(f"【Failed Host】{host}")
-                    return ""
-                content = self.extract_content_by_readability(html)
-                if not content:
-                    content = self.extract_content_by_gne(html)
-                    if not content:
-                        if self.logger:
-                            self.logger.log_info(f"【Failed Host】{host}")
-                        else:
-                            pprint(f"【Failed Host】{host}")
-                        return ""
-                    else:
-                        self.logger.log_info(f"【gne】Successfully extracted content from {url}")
-                        self.quality_dict['gne'] = self.quality_dict.get('gne', 0) + 1
-                else:
-                    self.logger.log_info(f"【readability】Successfully extracted content from {url}")
-                    self.quality_dict['readability'] = self.quality_dict.get('readability', 0) + 1
-        
-        # return self.text_cleaner.clean_text(content)
-        return content
-            
-    def extract_content_by_readability(self, html):
+        except Exception as e:
+            if self.logger:
+                self.logger.log_exception()
+            else:
+                pprint(f"【density】Failed to extract content from {document.url}: {e}")
+            return ""
+
+    def extract_content_by_newspaper(self, html, url='', lang='zh'):
         try:
-            doc = Document(html)
-            content = doc.summary()
+            from newspaper import Article
+            config = copy.copy(self.newspaper_config)
+            config.set_language(lang)
+            article = Article(url, config=config)
+            article.download(input_html=html)
+            article.parse()
+            return article.text or ""
+        except Exception as e:
+            if self.logger:
+                self.logger.log_exception()
+            else:
+                pprint(f"【newspaper3k】Failed to extract content from {url}: {e}")
+            return ""
+
+    def extract_content_by_readability(self, document):
+        """
+        用 readability 选出正文节点，并通过 lxml 树转为纯文本。
+
+        Args:
+            document (Union[HtmlDocument, str]): 共享的文档或 HTML。
+
+        Returns:
+            str: 正文，失败时返回空字符串。
+        """
+        if isinstance(document, str):
+            document = HtmlDocument(document)
+        try:
+            from util.readability_extractor import TreeReadability
+            doc = TreeReadability(document.tree)
+            doc.summary()
+            content = node_to_text(doc.article_node) if doc.article_node is not None else ""
             if content:
-                self.logger.log_info(f"【readability】Successfully extracted content from {html[:100]}")
+                self.logger.log_info(f"【readability】Successfully extracted content from {document.html[:100]}")
                 return content
             else:
                 return ""
@@ -159,16 +416,25 @@ class ContentExtractor:
             if self.logger:
                 self.logger.log_exception()
             else:
-                pprint(f"【readability】Failed to extract content from {html[:100]}: {e}")
+                pprint(f"【readability】Failed to extract content from {document.html[:100]}: {e}")
             return ""
     
-    def extract_content_by_gne(self, html):
+    def extract_content_by_gne(self, document):
+        """
+        用常驻的 gne 提取器从共享文档的副本中提取正文。
+
+        Args:
+            document (Union[HtmlDocument, str]): 共享的文档或 HTML。
+
+        Returns:
+            str: 正文，失败时返回空字符串。
+        """
+        if isinstance(document, str):
+            document = HtmlDocument(document)
         try:
-            extractor = GeneralNewsExtractor()
-            result = extractor.extract(html, normalize=True)
-            content = result.get('content', '')
+            content = self.gne_extractor.extract_content(document.copy(), normalize=True)
             if content:
-                self.logger.log_info(f"【gne】Successfully extracted content from {html[:100]}")
+                self.logger.log_info(f"【gne】Successfully extracted content from {document.html[:100]}")
                 return content
             else:
                 return ""
@@ -176,61 +442,194 @@ class ContentExtractor:
             if self.logger:
                 self.logger.log_exception()
             else:
-                pprint(f"【gne】Failed to extract content from {html[:100]}: {e}")
+                pprint(f"【gne】Failed to extract content from {document.html[:100]}: {e}")
             return ""
         
     def extract_pdf_content(self, pdf_url):
+        """
+        流式下载 PDF 并提取文本。
+
+        Args:
+            pdf_url (str): PDF 地址。
+
+        Returns:
+            str: 提取到的文本，失败时返回空字符串。
+        """
         try:
-            # 从 URL 获取 PDF 文件流
-            response = requests.get(pdf_url, stream=True)
+            response = self.transport.get(pdf_url, stream=True)
             response.raise_for_status()  # 确保请求成功
-            # 使用 BytesIO 从流中读取 PDF 文件
-            pdf_file = BytesIO(response.content)
-            # 使用 PyMuPDF 打开 PDF 文件
-            pdf_document = fitz.open(stream=pdf_file, filetype="pdf")
-            # 从每一页提取文本
-            text = ""
-            for page_num in range(len(pdf_document)):
-                page = pdf_document.load_page(page_num)
-                text += page.get_text()
-            
+        except Exception as e:
+            if self.logger:
+                self.logger.log_exception()
+            else:
+                pprint(f"【PyMuPDF】Failed to extract content from {pdf_url}: {e}")
+            return ""
+        return self._extract_pdf_response(pdf_url, response)
+
+    def _extract_pdf_response(self, pdf_url, response, head=b'', chunks=None):
+        """
+        从已发出的流式响应中提取 PDF 文本。
+
+        响应逐块写入临时文件，超过 PDF_MAX_BYTES 时放弃；只处理前 PDF_MAX_PAGES 页，
+        文本达到 PDF_MAX_CHARS 后停止，页数较多时在解析进程池中并行提取。
+
+        Args:
+            pdf_url (str): PDF 地址。
+            response: 以 stream=True 发出的响应。
+            head (bytes): 已经从响应中读出的开头部分。
+            chunks: 已经创建的 iter_content 迭代器。
+
+        Returns:
+            str: 提取到的文本，失败时返回空字符串。
+        """
+        path = None
+        try:
+            path = spool_to_tempfile(response, prefix=head, chunks=chunks)
+            text = extract_pdf_text(path, pool_factory=self._pdf_pool)
             if text:
                 self.logger.log_info(f"【PyMuPDF】Successfully extracted content from {pdf_url}")
             else:
                 return ""
-                
         except Exception as e:
             if self.logger:
                 self.logger.log_exception()
             else:
                 pprint(f"【PyMuPDF】Failed to extract content from {pdf_url}: {e}")
             return ""
+        finally:
+            if path is not None:
+                os.remove(path)
 
         return text
-    
-    def batch_extract_content(self, urls, langs, max_workers=5):
+
+    def _pdf_pool(self):
+        """PDF 并行提取使用的进程池：只沿用 batch_extract_content 已创建的解析进程池。
+
+        单条提取时不为 PDF 创建进程池，在下载线程中顺序提取：在多线程进程中 fork
+        解析进程既不安全，init_parse_worker 还会为读取 PDF 页面导入全部提取库。
+        """
+        return self._parse_pool
+
+    def get_parse_pool(self, parse_workers=PARSE_MAX_WORKERS):
+        """返回常驻的解析进程池，首次调用或进程数变化时创建，工作进程在多次批量提取之间复用。"""
+        with self._pool_lock:
+            if self._parse_pool is None or self._parse_pool.max_workers != parse_workers:
+                if self._parse_pool is not None:
+                    self._parse_pool.shutdown()
+                self._parse_pool = ParsePool(parse_workers, initializer=init_parse_worker)
+            return self._parse_pool
+
+    def close(self):
+        """关闭解析进程池。"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+
+    def batch_extract_content(self, urls, langs, max_workers=5, parse_workers=PARSE_MAX_WORKERS):
+        """
+        批量提取正文，结果与 urls 顺序一致。
+
+        下载在按主机调度的线程池中进行，解析交给预加载了提取库的进程池，
+        两者流水线式重叠：先下载完的页面先解析。下载时识别出的 PDF 在下载线程中
+        提取文本，页数较多时同样分给解析进程。
+
+        Args:
+            urls (List[str]): 目标 URL 列表。
+            langs (List[str]): 与 urls 对应的语言列表。
+            max_workers (int): 下载线程数。
+            parse_workers (int): 解析进程数，0 表示在当前进程中解析。
+
+        Returns:
+            List[str]: 提取到的正文，失败的 URL 对应空字符串。
+        """
         self.logger.log_info(f"【ContentExtractor】Start batch extracting content from {len(urls)} URLs")
         if not urls:
             return []
-        results = [None] * len(urls)  # Initialize a list to hold results in order
-        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
-            tasks = {executor.submit(self.extract_content, url, lang): i for i, (url, lang) in enumerate(zip(urls, langs))}
-            
-            for future in as_completed(tasks):
-                index = tasks[future]
-                results[index] = future.result()
-        
+        # 按主机调度：同一主机限制并发并保持间隔，其他主机的任务可以插队
+        pool = self.get_parse_pool(parse_workers)
+        with HostScheduler(max_workers=min(max_workers, len(urls))) as scheduler:
+            futures, entries, downloads = [], [], []
+            for url, lang in zip(urls, langs):
+                entry = self._lookup_cache(url)
+                entries.append(entry)
+                downloads.append(None)
+                if entry is not None and entry['fresh']:
+                    futures.append(_completed(entry['content']))
+                elif not self._breaker_allows(url):
+                    futures.append(_completed(entry['content'] if entry is not None else ''))
+                else:
+                    order = self.extractor_stats.rank(urlparse(url).netloc, EXTRACTORS)
+                    downloads[-1] = scheduler.submit(url, self.fetch_page, url, *self._validators(entry))
+                    futures.append(pool.then(downloads[-1], parse_page, url, lang, order))
+
+            results = []
+            for url, entry, download, future in zip(urls, entries, downloads, futures):
+                try:
+                    result = future.result()
+                    if download is not None and isinstance(result, tuple):
+                        result = self._finish_page(url, entry, download.result(), result)
+                except DisallowedByRobots:
+                    self.logger.log_info(f"【Robots】Disallowed: {url}")
+                    result = ''
+                finally:
+                    if download is not None:
+                        self.circuit_breaker.release(url)
+                results.append(result)
         return results
 
 
+# 解析进程中常驻的提取器，由 init_parse_worker 创建
+_parse_worker = None
+
+def init_parse_worker(worker_logger=None):
+    """解析进程的初始化函数：创建常驻的提取器并预热 lxml 与各提取库。
+
+    Args:
+        worker_logger: 解析进程使用的 logger，默认使用模块的 logger。
+    """
+    global _parse_worker
+    _parse_worker = ContentExtractor(extractor_stats=ExtractorStats(':memory:'),
+                                     content_cache=ContentCache(':memory:'),
+                                     circuit_breaker=CircuitBreaker(':memory:'))
+    if worker_logger is not None:
+        _parse_worker.logger = worker_logger
+    _parse_worker.try_extractors('<html><body><p>warm up</p></body></html>', 'http://localhost/', 'en')
+
+def parse_page(page, url, lang, order):
+    """在解析进程中处理 fetch_page 的返回值，下载失败或 304 时不解析，PDF 文本直接返回。"""
+    if page and page[1]['kind'] == PDF:
+        return _pdf_result(page)
+    return parse_html(page[0] if page else "", url, lang, order)
+
+def _pdf_result(page):
+    """把下载时提取的 PDF 文本转换为 try_extractors 的返回格式。"""
+    return page[0], 'PDF' if page[0] else None, []
+
+def _completed(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+def parse_html(html, url, lang, order):
+    """在解析进程中从已下载的 HTML 提取正文，返回值同 ContentExtractor.try_extractors。"""
+    if not html:
+        return "", None, []
+    if _parse_worker is None:
+        init_parse_worker()
+    return _parse_worker.try_extractors(html, url, lang, order)
+
+
 if __name__ == "__main__":
-    import pandas as pd
-    df = pd.read_csv("data/test.csv", sep="	")
-    urls = df["url"].tolist()
-    langs = ['zh'] * len(urls)
-    config = CONFIG()
-    logger = Log()
-    extractor = ContentExtractor(config=config, logger=logger)
-    url = 'https://blog.csdn.net/qq_38670588/article/details/108186884'
-    result = extractor.extract_content(url)
-    pprint(result)
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description='下载并提取 URL 的正文')
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--lang', default='zh')
+    args = parser.parse_args()
+
+    extractor = ContentExtractor()
+    try:
+        for url in args.urls:
+            pprint(extractor.extract_content(url, args.lang))
+        pprint(extractor.quality_dict)
+    finally:
+        extractor.close()
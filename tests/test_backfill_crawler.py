@@ -0,0 +1,70 @@
+# tests/test_backfill_crawler.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+import requests
+from unittest.mock import MagicMock
+from util.item_store import ItemStore
+from util.backfill_crawler import BackfillCrawler
+
+
+class TestBackfillCrawler(unittest.TestCase):
+    """测试 BackfillCrawler 类。"""
+
+    def setUp(self):
+        self.store = ItemStore(':memory:', max_items=10000, logger=MagicMock())
+        self.fetcher = MagicMock(max_workers=4)
+
+        def get_json(path):
+            if path == 'maxitem.json':
+                return 50
+            item_id = int(path.split('/')[1].split('.')[0])
+            if item_id == 42:
+                raise requests.ConnectionError('reset')
+            if item_id % 10 == 0:
+                return None  # 已删除的条目
+            return {'id': item_id}
+        self.fetcher.get_json.side_effect = get_json
+
+    def test_run_resumes_from_checkpoint(self):
+        """测试中断后从断点继续，并记录失败的 ID。"""
+        crawler = BackfillCrawler(self.fetcher, self.store, batch_size=7,
+                                  requests_per_second=0, logger=MagicMock())
+        stats = crawler.run(max_items=20)
+        self.assertEqual(stats['processed'], 20)
+        self.assertEqual(crawler.load_checkpoint()['cursor'], 30)
+        self.assertEqual(self.store.failed_ids('backfill'), [42])
+
+        stats = crawler.run()
+        self.assertEqual(stats['processed'], 30)
+        self.assertEqual(crawler.load_checkpoint()['cursor'], 0)
+        # 50 个 ID 中 5 个已删除、1 个请求失败
+        self.assertEqual(len(self.store), 44)
+        self.assertEqual(self.store.cached_items([42, 41]), [41])
+        self.assertEqual(crawler.load_checkpoint()['high_water'], 50)
+
+    def test_finished_backfill_only_crawls_new_items(self):
+        """测试回填完成后再次运行只抓取 maxitem 到高水位之间的新条目。"""
+        crawler = BackfillCrawler(self.fetcher, self.store, batch_size=7,
+                                  requests_per_second=0, logger=MagicMock())
+        crawler.run()
+        self.assertEqual(crawler.run()['processed'], 0)
+
+        get_json = self.fetcher.get_json.side_effect
+        self.fetcher.get_json.side_effect = lambda path: 55 if path == 'maxitem.json' else get_json(path)
+        stats = crawler.run()
+        self.assertEqual(stats['processed'], 5)
+        self.assertEqual(crawler.load_checkpoint()['high_water'], 55)
+        self.assertEqual(len(self.store), 49)
+
+    def test_retry_failed(self):
+        """测试失败 ID 持久化在 failed 表中，重试成功后删除。"""
+        self.store.add_failed('backfill', [41, 42])
+        crawler = BackfillCrawler(self.fetcher, self.store, requests_per_second=0, logger=MagicMock())
+        self.assertEqual(crawler.retry_failed(), 1)
+        self.assertEqual(self.store.failed_ids('backfill'), [42])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# tests/test_circuit_breaker.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from util.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """测试 CircuitBreaker 类。"""
+
+    def _breaker(self, path=':memory:', **kwargs):
+        kwargs = {'failure_threshold': 2, 'host_ttl': 100, 'url_ttl': 10, 'max_ttl': 1000, **kwargs}
+        return CircuitBreaker(path, logger=MagicMock(), **kwargs)
+
+    def test_url_negative_cache_backs_off(self):
+        """测试失败的 URL 在冷却期内被拒绝，冷却时间随失败次数翻倍。"""
+        breaker = self._breaker(failure_threshold=10)
+        breaker.record_failure('https://a.com/1')
+        self.assertFalse(breaker.allow('https://a.com/1?utm_source=x'))
+        self.assertTrue(breaker.allow('https://a.com/2'))
+        breaker.record_failure('https://a.com/1')
+        retry_at = breaker.conn.execute('SELECT retry_at FROM urls').fetchone()[0]
+        self.assertAlmostEqual(retry_at - time.time(), 20, delta=1)
+        breaker.record_success('https://a.com/1')
+        self.assertTrue(breaker.allow('https://a.com/1'))
+
+    def test_open_half_open_closed(self):
+        """测试连续失败后熔断，到期后只放行一个探测请求，探测失败时冷却时间翻倍。"""
+        breaker = self._breaker()
+        breaker.record_failure('https://a.com/1')
+        self.assertEqual(breaker.state('a.com'), CLOSED)
+        breaker.record_failure('https://a.com/2')
+        self.assertEqual(breaker.state('a.com'), OPEN)
+        self.assertFalse(breaker.allow('https://a.com/3'))
+
+        breaker.conn.execute('UPDATE hosts SET open_until = 0')
+        self.assertEqual(breaker.state('a.com'), HALF_OPEN)
+        self.assertTrue(breaker.allow('https://a.com/3'))
+        self.assertFalse(breaker.allow('https://a.com/4'))
+        breaker.record_failure('https://a.com/3')
+        self.assertEqual(breaker.state('a.com'), OPEN)
+        open_until = breaker.conn.execute('SELECT open_until FROM hosts').fetchone()[0]
+        self.assertAlmostEqual(open_until - time.time(), 200, delta=1)
+
+        breaker.conn.execute('UPDATE hosts SET open_until = 0')
+        self.assertTrue(breaker.allow('https://a.com/5'))
+        breaker.record_success('https://a.com/5')
+        self.assertEqual(breaker.state('a.com'), CLOSED)
+        self.assertEqual(breaker.stats(), {'open': 0, 'half_open': 0, 'cooling_urls': 3, 'rejected': 2})
+
+    def test_probe_released_or_expired(self):
+        """测试探测请求释放后放行下一个探测，未释放的探测请求在 probe_timeout 秒后过期。"""
+        breaker = self._breaker(probe_timeout=60)
+        breaker.record_failure('https://a.com/1')
+        breaker.record_failure('https://a.com/2')
+        breaker.conn.execute('UPDATE hosts SET open_until = 0')
+        self.assertTrue(breaker.allow('https://a.com/3'))
+        self.assertFalse(breaker.allow('https://a.com/4'))
+        breaker.release('https://a.com/3')
+        self.assertEqual(breaker.state('a.com'), HALF_OPEN)
+        self.assertTrue(breaker.allow('https://a.com/4'))
+        with patch('util.circuit_breaker.time.time', return_value=time.time() + 30):
+            self.assertFalse(breaker.allow('https://a.com/5'))
+        with patch('util.circuit_breaker.time.time', return_value=time.time() + 61):
+            self.assertTrue(breaker.allow('https://a.com/5'))
+
+    def test_url_only_failure(self):
+        """测试 count_host=False 的失败只让该 URL 进入冷却，不计入主机的连续失败。"""
+        breaker = self._breaker()
+        for i in range(3):
+            breaker.record_failure(f'https://a.com/{i}', count_host=False)
+        self.assertEqual(breaker.state('a.com'), CLOSED)
+        self.assertFalse(breaker.allow('https://a.com/0'))
+        self.assertTrue(breaker.allow('https://a.com/3'))
+
+    def test_state_is_persisted(self):
+        """测试熔断状态跨实例保留。"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'breaker.sqlite3')
+            breaker = self._breaker(path)
+            breaker.record_failure('https://a.com/1')
+            breaker.record_failure('https://a.com/2')
+            breaker.close()
+            breaker = self._breaker(path)
+            self.assertFalse(breaker.allow('https://a.com/3'))
+            breaker.close()
+
+    def test_prunes_expired_and_caps_urls(self):
+        """测试冷却结束超过保留时间的 URL 记录在重新打开时删除，记录数超过上限时删除最旧的。"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'breaker.sqlite3')
+            breaker = self._breaker(path, failure_threshold=100, retention=50)
+            with patch('util.circuit_breaker.time.time', return_value=1000):
+                breaker.record_failure('https://dead.com/1')
+            breaker.record_failure('https://a.com/1')
+            breaker.close()
+            breaker = self._breaker(path, failure_threshold=100, retention=50, max_urls=2)
+            self.assertEqual([row[0] for row in breaker.conn.execute('SELECT host FROM urls')], ['a.com'])
+            self.assertEqual([row[0] for row in breaker.conn.execute('SELECT host FROM hosts')], ['a.com'])
+
+            breaker.PRUNE_INTERVAL = 1
+            for i in range(2, 5):
+                breaker.record_failure(f'https://a.com/{i}')
+            urls = [row[0] for row in breaker.conn.execute('SELECT url FROM urls ORDER BY updated_at')]
+            self.assertEqual(urls, ['https://a.com/3', 'https://a.com/4'])
+            breaker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
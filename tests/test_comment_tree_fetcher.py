@@ -0,0 +1,45 @@
+# tests/test_comment_tree_fetcher.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+from unittest.mock import MagicMock
+from util.comment_tree_fetcher import CommentTreeFetcher
+
+
+class TestCommentTreeFetcher(unittest.TestCase):
+    """测试 CommentTreeFetcher 类。"""
+
+    def setUp(self):
+        self.items = {
+            10: {'id': 10, 'by': 'a', 'text': 'first', 'kids': [11, 12]},
+            11: {'id': 11, 'by': 'b', 'text': 'reply', 'kids': [13]},
+            12: {'id': 12, 'deleted': True},
+            13: {'id': 13, 'by': 'c', 'text': 'too deep'},
+            20: {'id': 20, 'by': 'd', 'text': 'second'},
+        }
+        self.fetcher = MagicMock(max_workers=4)
+        self.fetcher.fetch_item.side_effect = lambda item_id: self.items.get(item_id, {})
+
+    def test_fetch_tree_respects_depth_and_skips_deleted(self):
+        """测试按层抓取时遵守最大深度并跳过已删除的评论。"""
+        tree_fetcher = CommentTreeFetcher(self.fetcher, max_depth=2, max_comments=100,
+                                          time_budget=5, logger=MagicMock())
+        tree = tree_fetcher.fetch_tree({'id': 1, 'kids': [10, 20]})
+        self.assertEqual([node['id'] for node in tree], [10, 20])
+        self.assertEqual([node['id'] for node in tree[0]['children']], [11])
+        self.assertEqual(tree[0]['children'][0]['children'], [])
+        self.assertNotIn('kids', tree[0])
+
+    def test_fetch_trees_limits_comments_and_deduplicates(self):
+        """测试每条新闻的评论数上限以及跨新闻去重。"""
+        tree_fetcher = CommentTreeFetcher(self.fetcher, max_depth=3, max_comments=2,
+                                          time_budget=5, logger=MagicMock())
+        trees = tree_fetcher.fetch_trees([{'id': 1, 'kids': [10, 20]}, {'id': 2, 'kids': [20]}])
+        self.assertEqual([node['id'] for node in trees[1]], [10, 20])
+        self.assertEqual(trees[1][0]['children'], [])
+        self.assertEqual(trees[2], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
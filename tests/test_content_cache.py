@@ -0,0 +1,51 @@
+# tests/test_content_cache.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+from unittest.mock import MagicMock
+from util.content_cache import ContentCache, canonical_url
+
+
+class TestContentCache(unittest.TestCase):
+    """测试 ContentCache 类与 canonical_url。"""
+
+    def test_canonical_url(self):
+        """测试规范化协议、主机、端口、跟踪参数与片段。"""
+        self.assertEqual(
+            canonical_url('HTTPS://Example.COM:443/a?utm_source=hn&b=2&fbclid=x&a=1#top'),
+            'https://example.com/a?a=1&b=2'
+        )
+        self.assertEqual(canonical_url('http://example.com'), 'http://example.com/')
+        self.assertEqual(canonical_url('http://example.com:8080/x'), 'http://example.com:8080/x')
+
+    def test_get_put_and_touch(self):
+        """测试新鲜度判断、304 续期与命中率统计。"""
+        cache = ContentCache(':memory:', ttl=60, logger=MagicMock())
+        self.assertIsNone(cache.get('https://example.com/a'))
+        cache.put('https://example.com/a?utm_medium=rss', 'text', '"v1"', None)
+        entry = cache.get('https://example.com/a')
+        self.assertEqual((entry['content'], entry['etag'], entry['fresh']), ('text', '"v1"', True))
+
+        cache.ttl = -1
+        self.assertFalse(cache.get('https://example.com/a')['fresh'])
+        cache.touch('https://example.com/a')
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'stale': 1, 'revalidated': 1,
+                                         'evictions': 0, 'hit_rate': 0.667})
+
+    def test_evicts_least_recently_used(self):
+        """测试超过条目数或字节数上限时淘汰最久未访问的条目。"""
+        cache = ContentCache(':memory:', max_entries=2, max_bytes=10, logger=MagicMock())
+        cache.put('https://example.com/1', 'aaa')
+        cache.put('https://example.com/2', 'bbb')
+        cache.get('https://example.com/1')
+        cache.put('https://example.com/3', 'ccc')
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('https://example.com/2'))
+        cache.put('https://example.com/4', 'x' * 8)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.evictions, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# tests/test_density_extractor.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+from benchmarks.hn_simulator import Corpus
+from util.density_extractor import DensityExtractor
+from util.html_document import HtmlDocument
+
+
+class TestDensityExtractor(unittest.TestCase):
+    """测试 DensityExtractor 类。"""
+
+    def setUp(self):
+        self.extractor = DensityExtractor(min_chars=500)
+
+    def test_article_high_confidence(self):
+        """测试普通文章页面以高置信度提取正文，不包含导航与页脚。"""
+        corpus = Corpus.synthetic(5, pdf_ratio=0.0)
+        for content_type, body in corpus.pages.values():
+            content, confidence = self.extractor.extract(HtmlDocument(body.decode('utf-8')))
+            self.assertGreater(confidence, 0.9)
+            self.assertNotIn('Related', content)
+            self.assertNotIn('Copyright', content)
+
+    def test_link_list_low_confidence(self):
+        """测试以链接为主的列表页没有可用的正文。"""
+        items = ''.join(f'<li><a href="/{i}">Story number {i} about something interesting</a></li>' for i in range(30))
+        self.assertEqual(self.extractor.extract(HtmlDocument(f'<html><body><ul>{items}</ul></body></html>')),
+                         ('', 0.0))
+
+    def test_split_content_and_short_text_low_confidence(self):
+        """测试正文与评论等内容分散在不同节点，或正文过短时置信度低。"""
+        paragraph = '<p>' + 'sentence, ' * 30 + '</p>'
+        split = (f'<html><body><div class="story">{paragraph}</div>'
+                 f'<div class="comments">{paragraph * 2}</div></body></html>')
+        self.assertLess(self.extractor.extract(HtmlDocument(split))[1], 0.5)
+        short = '<html><body><article><p>A short note, only a few words long.</p></article></body></html>'
+        content, confidence = self.extractor.extract(HtmlDocument(short))
+        self.assertEqual(content, 'A short note, only a few words long.')
+        self.assertLess(confidence, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# tests/test_download.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+from unittest.mock import MagicMock
+from util.download import (
+    PDF, HTML, ResponseTooLarge, parse_content_type, sniff_kind, read_body, detect_encoding, decode_html,
+)
+
+
+class TestDownload(unittest.TestCase):
+    """测试 util.download 模块。"""
+
+    def test_parse_content_type(self):
+        """测试解析 MIME 类型与字符集。"""
+        self.assertEqual(parse_content_type('Text/HTML; charset="GBK"'), ('text/html', 'GBK'))
+        self.assertEqual(parse_content_type(None), ('', None))
+
+    def test_sniff_kind(self):
+        """测试魔数优先于 Content-Type，未知类型按内容判断，二进制类型返回 None。"""
+        self.assertEqual(sniff_kind('text/html', b'%PDF-1.7\n'), PDF)
+        self.assertEqual(sniff_kind('application/pdf', b''), PDF)
+        self.assertEqual(sniff_kind('application/xhtml+xml', b'<html>'), HTML)
+        self.assertEqual(sniff_kind('', b'<!doctype html>'), HTML)
+        self.assertIsNone(sniff_kind('application/octet-stream', b'\x1f\x8b\x08\x00'))
+        self.assertIsNone(sniff_kind('video/mp4', b'<html>'))
+
+    def test_read_body_cap(self):
+        """测试读取的字节数超过上限时关闭响应并抛出 ResponseTooLarge。"""
+        response = MagicMock(headers={}, iter_content=MagicMock(return_value=iter([b'a' * 10] * 3)))
+        with self.assertRaises(ResponseTooLarge):
+            read_body(response, 25, prefix=b'b')
+        response.close.assert_called_once()
+
+        response = MagicMock(headers={}, iter_content=MagicMock(return_value=iter([b'a' * 10] * 3)))
+        self.assertEqual(read_body(response, 31, prefix=b'b'), b'b' + b'a' * 30)
+
+    def test_detect_encoding(self):
+        """测试按 BOM、响应头、<meta> 的顺序确定编码，都没有时推测。"""
+        self.assertEqual(detect_encoding('\ufeff中文'.encode('utf-8'), 'gbk'), 'utf-8-sig')
+        self.assertEqual(detect_encoding(b'<meta charset="utf-8">', 'gb2312'), 'gb2312')
+        self.assertEqual(detect_encoding(b'<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">'),
+                         'shift_jis')
+        text = '<html><body>' + '中文正文内容。' * 50 + '</body></html>'
+        self.assertEqual(decode_html(text.encode('utf-8')), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
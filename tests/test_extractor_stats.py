@@ -0,0 +1,56 @@
+# tests/test_extractor_stats.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import json, tempfile
+import unittest
+from unittest.mock import MagicMock
+from util.extractor_stats import ExtractorStats, EXTRACTORS
+
+
+class TestExtractorStats(unittest.TestCase):
+    """测试 ExtractorStats 类。"""
+
+    def test_default_order_until_enough_attempts(self):
+        """测试尝试次数不足时使用默认顺序。"""
+        stats = ExtractorStats(':memory:', epsilon=0, min_attempts=3, logger=MagicMock())
+        stats.record('a.com', 'newspaper3k', False, 0, 0.1)
+        self.assertEqual(stats.rank('a.com'), list(EXTRACTORS))
+
+    def test_rank_prefers_successful_extractor(self):
+        """测试按主机的成功率排序，成功率相同时耗时短的优先。"""
+        stats = ExtractorStats(':memory:', epsilon=0, min_attempts=3, logger=MagicMock())
+        for _ in range(3):
+            stats.record('a.com', 'newspaper3k', False, 0, 0.2)
+            stats.record('a.com', 'readability', True, 500, 0.05)
+            stats.record('a.com', 'gne', True, 400, 0.01)
+        self.assertEqual(stats.rank('a.com'), ['gne', 'readability', 'newspaper3k'])
+        self.assertEqual(stats.rank('b.com'), list(EXTRACTORS))
+        self.assertEqual(stats.host_stats('a.com')['readability'],
+                         {'attempts': 3, 'success_rate': 1.0, 'avg_length': 500, 'avg_latency': 0.05})
+
+    def test_exploration_moves_other_extractor_first(self):
+        """测试探索时把非最优的提取器提到最前。"""
+        stats = ExtractorStats(':memory:', epsilon=1, min_attempts=1, seed=0, logger=MagicMock())
+        stats.record('a.com', 'gne', True, 100, 0.01)
+        self.assertNotEqual(stats.rank('a.com')[0], 'gne')
+
+    def test_persist_and_export(self):
+        """测试统计结果持久化并可导出为 JSON。"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'stats.sqlite3')
+            stats = ExtractorStats(path, logger=MagicMock())
+            stats.record('a.com', 'gne', True, 100, 0.5)
+            stats.close()
+
+            stats = ExtractorStats(path, logger=MagicMock())
+            report = stats.export(os.path.join(tmp, 'stats.json'))
+            stats.close()
+            self.assertEqual(report, [{'host': 'a.com', 'extractor': 'gne', 'attempts': 1,
+                                       'success_rate': 1.0, 'avg_length': 100, 'avg_latency': 0.5}])
+            with open(os.path.join(tmp, 'stats.json'), encoding='utf-8') as f:
+                self.assertEqual(json.load(f), report)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,16 @@ import sys,os
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
 
 import unittest
-from unittest.mock import patch
+import requests
+from unittest.mock import patch, MagicMock
 from util.hacker_news_fetcher import HackerNewsFetcher
+from util.item_store import ItemStore
 
 
 class TestHackerNewsFetcher(unittest.TestCase):
     """测试 HackerNewsFetcher 类。"""
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_latest_news_success(self, mock_get):
         """测试成功获取新闻列表的情况。"""
         mock_get.return_value.json.return_value = [1, 2, 3]
@@ -20,7 +22,7 @@ class TestHackerNewsFetcher(unittest.TestCase):
         news_list = fetcher.fetch_latest_news()
         self.assertEqual(len(news_list), 2)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_news_detail_success(self, mock_get):
         """测试成功获取新闻详情的情况。"""
         mock_get.return_value.json.return_value = {'id': 1, 'title': 'Test News'}
@@ -29,6 +31,77 @@ class TestHackerNewsFetcher(unittest.TestCase):
         fetcher = HackerNewsFetcher()
         news_detail = fetcher.fetch_news_detail(1)
         self.assertEqual(news_detail['title'], 'Test News')
-        
+
+    @patch('requests.Session.get')
+    def test_fetch_news_details_keeps_order_and_skips_failed(self, mock_get):
+        """测试并发获取详情时保持原有顺序并跳过失败的条目。"""
+        def fake_get(url, timeout=None):
+            response = MagicMock()
+            news_id = int(url.rsplit('/', 1)[-1].split('.')[0])
+            if news_id == 3:
+                response.raise_for_status.side_effect = requests.HTTPError('500')
+            response.json.return_value = {'id': news_id}
+            return response
+        mock_get.side_effect = fake_get
+
+        fetcher = HackerNewsFetcher(max_workers=4)
+        news_list = fetcher.fetch_news_details([5, 4, 3, 2, 1])
+        self.assertEqual([news['id'] for news in news_list], [5, 4, 2, 1])
+
+    @patch('requests.Session.get')
+    def test_sync_updates_refreshes_only_cached_entries(self, mock_get):
+        """测试增量同步只刷新缓存中已有且发生变更的条目与用户。"""
+        responses = {
+            'maxitem.json': 120,
+            'updates.json': {'items': [1, 2, 99], 'profiles': ['pg', 'unknown']},
+            'item/1.json': {'id': 1, 'score': 10},
+            'item/2.json': {'id': 2, 'score': 20},
+            'user/pg.json': {'id': 'pg', 'karma': 2},
+        }
+        def fake_get(url, timeout=None):
+            response = MagicMock()
+            response.json.return_value = responses[url.split('/v0/', 1)[1]]
+            return response
+        mock_get.side_effect = fake_get
+
+        store = ItemStore(':memory:', logger=MagicMock())
+        store.put_many([{'id': 1, 'score': 1}, {'id': 2, 'score': 2}, {'id': 3, 'score': 3}])
+        store.put_users([{'id': 'pg', 'karma': 1}])
+        store.set_meta('maxitem', 100)
+
+        fetcher = HackerNewsFetcher(item_store=store, incremental=True, logger=MagicMock())
+        result = fetcher.sync_updates()
+        self.assertEqual(result, {'items': 2, 'profiles': 1, 'new_items': 20})
+        requested = sorted(call.args[0].split('/v0/', 1)[1] for call in mock_get.call_args_list)
+        self.assertEqual(requested, ['item/1.json', 'item/2.json', 'maxitem.json', 'updates.json', 'user/pg.json'])
+        self.assertEqual(store.get(1)['score'], 10)
+        self.assertEqual(store.get_user('pg')['karma'], 2)
+        self.assertEqual(store.get_meta('maxitem'), 120)
+
+    @patch('requests.Session.get')
+    def test_fetch_feeds_requests_each_item_once(self, mock_get):
+        """测试多个列表重叠的条目只请求一次，并保持各列表的顺序。"""
+        responses = {
+            'topstories.json': [1, 2, 3],
+            'newstories.json': [3, 4, 1],
+            'item/1.json': {'id': 1},
+            'item/2.json': {'id': 2},
+            'item/3.json': {'id': 3},
+            'item/4.json': None,
+        }
+        def fake_get(url, timeout=None):
+            response = MagicMock()
+            response.json.return_value = responses[url.split('/v0/', 1)[1]]
+            return response
+        mock_get.side_effect = fake_get
+
+        fetcher = HackerNewsFetcher(top_n=3, logger=MagicMock())
+        feeds = fetcher.fetch_feeds(['top', 'new'])
+        self.assertEqual([news['id'] for news in feeds['top']], [1, 2, 3])
+        self.assertEqual([news['id'] for news in feeds['new']], [3, 1])
+        self.assertEqual(mock_get.call_count, 6)
+        with self.assertRaises(ValueError):
+            fetcher.fetch_feeds(['front'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,34 @@
+# tests/test_hn_simulator.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+from unittest.mock import MagicMock
+from benchmarks.hn_simulator import Corpus, HNSimulator
+from util.hacker_news_fetcher import HackerNewsFetcher
+
+
+class TestHNSimulator(unittest.TestCase):
+    """通过本地模拟器端到端测试 HackerNewsFetcher。"""
+
+    def test_fetcher_against_simulator(self):
+        """测试从模拟器获取新闻列表与多个列表。"""
+        corpus = Corpus.synthetic(30, with_pages=False)
+        with HNSimulator(corpus) as simulator:
+            fetcher = HackerNewsFetcher(top_n=10, logger=MagicMock(), base_url=simulator.api_base)
+            news_list = fetcher.fetch_latest_news()
+            self.assertEqual([news['id'] for news in news_list], corpus.feeds['top'][:10])
+            feeds = fetcher.fetch_feeds(['top', 'new', 'best'])
+            self.assertEqual(len(feeds['new']), 10)
+            self.assertEqual(fetcher.get_json('maxitem.json'), max(corpus.items))
+
+    def test_injected_errors_are_skipped(self):
+        """测试模拟器返回 500 时对应条目被跳过。"""
+        corpus = Corpus.synthetic(30, with_pages=False)
+        with HNSimulator(corpus, error_rate=1.0) as simulator:
+            fetcher = HackerNewsFetcher(top_n=10, logger=MagicMock(), base_url=simulator.api_base)
+            self.assertEqual(fetcher.fetch_latest_news(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+# tests/test_host_scheduler.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, threading
+import unittest
+from unittest.mock import patch, MagicMock
+from util.host_scheduler import HostScheduler, RobotsCache, DisallowedByRobots
+from util.utils import deadline, time_left
+
+
+class TestHostScheduler(unittest.TestCase):
+    """测试 HostScheduler 类。"""
+
+    def _tracker(self):
+        """返回一个记录每个主机最大并发数与开始时间的任务函数。"""
+        lock = threading.Lock()
+        active, peak, starts = {}, {}, []
+
+        def task(url):
+            host = url.split('/')[2]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+                starts.append((host, time.monotonic()))
+            time.sleep(0.05)
+            with lock:
+                active[host] -= 1
+            return url
+
+        return task, peak, starts
+
+    def test_per_host_limit_and_order(self):
+        """测试同一主机的并发数不超过上限，且结果按输入顺序返回。"""
+        task, peak, _ = self._tracker()
+        urls = [f'https://a.com/{i}' for i in range(6)] + [f'https://b.com/{i}' for i in range(3)]
+        with HostScheduler(max_workers=8, per_host_limit=2, min_delay=0, robots=None) as scheduler:
+            results = scheduler.map(task, urls)
+        self.assertEqual(results, urls)
+        self.assertLessEqual(peak['a.com'], 2)
+        self.assertLessEqual(peak['b.com'], 2)
+
+    def test_min_delay_interleaves_hosts(self):
+        """测试同一主机的请求保持最短间隔，等待期间其他主机的任务照常执行。"""
+        task, _, starts = self._tracker()
+        urls = ['https://a.com/1', 'https://a.com/2', 'https://b.com/1', 'https://c.com/1']
+        with HostScheduler(max_workers=4, per_host_limit=2, min_delay=0.3, robots=None) as scheduler:
+            scheduler.map(task, urls)
+        a_starts = [t for host, t in starts if host == 'a.com']
+        self.assertGreaterEqual(a_starts[1] - a_starts[0], 0.28)
+        others = [t for host, t in starts if host != 'a.com']
+        self.assertTrue(all(t < a_starts[1] for t in others))
+
+    def test_exception_propagates(self):
+        """测试任务异常通过 Future 传递给调用方。"""
+        def fail(url):
+            raise ValueError(url)
+        with HostScheduler(max_workers=2, min_delay=0, robots=None) as scheduler:
+            future = scheduler.submit('https://a.com/1', fail, 'https://a.com/1')
+            with self.assertRaises(ValueError):
+                future.result()
+
+    def test_deadline_propagates_to_tasks(self):
+        """测试任务在工作线程中继承提交时设置的截止时间。"""
+        with HostScheduler(max_workers=2, min_delay=0, robots=None) as scheduler:
+            with deadline(5):
+                inside = scheduler.submit('https://a.com/1', time_left)
+            outside = scheduler.submit('https://a.com/2', time_left)
+            self.assertLessEqual(inside.result(), 5)
+            self.assertIsNone(outside.result())
+
+    @patch('requests.Session.get')
+    def test_robots_crawl_delay_and_disallow(self, mock_get):
+        """测试 robots.txt 只请求一次，Crawl-delay 生效，禁止的 URL 被跳过。"""
+        mock_get.return_value = MagicMock(status_code=200, text='User-agent: *\nCrawl-delay: 1\nDisallow: /private\n')
+        robots = RobotsCache()
+        task, _, starts = self._tracker()
+        with HostScheduler(max_workers=4, min_delay=0, robots=robots, obey_disallow=True) as scheduler:
+            futures = [scheduler.submit(url, task, url) for url in
+                       ['https://a.com/1', 'https://a.com/2', 'https://a.com/private/x']]
+            self.assertEqual(futures[0].result(), 'https://a.com/1')
+            self.assertEqual(futures[1].result(), 'https://a.com/2')
+            with self.assertRaises(DisallowedByRobots):
+                futures[2].result()
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertGreaterEqual(starts[1][1] - starts[0][1], 0.95)
+
+    @patch('requests.Session.get')
+    def test_robots_missing_allows_all(self, mock_get):
+        """测试 robots.txt 不存在时允许抓取且没有 Crawl-delay。"""
+        mock_get.return_value = MagicMock(status_code=404, text='')
+        robots = RobotsCache()
+        self.assertTrue(robots.can_fetch('https://a.com/private'))
+        self.assertEqual(robots.crawl_delay('https://a.com/'), 0.0)
+        self.assertEqual(mock_get.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
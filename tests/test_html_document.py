@@ -0,0 +1,36 @@
+# tests/test_html_document.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+from util.html_document import HtmlDocument, node_to_text
+
+
+class TestHtmlDocument(unittest.TestCase):
+    """测试 util.html_document 模块。"""
+
+    def test_parse_once_and_copy(self):
+        """测试 lxml 树只解析一次，副本的修改不影响共享的树。"""
+        document = HtmlDocument('<html><body><p>one</p></body></html>')
+        self.assertIs(document.tree, document.tree)
+        copy = document.copy()
+        copy.find('.//p').drop_tree()
+        self.assertEqual(node_to_text(document.tree), 'one')
+
+    def test_xml_declaration(self):
+        """测试带编码声明的 HTML 字符串也能解析。"""
+        document = HtmlDocument('<?xml version="1.0" encoding="gbk"?><html><body><p>中文</p></body></html>')
+        self.assertEqual(node_to_text(document.tree), '中文')
+
+    def test_node_to_text(self):
+        """测试块级元素换行、行内空白合并，跳过脚本、样式与注释，不包含根节点的 tail。"""
+        document = HtmlDocument(
+            '<html><body><div id="main"><h1>Title</h1><p>first   <b>bold</b>\n line<br>second</p>'
+            '<script>var x;</script><!-- note --><ul><li>a</li><li>b</li></ul></div>after</body></html>'
+        )
+        node = document.tree.get_element_by_id('main')
+        self.assertEqual(node_to_text(node), 'Title\nfirst bold line\nsecond\na\nb')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_http_transport.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+import requests
+from unittest.mock import patch, MagicMock
+from urllib.parse import urlparse
+from benchmarks.hn_simulator import Corpus, HNSimulator
+from util.http_transport import HttpTransport, transport as shared_transport, download_transport
+from util.hacker_news_fetcher import HackerNewsFetcher
+from util.extractor_stats import ExtractorStats
+from util.content_cache import ContentCache
+from util.circuit_breaker import CircuitBreaker
+from src.url_extractor import ContentExtractor
+from util.utils import deadline
+
+from config.config import PROXIES
+
+
+class TestHttpTransport(unittest.TestCase):
+    """测试 HttpTransport 类。"""
+
+    def test_timeout_normalization(self):
+        """测试超时参数统一为（连接超时, 读取超时）。"""
+        transport = HttpTransport(connect_timeout=2, read_timeout=5)
+        self.assertEqual(transport._timeout(None), (2, 5))
+        self.assertEqual(transport._timeout(10), (2, 10))
+        self.assertEqual(transport._timeout(1), (1, 1))
+        self.assertEqual(transport._timeout((4, 8)), (4, 8))
+        with deadline(0.5):
+            self.assertTrue(all(value <= 0.5 for value in transport._timeout(None)))
+        with deadline(-1):
+            with self.assertRaises(requests.Timeout):
+                transport._timeout(None)
+
+    @patch('requests.Session.get')
+    def test_defaults_applied(self, mock_get):
+        """测试请求带上统一的代理与超时，并按主机记录错误。"""
+        mock_get.return_value = MagicMock(status_code=503, content=b'busy')
+        transport = HttpTransport(proxies={'https': 'http://proxy:8080'}, connect_timeout=2, read_timeout=5)
+        transport.get('https://example.com/a', throttle=False)
+        _, kwargs = mock_get.call_args
+        self.assertEqual(kwargs['proxies'], {'https': 'http://proxy:8080'})
+        self.assertEqual(kwargs['timeout'], (2, 5))
+        self.assertEqual(transport.stats()['example.com'],
+                         {'requests': 1, 'errors': 1, 'bytes': 0, 'elapsed': 0.0})
+
+    @patch('requests.Session.get')
+    def test_proxy_is_opt_in(self, mock_get):
+        """测试默认直连：Hacker News API 与 robots.txt 请求不经过代理，只有正文下载使用 PROXIES。"""
+        mock_get.return_value = MagicMock(status_code=200, content=b'{}')
+        HttpTransport().get('https://hacker-news.firebaseio.com/v0/item/1.json', throttle=False)
+        _, kwargs = mock_get.call_args
+        self.assertNotIn('proxies', kwargs)
+        self.assertEqual(shared_transport.proxies, {})
+        self.assertIs(HackerNewsFetcher().transport, shared_transport)
+        extractor = ContentExtractor(ExtractorStats(':memory:'), ContentCache(':memory:'), CircuitBreaker(':memory:'))
+        self.assertIs(extractor.transport, download_transport)
+        self.assertEqual(download_transport.proxies, PROXIES)
+
+    def test_connections_are_reused(self):
+        """测试对同一主机的多次请求复用 keep-alive 连接，并声明压缩编码。"""
+        corpus = Corpus.synthetic(10, with_pages=False)
+        with HNSimulator(corpus) as simulator:
+            transport = HttpTransport(proxies={})
+            for item_id in corpus.feeds['top'][:5]:
+                response = transport.get(f'{simulator.api_base}/item/{item_id}.json')
+                self.assertEqual(response.json()['id'], item_id)
+            self.assertIn('gzip', response.request.headers['Accept-Encoding'])
+            stats = transport.stats()[urlparse(simulator.url).netloc]
+            self.assertEqual(stats['requests'], 5)
+            self.assertEqual(stats['connections'], 1)
+            self.assertGreater(stats['bytes'], 0)
+            transport.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
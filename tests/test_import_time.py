@@ -0,0 +1,84 @@
+# tests/test_import_time.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import subprocess
+import unittest
+from benchmarks.import_time import ROOT, parse_importtime, run
+
+from config.config import IMPORT_TIME_BUDGET_MS
+
+# 只应在第一次使用对应提取器或语言时导入的依赖
+LAZY_MODULES = ('newspaper', 'readability', 'gne', 'fitz', 'pymupdf', 'fake_headers', 'pandas')
+
+
+class TestImportTime(unittest.TestCase):
+    """测试启动时不导入提取库，且导入耗时不超过预算。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.report = run('src.main', repeat=3)
+
+    def test_parse_importtime(self):
+        """测试解析 -X importtime 的输出。"""
+        stderr = ('import time: self [us] | cumulative | imported package\n'
+                  'import time:       120 |        120 |     lxml._elementpath\n'
+                  'import time:      3000 |       3120 |   lxml.etree\n'
+                  'import time:       200 |       3320 | util.html_document\n')
+        entries = parse_importtime(stderr)
+        self.assertEqual([entry['name'] for entry in entries],
+                         ['lxml._elementpath', 'lxml.etree', 'util.html_document'])
+        self.assertEqual([entry['depth'] for entry in entries], [2, 1, 0])
+        self.assertEqual(entries[2]['cumulative_us'], 3320)
+
+    def test_heavy_dependencies_not_imported(self):
+        """测试导入 src.main 时不加载 newspaper3k、readability、gne、PyMuPDF 等依赖。"""
+        imported = {name.split('.')[0] for name in self.report['imported']}
+        self.assertEqual(imported & set(LAZY_MODULES), set())
+
+    def test_import_time_budget(self):
+        """测试导入 src.main 的耗时不超过 IMPORT_TIME_BUDGET_MS。"""
+        self.assertGreater(self.report['total_ms'], 0)
+        self.assertLessEqual(self.report['total_ms'], IMPORT_TIME_BUDGET_MS)
+
+    def test_no_filesystem_side_effects(self):
+        """测试导入 src.main 时不打开 SQLite 缓存文件。"""
+        code = '\n'.join([
+            'import sqlite3',
+            'opened = []',
+            'connect = sqlite3.connect',
+            'sqlite3.connect = lambda database, *args, **kwargs: opened.append(str(database)) or '
+            'connect(database, *args, **kwargs)',
+            'import src.main',
+            "print('opened:' + ','.join(opened))",
+        ])
+        completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True,
+                                   check=True)
+        opened = [line[len('opened:'):] for line in completed.stdout.splitlines() if line.startswith('opened:')]
+        self.assertEqual(opened, [''])
+
+    def test_extractors_imported_on_first_use(self):
+        """测试各提取库在第一次使用对应提取器时才导入。"""
+        code = '\n'.join([
+            'import sys',
+            'from src.url_extractor import ContentExtractor',
+            'from util.extractor_stats import ExtractorStats',
+            'from util.content_cache import ContentCache',
+            'from util.circuit_breaker import CircuitBreaker',
+            "extractor = ContentExtractor(ExtractorStats(':memory:'), ContentCache(':memory:'), CircuitBreaker(':memory:'))",
+            "loaded = lambda: ','.join(name for name in ('newspaper', 'readability', 'gne') if name in sys.modules)",
+            "html = '<html><body><article><p>' + 'Some words, ' * 40 + '</p></article></body></html>'",
+            "print('loaded:' + loaded())",
+            'extractor.extract_content_by_gne(html)',
+            "print('loaded:' + loaded())",
+            "extractor.extract_content_by_newspaper(html, 'https://example.com/a', 'en')",
+            "print('loaded:' + loaded())",
+        ])
+        completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True,
+                                   check=True)
+        loaded = [line[len('loaded:'):] for line in completed.stdout.splitlines() if line.startswith('loaded:')]
+        self.assertEqual(loaded, ['', 'gne', 'newspaper,gne'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# tests/test_item_store.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+from unittest.mock import patch, MagicMock
+from util.item_store import ItemStore
+from util.hacker_news_fetcher import HackerNewsFetcher
+
+
+class TestItemStore(unittest.TestCase):
+    """测试 ItemStore 类。"""
+
+    def setUp(self):
+        self.store = ItemStore(':memory:', max_items=3, field_ttls={'score': 60}, logger=MagicMock())
+
+    def test_get_respects_field_ttls(self):
+        """测试易变字段过期后仍可读取不可变字段。"""
+        with patch('util.item_store.time.time', return_value=1000):
+            self.store.put({'id': 1, 'title': 'Test', 'url': 'https://example.com', 'score': 5})
+        with patch('util.item_store.time.time', return_value=1030):
+            self.assertEqual(self.store.get(1)['score'], 5)
+        with patch('util.item_store.time.time', return_value=2000):
+            self.assertIsNone(self.store.get(1))
+            self.assertEqual(self.store.get(1, fields=('url',))['url'], 'https://example.com')
+        self.assertIsNone(self.store.get(2))
+        stats = self.store.stats()
+        self.assertEqual((stats['hits'], stats['stale'], stats['misses']), (2, 1, 1))
+
+    def test_put_many_evicts_least_recently_used(self):
+        """测试超过容量时淘汰最久未访问的条目。"""
+        with patch('util.item_store.time.time', return_value=1000):
+            self.store.put_many([{'id': 1}, {'id': 2}, {'id': 3}])
+        with patch('util.item_store.time.time', return_value=1001):
+            self.store.get(1, fields=())
+        with patch('util.item_store.time.time', return_value=1002):
+            self.store.put_many([{'id': 4}, {'id': 5}])
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store.evictions, 2)
+        self.assertIsNotNone(self.store.get(1, fields=()))
+        self.assertIsNone(self.store.get(2, fields=()))
+
+    def test_size_tracks_writes_and_deletes(self):
+        """测试条目数随新增、覆盖与删除增减，与实际行数一致。"""
+        self.store.put_many([{'id': 1}, {'id': 2}, {'id': 2}])
+        self.store.put_many([{'id': 2, 'score': 1}])
+        self.assertEqual(len(self.store), 2)
+        self.store.invalidate([1, 9])
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.conn.execute('SELECT COUNT(*) FROM items').fetchone()[0], 1)
+
+    def test_unbounded_store_skips_eviction(self):
+        """测试 max_items 为 sys.maxsize 时不维护条目数，也不淘汰。"""
+        store = ItemStore(':memory:', max_items=sys.maxsize, logger=MagicMock())
+        store.put_many([{'id': item_id} for item_id in range(500)])
+        self.assertIsNone(store.max_items)
+        self.assertEqual(len(store), 500)
+        self.assertEqual(store.evictions, 0)
+
+    def test_cached_ids_in_chunks(self):
+        """测试查询大量 ID 时分批执行，不超过 SQLite 的参数个数限制。"""
+        store = ItemStore(':memory:', logger=MagicMock())
+        store.put_many([{'id': item_id} for item_id in range(0, 3000, 2)])
+        store.put_users([{'id': f'user{i}'} for i in range(0, 3000, 3)])
+        self.assertEqual(sorted(store.cached_items(range(3000))), list(range(0, 3000, 2)))
+        self.assertEqual(sorted(store.cached_users(f'user{i}' for i in range(3000))),
+                         sorted(f'user{i}' for i in range(0, 3000, 3)))
+        self.assertEqual(store.cached_users([]), [])
+
+    @patch('requests.Session.get')
+    def test_fetcher_uses_store(self, mock_get):
+        """测试 HackerNewsFetcher 命中缓存时不再请求 API。"""
+        mock_get.return_value.json.return_value = {'id': 1, 'title': 'Test News', 'url': 'https://example.com'}
+        mock_get.return_value.raise_for_status = lambda: None
+
+        fetcher = HackerNewsFetcher(item_store=self.store, logger=MagicMock())
+        self.assertEqual(fetcher.fetch_news_detail(1)['title'], 'Test News')
+        self.assertEqual(fetcher.fetch_news_detail(1)['title'], 'Test News')
+        self.assertEqual(fetcher.fetch_news_url(1), 'https://example.com')
+        self.assertEqual(mock_get.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
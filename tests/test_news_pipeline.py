@@ -0,0 +1,45 @@
+# tests/test_news_pipeline.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time
+import unittest
+from unittest.mock import MagicMock
+from util.news_pipeline import NewsPipeline
+from util.host_scheduler import HostScheduler
+
+
+class TestNewsPipeline(unittest.TestCase):
+    """测试 NewsPipeline 类。"""
+
+    def test_run_extracts_concurrently_and_keeps_order(self):
+        """测试乱序到达的新闻并发提取后按原顺序返回。"""
+        fetcher = MagicMock()
+        fetcher.iter_latest_news.return_value = iter([
+            (2, {'id': 3, 'url': 'https://example.com/3'}),
+            (0, {'id': 1, 'url': 'https://example.com/1'}),
+            (1, {}),
+            (3, {'id': 4}),
+        ])
+        extractor = MagicMock()
+        def extract_content(url, lang):
+            time.sleep(0.2)
+            return f'text of {url}'
+        extractor.extract_content.side_effect = extract_content
+        comment_fetcher = MagicMock()
+        comment_fetcher.fetch_trees.return_value = {1: [{'id': 10}]}
+
+        scheduler = HostScheduler(max_workers=4, min_delay=0, robots=None)
+        pipeline = NewsPipeline(fetcher, extractor, comment_fetcher, scheduler=scheduler, logger=MagicMock())
+        start = time.monotonic()
+        news_list = pipeline.run()
+        self.assertLess(time.monotonic() - start, 0.35)
+        self.assertEqual([news['id'] for news in news_list], [1, 3, 4])
+        self.assertTrue(news_list[0]['text'].endswith('text of https://example.com/1'))
+        self.assertNotIn('text', news_list[2])
+        self.assertEqual(news_list[0]['comments'], [{'id': 10}])
+        self.assertEqual(news_list[1]['comments'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# tests/test_parse_pool.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from util.parse_pool import ParsePool
+
+_state = {}
+
+def _init(value):
+    _state['value'] = value
+
+def _work(text, suffix):
+    return (text + suffix, _state.get('value'), os.getpid())
+
+def _fail(text):
+    raise ValueError(text)
+
+
+class TestParsePool(unittest.TestCase):
+    """测试 ParsePool 类。"""
+
+    def test_then_runs_in_warm_processes_in_order(self):
+        """测试下载结果交给已初始化的工作进程解析，并按提交顺序取回结果。"""
+        with ThreadPoolExecutor(max_workers=4) as threads, ParsePool(2, initializer=_init, initargs=('warm',)) as pool:
+            downloads = [threads.submit(str, i) for i in range(8)]
+            futures = [pool.then(download, _work, '!') for download in downloads]
+            results = [future.result() for future in futures]
+        self.assertEqual([text for text, _, _ in results], [f'{i}!' for i in range(8)])
+        self.assertTrue(all(value == 'warm' for _, value, _ in results))
+        self.assertTrue(all(pid != os.getpid() for _, _, pid in results))
+
+    def test_errors_propagate(self):
+        """测试下载或解析阶段的异常都会传递到最终结果。"""
+        with ParsePool(1) as pool:
+            failed_download = Future()
+            failed_download.set_exception(IOError('download'))
+            with self.assertRaises(IOError):
+                pool.then(failed_download, _work, '!').result()
+            download = Future()
+            download.set_result('page')
+            with self.assertRaises(ValueError):
+                pool.then(download, _fail).result()
+
+    def test_inline_mode(self):
+        """测试 max_workers 为 0 时在当前进程中执行。"""
+        with ParsePool(0, initializer=_init, initargs=('inline',)) as pool:
+            text, value, pid = pool.submit(_work, 'a', 'b').result()
+        self.assertEqual((text, value, pid), ('ab', 'inline', os.getpid()))
+
+
+if __name__ == '__main__':
+    unittest.main()
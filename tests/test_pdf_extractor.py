@@ -0,0 +1,107 @@
+# tests/test_pdf_extractor.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest, tempfile
+import fitz
+
+from util.parse_pool import ParsePool
+from util.pdf_extractor import PdfTooLarge, spool_to_tempfile, extract_pdf_text
+
+
+class FakeResponse:
+    """模拟以 stream=True 发出的响应。"""
+
+    def __init__(self, body: bytes, headers=None):
+        self.body = body
+        self.headers = headers or {}
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+def make_pdf(pages: int) -> str:
+    handle, path = tempfile.mkstemp(suffix='.pdf')
+    os.close(handle)
+    document = fitz.open()
+    for i in range(pages):
+        document.new_page().insert_text((72, 72), f'page {i:03d}')
+    document.save(path)
+    document.close()
+    return path
+
+
+class TestPdfExtractor(unittest.TestCase):
+    """测试 util.pdf_extractor 模块。"""
+
+    def setUp(self):
+        self.path = make_pdf(12)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_page_limit_and_char_cap(self):
+        """测试只提取前 max_pages 页，文本达到 max_chars 后截断。"""
+        text = extract_pdf_text(self.path, max_pages=3)
+        self.assertIn('page 002', text)
+        self.assertNotIn('page 003', text)
+        self.assertEqual(len(extract_pdf_text(self.path, max_chars=20)), 20)
+
+    def test_parallel_matches_serial(self):
+        """测试在进程池中并行提取的结果与串行一致。"""
+        serial = extract_pdf_text(self.path)
+        with ParsePool(2) as pool:
+            parallel = extract_pdf_text(self.path, pool_factory=lambda: pool, min_parallel_pages=4)
+        self.assertEqual(parallel, serial)
+        self.assertIn('page 011', serial)
+
+    def test_parallel_stops_at_char_cap(self):
+        """测试并行提取时文本达到 max_chars 后不再提交新的页段。"""
+        submitted = []
+        with ParsePool(2) as pool:
+            submit = pool.submit
+            pool.submit = lambda fn, *args: submitted.append(args[1]) or submit(fn, *args)
+            text = extract_pdf_text(self.path, max_chars=20, pool_factory=lambda: pool, min_parallel_pages=4)
+        self.assertEqual(text, extract_pdf_text(self.path, max_chars=20))
+        # 12 页按每段 2 页切成 6 段，前两段的文本已经超过 20 个字符
+        self.assertEqual(submitted, [0, 2, 4])
+
+    def test_small_pdf_does_not_start_pool(self):
+        """测试页数不足 min_parallel_pages 时不调用 pool_factory。"""
+        text = extract_pdf_text(self.path, pool_factory=lambda: self.fail('pool started'),
+                                min_parallel_pages=100)
+        self.assertIn('page 000', text)
+
+    def test_spool_to_tempfile(self):
+        """测试响应按块写入临时文件，开头已读出的部分会一起写入。"""
+        with open(self.path, 'rb') as f:
+            body = f.read()
+        path = spool_to_tempfile(FakeResponse(body[4:]), chunk_size=1024, prefix=body[:4])
+        try:
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), body)
+        finally:
+            os.remove(path)
+
+    def test_spool_byte_cap(self):
+        """测试 Content-Length 或实际字节数超过上限时放弃下载。"""
+        response = FakeResponse(b'x' * 100, headers={'Content-Length': '100'})
+        with self.assertRaises(PdfTooLarge):
+            spool_to_tempfile(response, max_bytes=50)
+        self.assertTrue(response.closed)
+
+        before = set(os.listdir(tempfile.gettempdir()))
+        response = FakeResponse(b'x' * 100)
+        with self.assertRaises(PdfTooLarge):
+            spool_to_tempfile(response, max_bytes=50, chunk_size=10)
+        self.assertTrue(response.closed)
+        self.assertEqual(set(os.listdir(tempfile.gettempdir())) - before, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# tests/test_rate_limiter.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time
+import unittest
+import requests
+from unittest.mock import MagicMock
+from util.rate_limiter import AdaptiveThrottle, TokenBucket, throttle_reason
+
+
+class TestRateLimiter(unittest.TestCase):
+    """测试 TokenBucket 与 AdaptiveThrottle。"""
+
+    def test_token_bucket_limits_rate(self):
+        """测试令牌用完后按速率等待。"""
+        bucket = TokenBucket(rate=100, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.045)
+
+    def test_throttle_backs_off_and_recovers(self):
+        """测试遇到 429 时减半，成功时线性恢复，冷却期内只减速一次。"""
+        throttle = AdaptiveThrottle('example.com', rate=40, max_rate=50, concurrency=8,
+                                    max_concurrency=16, cooldown=60, logger=MagicMock())
+        response = MagicMock(status_code=429, headers={'Retry-After': '0'})
+        for _ in range(2):
+            with throttle.slot() as slot:
+                slot.record(response)
+        self.assertEqual(throttle.limit, 4)
+        self.assertEqual(throttle.bucket.rate, 20)
+        self.assertEqual(throttle.throttle_events, 1)
+
+        for _ in range(4):
+            with throttle.slot() as slot:
+                slot.record(MagicMock(status_code=200))
+        self.assertAlmostEqual(throttle.limit, 5, delta=0.2)
+        self.assertEqual(throttle.bucket.rate, 24)
+        self.assertEqual(throttle.stats()['in_flight'], 0)
+
+    def test_throttle_reason(self):
+        """测试限流信号的分类。"""
+        self.assertEqual(throttle_reason(error=requests.Timeout()), '请求超时')
+        self.assertEqual(throttle_reason(MagicMock(status_code=503)), 'HTTP 503')
+        self.assertEqual(throttle_reason(MagicMock(status_code=404)), '')
+        self.assertEqual(throttle_reason(error=ValueError()), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# tests/test_singleflight.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from util.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """测试 SingleFlight 类。"""
+
+    def test_concurrent_calls_are_coalesced(self):
+        """测试同一 key 的并发调用只执行一次并共享结果。"""
+        singleflight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            release.wait(5)
+            return 'result'
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(singleflight.do, 'key', slow_call) for _ in range(4)]
+            while singleflight.coalesced < 3:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+        self.assertEqual(results, ['result'] * 4)
+        self.assertEqual(len(calls), 1)
+        # 调用完成后 key 被释放，再次调用会重新执行
+        self.assertEqual(singleflight.do('key', slow_call), 'result')
+        self.assertEqual(len(calls), 2)
+
+    def test_errors_are_shared(self):
+        """测试调用抛出的异常传递给调用方。"""
+        singleflight = SingleFlight()
+        with self.assertRaises(KeyError):
+            singleflight.do('key', lambda: {}['missing'])
+
+
+if __name__ == '__main__':
+    unittest.main()
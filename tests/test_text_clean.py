@@ -0,0 +1,133 @@
+# tests/test_text_clean.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import io
+import re
+import random
+import itertools
+import unittest
+from contextlib import redirect_stdout
+from util.text_clean import TextCleaner, init_clean_worker
+from util.parse_pool import ParsePool
+from util.rule_patterns import (
+    HTML_TAG_PATTERN, EXCEPTION_PATTERN, FULL_ANGLE_ALPHABET, HALF_ANGLE_ALPHABET, EMAIL_PATTERN,
+    REDUNDANT_PATTERN, IP_ADDRESS_PATTERN,
+)
+
+# 合并之前逐步清理的实现，作为对照
+URL_PATTERN = r'https?://(?:www\.)?[-\w@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-\w@:%_\+.~#?&//=]*)'
+REDUNDANT = '|'.join('(?<={char}){char}+'.format(char=re.escape(char)) for char in REDUNDANT_PATTERN)
+STEPS = [re.compile(pattern) for pattern in (HTML_TAG_PATTERN, URL_PATTERN, EXCEPTION_PATTERN, EMAIL_PATTERN)]
+FULL2HALF = str.maketrans(FULL_ANGLE_ALPHABET, HALF_ANGLE_ALPHABET)
+
+
+def reference_clean(text):
+    if not text:
+        return ''
+    for pattern in STEPS:
+        text = pattern.sub('', text)
+    text = text.translate(FULL2HALF)
+    text = re.sub(REDUNDANT, '', text)
+    return re.sub(IP_ADDRESS_PATTERN, '', '#' + text + '#')[1:-1]
+
+
+# 随机文本的组成部分，覆盖各条规则的边界情况
+FRAGMENTS = [
+    'a', 'Z', '0', '7', '25', '255', '256', '.', '..', ' ', '  ', '-', '--', '\t', '\n', '~', '　', '\xa0',
+    '•', '·', '・', '啊', '哈哈', '呀', '中文', '，', '。', '<', '>', '<p>', '</div>', '<a href="x">', '<中>',
+    'http', '://', 'https://www.example.com/a?b=1', 'http://x.io', '@', 'foo@bar.com', 'a.b@c.d.org',
+    '＠', '１', '９', '．', 'Ａ', 'ｚ', '！', '～', '\x01', '\x7f', 'é', 'Ω', 'я', '😀', '①', '℃',
+    '192.168.0.1', '10.0.0.255', '1.2.3.4.5', '999.1.1.1', '１９２．１６８．０．１',
+]
+
+
+class TestTextCleaner(unittest.TestCase):
+    """测试 TextCleaner 类。"""
+
+    def setUp(self):
+        self.cleaner = TextCleaner()
+
+    def test_matches_stepwise_reference(self):
+        """测试合并后的清理结果与逐步清理完全一致。"""
+        rng = random.Random(20241018)
+        for _ in range(3000):
+            text = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40)))
+            self.assertEqual(self.cleaner.clean_text(text), reference_clean(text), repr(text))
+
+    def test_document(self):
+        """测试包含标签、链接、邮箱、全角字符与 IP 地址的网页片段。"""
+        text = ("<p>Visit  <a href='https://example.com'>https://example.com</a>，联系 admin@example.com "
+                "或 １２７．０．０．１！\x01  啊啊</p>")
+        self.assertEqual(self.cleaner.clean_text(text), reference_clean(text))
+        self.assertEqual(self.cleaner.clean_text(text), 'Visit ，联系 或 ！ 啊')
+
+    def test_step_methods(self):
+        """测试单独调用各步骤与对照实现一致，IP 地址在文本两端时同样删除。"""
+        self.assertEqual(self.cleaner.remove_ip_address('1.2.3.4 x 5.6.7.8'), ' x ')
+        self.assertEqual(self.cleaner.remove_ip_address('1.2.3.45'), '')
+        self.assertEqual(self.cleaner.remove_redundant_char('a  b--c'), 'a b-c')
+        self.assertEqual(self.cleaner.convert_full2half('ＡＢ　１'), 'AB 1')
+
+    def test_no_output(self):
+        """测试清理过程不向标准输出打印内容。"""
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            self.cleaner.clean_text('<p>https://example.com a@b.com</p>')
+            self.cleaner.clean_text('')
+            self.cleaner.remove_html_tags('<p>x</p>')
+        self.assertEqual(buffer.getvalue(), '')
+
+    def test_empty(self):
+        """测试空输入返回空字符串。"""
+        self.assertEqual(self.cleaner.clean_text(None), '')
+        self.assertEqual(self.cleaner.clean_text(''), '')
+
+
+class TestCleanBatch(unittest.TestCase):
+    """测试 TextCleaner 的批量清理接口。"""
+
+    def setUp(self):
+        self.cleaner = TextCleaner()
+        rng = random.Random(7)
+        self.texts = [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 30))) for _ in range(200)]
+
+    def test_process_pool_keeps_order(self):
+        """测试在进程池中分块清理，结果与逐条清理一致且顺序不变。"""
+        expected = [self.cleaner.clean_text(text) for text in self.texts]
+        with ParsePool(2, initializer=init_clean_worker) as pool:
+            self.assertEqual(list(self.cleaner.clean_batch(iter(self.texts), chunk_size=16, pool=pool)), expected)
+            self.assertEqual(list(self.cleaner.clean_batch(self.texts, chunk_size=7, pool=pool)), expected)
+        self.assertEqual(list(self.cleaner.clean_batch(self.texts, chunk_size=16, max_workers=0)), expected)
+
+    def test_bounded_input(self):
+        """测试输入按需读取：排队的块数有上限，可以处理无限长的生成器。"""
+        consumed = itertools.count()
+        texts = ('<p>text  %d</p>' % next(consumed) for _ in itertools.count())
+        with ParsePool(2, initializer=init_clean_worker) as pool:
+            results = self.cleaner.clean_batch(texts, chunk_size=10, max_pending=2, pool=pool)
+            self.assertEqual(list(itertools.islice(results, 5)), ['text %d' % i for i in range(5)])
+            results.close()
+        # 2 个进程 × 每个 2 块，再加上正在读取的一块
+        self.assertLessEqual(next(consumed), 10 * (2 * 2 + 1))
+
+    def test_non_string_values(self):
+        """测试 None、NaN 等不是字符串的值清理为空字符串。"""
+        self.assertEqual(list(self.cleaner.clean_batch(['a  b', None, float('nan'), 3], max_workers=0)),
+                         ['a b', '', '', ''])
+
+    def test_series(self):
+        """测试清理 pandas Series 时保留索引与名称。"""
+        try:
+            import pandas as pd
+        except ImportError:
+            self.skipTest('未安装 pandas')
+        series = pd.Series(['<b>Ｈｉ</b>  there', None], index=['x', 'y'], name='text')
+        cleaned = self.cleaner.clean_series(series, max_workers=0)
+        self.assertEqual(cleaned.tolist(), ['Hi there', ''])
+        self.assertEqual(list(cleaned.index), ['x', 'y'])
+        self.assertEqual(cleaned.name, 'text')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+# tests/test_url_extractor.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unittest
+import fitz, requests
+import lxml.html
+from unittest.mock import patch, MagicMock
+from benchmarks.hn_simulator import Corpus, HNSimulator
+from src.url_extractor import ContentExtractor
+from util.extractor_stats import ExtractorStats
+from util.content_cache import ContentCache
+from util.circuit_breaker import CircuitBreaker
+from util.html_document import HtmlDocument
+
+
+def fake_response(body=b'', status_code=200, headers=None):
+    """模拟以 stream=True 发出的响应，iter_content 多次调用时共享同一个读取位置。"""
+    chunks = iter([body[i:i + 16] for i in range(0, len(body), 16)])
+    response = MagicMock(status_code=status_code, headers=headers or {}, iter_content=MagicMock(return_value=chunks))
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+    return response
+
+
+class TestContentExtractor(unittest.TestCase):
+    """测试 ContentExtractor 类。"""
+
+    def setUp(self):
+        self.extractor = ContentExtractor(
+            extractor_stats=ExtractorStats(':memory:', epsilon=0, logger=MagicMock()),
+            content_cache=ContentCache(':memory:', logger=MagicMock()),
+            circuit_breaker=CircuitBreaker(':memory:', logger=MagicMock()),
+        )
+        self.extractor.logger = MagicMock()
+
+    def test_extract_content_downloads_once(self):
+        """测试从模拟器页面提取正文时只下载一次。"""
+        corpus = Corpus.synthetic(10)
+        item_id = next(item_id for item_id, (content_type, _) in corpus.pages.items() if 'html' in content_type)
+        with HNSimulator(corpus) as simulator:
+            with patch('requests.Session.get', side_effect=self.extractor.transport.session.get) as mock_get:
+                content = self.extractor.extract_content(simulator.article_url(item_id), 'en')
+        self.assertTrue(content)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.Session.get')
+    def test_fallback_extractors_reuse_html(self, mock_get):
+        """测试 newspaper3k 与 readability 失败后 gne 复用同一份 HTML，不会重新下载页面。"""
+        mock_get.return_value = fake_response(b'<html><body><div><p>Short note.</p></div></body></html>')
+        content = self.extractor.extract_content('https://example.com/short', 'en')
+        self.assertEqual(content, 'Short note.')
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(self.extractor.quality_dict['newspaper3k'], 0)
+        self.assertEqual(self.extractor.quality_dict['readability'], 0)
+        self.assertEqual(self.extractor.quality_dict['gne'], 1)
+
+    def test_best_extractor_tried_first(self):
+        """测试按主机的历史表现先尝试最优的提取器。"""
+        for _ in range(3):
+            self.extractor.extractor_stats.record('example.com', 'newspaper3k', False, 0, 0.2)
+            self.extractor.extractor_stats.record('example.com', 'gne', True, 100, 0.01)
+        with patch.object(self.extractor, 'extract_content_by_newspaper') as newspaper, \
+                patch.object(self.extractor, 'extract_content_by_gne', return_value='text') as gne:
+            content = self.extractor.extract_content_from_html('<html></html>', 'https://example.com/a', 'en')
+        self.assertEqual(content, 'text')
+        gne.assert_called_once()
+        newspaper.assert_not_called()
+        self.assertEqual(self.extractor.extractor_stats.host_stats('example.com')['gne']['attempts'], 4)
+
+    def test_batch_extract_parses_in_processes(self):
+        """测试批量提取在进程池中解析，结果与逐个提取一致且顺序不变。"""
+        corpus = Corpus.synthetic(10)
+        item_ids = [item_id for item_id, (content_type, _) in corpus.pages.items() if 'html' in content_type][:3]
+        with HNSimulator(corpus) as simulator:
+            urls = [simulator.article_url(item_id) for item_id in item_ids]
+            expected = [self.extractor.extract_content(url, 'en') for url in urls]
+            self.extractor.content_cache = ContentCache(':memory:', logger=MagicMock())
+            try:
+                results = self.extractor.batch_extract_content(urls, ['en'] * len(urls), parse_workers=2)
+            finally:
+                self.extractor.close()
+        self.assertEqual(results, expected)
+        self.assertTrue(all(results))
+
+    @patch('requests.Session.get')
+    def test_cache_hit_and_revalidation(self, mock_get):
+        """测试缓存命中时不发请求，过期后带上验证信息请求，304 时沿用缓存且不解析。"""
+        mock_get.return_value = fake_response(b'<html></html>', headers={
+            'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+        url = 'https://Example.com/post?utm_source=hn&id=1'
+        with patch.object(self.extractor, 'try_extractors', return_value=('text', 'gne', [])) as parse:
+            self.assertEqual(self.extractor.extract_content(url, 'en'), 'text')
+            self.assertEqual(self.extractor.extract_content('https://example.com/post?id=1', 'en'), 'text')
+            self.assertEqual(mock_get.call_count, 1)
+
+            self.extractor.content_cache.ttl = -1
+            mock_get.return_value = fake_response(status_code=304)
+            self.assertEqual(self.extractor.extract_content(url, 'en'), 'text')
+            self.assertEqual(parse.call_count, 1)
+        headers = mock_get.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+        self.assertEqual(self.extractor.quality_dict['cache_hit'], 1)
+        self.assertEqual(self.extractor.quality_dict['cache_revalidated'], 1)
+        self.assertAlmostEqual(self.extractor.quality_dict['cache_hit_rate'], 0.667)
+
+    @patch('requests.Session.get')
+    def test_failing_host_is_skipped(self, mock_get):
+        """测试主机连续失败后熔断，之后的 URL 不再下载。"""
+        mock_get.side_effect = lambda *args, **kwargs: fake_response(b'<html></html>')
+        with patch.object(self.extractor, 'try_extractors', return_value=('', None, [])):
+            for i in range(3):
+                self.assertEqual(self.extractor.extract_content(f'https://paywall.com/{i}', 'en'), '')
+            self.assertEqual(self.extractor.extract_content('https://paywall.com/3', 'en'), '')
+            self.assertEqual(self.extractor.extract_content('https://paywall.com/0', 'en'), '')
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(self.extractor.quality_dict['skipped'], 2)
+
+    @patch('requests.Session.get')
+    def test_skipped_responses_do_not_trip_host(self, mock_get):
+        """测试非文本与过大的响应只让该 URL 进入冷却，主机不熔断。"""
+        mock_get.side_effect = lambda *args, **kwargs: fake_response(b'\x00\x00\x00\x18ftypmp42',
+                                                                     headers={'Content-Type': 'video/mp4'})
+        for i in range(3):
+            self.assertEqual(self.extractor.extract_content(f'https://videos.com/{i}', 'en'), '')
+        self.assertEqual(self.extractor.circuit_breaker.state('videos.com'), 'closed')
+        self.assertEqual(self.extractor.extract_content('https://videos.com/0', 'en'), '')
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch('requests.Session.get')
+    def test_probe_released_on_error(self, mock_get):
+        """测试探测请求抛出异常时同样释放，下一个请求可以再次探测。"""
+        breaker = self.extractor.circuit_breaker
+        for i in range(3):
+            breaker.record_failure(f'https://flaky.com/{i}')
+        breaker.conn.execute('UPDATE hosts SET open_until = 0')
+        with patch.object(self.extractor, 'fetch_page', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                self.extractor.extract_content('https://flaky.com/a', 'en')
+        self.assertTrue(breaker.allow('https://flaky.com/b'))
+
+    @patch('requests.Session.get')
+    def test_pdf_routed_by_magic_bytes(self, mock_get):
+        """测试不以 .pdf 结尾、Content-Type 也不准确的 PDF 按魔数交给 PyMuPDF。"""
+        document = fitz.open()
+        document.new_page().insert_text((72, 72), 'streamed paper')
+        body = document.tobytes()
+        document.close()
+        mock_get.return_value = fake_response(body, headers={'Content-Type': 'application/octet-stream'})
+        content = self.extractor.extract_content('https://example.com/paper?id=1', 'en')
+        self.assertIn('streamed paper', content)
+        self.assertEqual(self.extractor.quality_dict['PDF'], 1)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.Session.get')
+    def test_long_pdf_does_not_start_parse_pool(self, mock_get):
+        """测试单条提取页数较多的 PDF 时在当前线程顺序提取，不创建解析进程池。"""
+        document = fitz.open()
+        for page in range(12):
+            document.new_page().insert_text((72, 72), f'page number {page}')
+        body = document.tobytes()
+        document.close()
+        mock_get.return_value = fake_response(body, headers={'Content-Type': 'application/pdf'})
+        content = self.extractor.extract_content('https://example.com/long.pdf', 'en')
+        self.assertIn('page number 11', content)
+        self.assertIsNone(self.extractor._parse_pool)
+
+    @patch('requests.Session.get')
+    def test_non_text_and_oversized_responses_abort(self, mock_get):
+        """测试视频等非文本类型只读第一块即放弃，超过大小上限的网页不再读取，两者都不重试。"""
+        response = fake_response(b'\x00\x00\x00\x18ftypmp42' * 128, headers={'Content-Type': 'video/mp4'})
+        mock_get.return_value = response
+        self.assertEqual(self.extractor.fetch_html('https://example.com/video'), '')
+        response.close.assert_called_once()
+        self.assertEqual(len(list(response.iter_content.return_value)), 95)
+
+        mock_get.return_value = fake_response(b'<html></html>', headers={'Content-Length': '100000000',
+                                                                         'Content-Type': 'text/html'})
+        self.assertEqual(self.extractor.fetch_html('https://example.com/huge'), '')
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.Session.get')
+    def test_charset_from_meta(self, mock_get):
+        """测试响应头未声明字符集时按页面 <meta> 中的字符集解码。"""
+        html = '<html><head><meta charset="gbk"></head><body>中文正文</body></html>'
+        mock_get.return_value = fake_response(html.encode('gbk'), headers={'Content-Type': 'text/html'})
+        self.assertEqual(self.extractor.fetch_html('https://example.com/gbk'), html)
+
+    @patch('util.utils.time.sleep')
+    @patch('requests.Session.get')
+    def test_retries_server_errors_only(self, mock_get, sleep):
+        """测试 5xx 时退避后重新下载，404 时不重试。"""
+        mock_get.side_effect = [fake_response(status_code=503), fake_response(b'<html>ok</html>')]
+        self.assertEqual(self.extractor.fetch_html('https://example.com/busy'), '<html>ok</html>')
+        self.assertEqual(sleep.call_count, 1)
+
+        mock_get.side_effect = [fake_response(status_code=404)]
+        self.assertEqual(self.extractor.fetch_html('https://example.com/missing'), '')
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_readability_returns_text_from_shared_tree(self):
+        """测试 readability 返回纯文本，且不修改共享的 lxml 树。"""
+        paragraph = '<p>' + 'Readable sentence with enough words, commas, and length. ' * 8 + '</p>'
+        document = HtmlDocument(f'<html><body><nav><a href="/">Home</a></nav><article>{paragraph * 3}'
+                                '</article><script>var x = 1;</script></body></html>')
+        before = lxml.html.tostring(document.tree)
+        content = self.extractor.extract_content_by_readability(document)
+        self.assertEqual(content.count('\n'), 2)
+        self.assertTrue(content.startswith('Readable sentence'))
+        self.assertNotIn('<', content)
+        self.assertEqual(lxml.html.tostring(document.tree), before)
+        self.assertTrue(self.extractor.extract_content_by_gne(document).startswith('Readable sentence'))
+        self.assertEqual(lxml.html.tostring(document.tree), before)
+
+    def test_density_fast_path_skips_cascade(self):
+        """测试快速提取置信度高时不再运行其他提取器，置信度低时按顺序级联。"""
+        corpus = Corpus.synthetic(3, pdf_ratio=0.0)
+        html = next(iter(corpus.pages.values()))[1].decode('utf-8')
+        with patch.object(self.extractor, 'extract_content_by_newspaper', return_value='slow') as newspaper:
+            content, name, attempts = self.extractor.try_extractors(html, 'https://example.com/a', 'en')
+            self.assertEqual(name, 'density')
+            self.assertEqual([attempt[0] for attempt in attempts], ['density'])
+            newspaper.assert_not_called()
+
+            self.extractor.density_min_confidence = 1.0
+            content, name, attempts = self.extractor.try_extractors(html, 'https://example.com/a', 'en')
+            self.assertEqual((content, name), ('slow', 'newspaper3k'))
+            self.assertEqual([attempt[0] for attempt in attempts], ['density', 'newspaper3k'])
+
+
+if __name__ == '__main__':
+    unittest.main()
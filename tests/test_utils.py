@@ -0,0 +1,89 @@
+# tests/test_utils.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+from util.utils import retry, retry_stats, deadline, time_left, is_retryable
+
+
+def http_error(status):
+    return requests.HTTPError(response=MagicMock(status_code=status))
+
+
+class TestRetry(unittest.TestCase):
+    """测试 util.utils 中的重试装饰器与截止时间。"""
+
+    def test_is_retryable(self):
+        """测试超时与 5xx 可重试，4xx 与解析错误不可重试。"""
+        self.assertTrue(is_retryable(requests.Timeout()))
+        self.assertTrue(is_retryable(requests.ConnectionError()))
+        self.assertTrue(is_retryable(http_error(503)))
+        self.assertTrue(is_retryable(http_error(429)))
+        self.assertFalse(is_retryable(http_error(404)))
+        self.assertFalse(is_retryable(ValueError('parse')))
+
+    @patch('util.utils.time.sleep')
+    def test_exponential_backoff_with_jitter(self, sleep):
+        """测试可重试的异常按指数退避重试，等待时长不超过上限，成功后返回结果。"""
+        calls = []
+
+        @retry(retries=4, delay=1, max_delay=3)
+        def flaky():
+            calls.append(1)
+            if len(calls) < 4:
+                raise requests.Timeout()
+            return 'ok'
+
+        with patch('util.utils.random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual(flaky(), 'ok')
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1, 2, 3])
+        stats = retry_stats()[flaky.__qualname__]
+        self.assertEqual((stats['attempts'], stats['retries'], stats['failures']), (4, 3, 0))
+
+    @patch('util.utils.time.sleep')
+    def test_no_retry_on_client_errors_or_empty_results(self, sleep):
+        """测试 4xx、解析错误与空结果都不重试。"""
+        attempts = []
+
+        @retry(retries=3, default='gave up')
+        def fail(error):
+            attempts.append(error)
+            if error is not None:
+                raise error
+            return ''
+
+        self.assertEqual(fail(http_error(404)), 'gave up')
+        self.assertEqual(fail(ValueError('parse')), 'gave up')
+        self.assertEqual(fail(None), '')
+        self.assertEqual(len(attempts), 3)
+        sleep.assert_not_called()
+
+    def test_deadline_limits_nested_retries(self):
+        """测试外层截止时间早于内层预算时，内层重试在外层截止前放弃。"""
+        @retry(retries=100, delay=0.01, max_delay=0.01, budget=10)
+        def always_times_out():
+            raise requests.Timeout()
+
+        started = time.monotonic()
+        with deadline(0.1):
+            self.assertEqual(always_times_out(), '')
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(retry_stats()[always_times_out.__qualname__]['deadline_exceeded'], 1)
+
+    def test_deadline_nesting(self):
+        """测试嵌套的截止时间取较早者，退出后恢复外层的截止时间。"""
+        self.assertIsNone(time_left())
+        with deadline(1):
+            with deadline(100):
+                self.assertLessEqual(time_left(), 1)
+            with deadline(0.5):
+                self.assertLessEqual(time_left(), 0.5)
+            self.assertGreater(time_left(), 0.5)
+        self.assertIsNone(time_left())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+# util/backfill_crawler.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, requests
+from collections import deque
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from util.log_utils import logger
+
+from config.config import BACKFILL_BATCH_SIZE, BACKFILL_RPS
+
+class BackfillCrawler:
+    """按条目 ID 从大到小回填 Hacker News 历史条目的爬虫。
+
+    请求在有界线程池中并发执行，按 ID 顺序收集结果，每攒够 batch_size 个
+    条目就在一个事务中写入 ItemStore，并把进度保存到元数据中。进程被中断后
+    再次运行会从上次保存的位置继续；一次回填完成后记录其起始 ID 作为高水位，
+    之后的运行只回填 maxitem 到高水位之间的新条目。请求失败的 ID 记录在
+    ItemStore 的 failed 表中，不设上限，由 retry_failed 重试。
+
+    Attributes:
+        fetcher: 用于请求 API 的 HackerNewsFetcher。
+        item_store: 保存条目与断点的 ItemStore。
+        batch_size: 每批写入的条目数。
+        max_workers: 并发请求数，默认与 fetcher.max_workers 一致。
+        requests_per_second: API 主机限流器的速率上限，0 表示沿用限流器的默认值。
+    """
+
+    CHECKPOINT_KEY = 'backfill'
+
+    def __init__(self, fetcher, item_store, batch_size: int = BACKFILL_BATCH_SIZE,
+                 max_workers: Optional[int] = None, requests_per_second: float = BACKFILL_RPS,
+                 logger=logger):
+        """初始化 BackfillCrawler 实例。
+
+        Args:
+            fetcher: HackerNewsFetcher 实例。
+            item_store: ItemStore 实例，建议使用不淘汰条目的独立数据库。
+            batch_size: 每批写入的条目数，默认取配置 BACKFILL_BATCH_SIZE。
+            max_workers: 并发请求数，默认与 fetcher.max_workers 一致。
+            requests_per_second: 每秒最多发出的请求数，默认取配置 BACKFILL_RPS。
+                请求速率由 fetcher 共享的自适应限流器控制，遇到 429/5xx 时会自动降速。
+        """
+        self.fetcher = fetcher
+        self.item_store = item_store
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers or fetcher.max_workers)
+        self.requests_per_second = requests_per_second
+        self.logger = logger
+        if requests_per_second:
+            fetcher.throttle.set_max_rate(requests_per_second)
+        fetcher.throttle.set_max_concurrency(self.max_workers)
+
+    def _fetch(self, item_id: int):
+        """请求单个条目。
+
+        Returns:
+            (item_id, item, failed)：条目不存在时 item 为 None，请求失败时 failed 为 True。
+        """
+        try:
+            return item_id, self.fetcher.get_json(f'item/{item_id}.json'), False
+        except requests.RequestException as e:
+            return item_id, None, True
+
+    def load_checkpoint(self) -> Optional[Dict]:
+        """读取保存的进度，没有进度时返回 None。
+
+        进度包含 cursor（下一个待处理的 ID）、end_id、origin（本次回填的起始 ID）
+        以及 high_water（已完整回填到 1 或上一个高水位的最大 ID）。
+        """
+        return self.item_store.get_meta(self.CHECKPOINT_KEY)
+
+    def run(self, start_id: Optional[int] = None, end_id: int = 1,
+            max_items: Optional[int] = None) -> Dict[str, float]:
+        """从 start_id 向下回填到 end_id（包含）。
+
+        Args:
+            start_id: 起始 ID。为 None 时优先从保存的进度继续；上一次回填已完成时
+                从 maxitem 回填到高水位加 1；没有进度时从 maxitem 开始。
+            end_id: 结束 ID（包含），默认为 1。
+            max_items: 本次最多处理的 ID 数，None 表示直到 end_id。
+
+        Returns:
+            Dict[str, float]: 本次处理的 ID 数、写入条目数、失败数、耗时与每秒条目数。
+        """
+        checkpoint = self.load_checkpoint() or {}
+        high_water = checkpoint.get('high_water')
+        origin = start_id
+        if start_id is None and checkpoint and checkpoint['cursor'] >= checkpoint['end_id']:
+            start_id, end_id = checkpoint['cursor'], checkpoint['end_id']
+            origin = checkpoint.get('origin', start_id)
+            self.logger.log_info(f"从断点继续回填：ID {start_id} -> {end_id}")
+        elif start_id is None:
+            start_id = origin = self.fetcher.get_json('maxitem.json')
+            if high_water is not None:
+                end_id = max(end_id, high_water + 1)
+                self.logger.log_info(f"增量回填：ID {start_id} -> {end_id}（高水位 {high_water}）")
+
+        stats = {'processed': 0, 'stored': 0, 'failed': 0}
+        if start_id < end_id:
+            stats.update(elapsed=0.0, items_per_second=0.0)
+            self.logger.log_info(f"没有需要回填的新条目：{stats}")
+            return stats
+        stop_id = end_id if max_items is None else max(end_id, start_id - max_items + 1)
+        ids = iter(range(start_id, stop_id - 1, -1))
+        started_at = time.monotonic()
+        buffer: List[Dict] = []
+        failed_ids: List[int] = []
+        cursor = start_id
+
+        def flush(cursor: int) -> None:
+            self.item_store.put_many(buffer)
+            self.item_store.add_failed(self.CHECKPOINT_KEY, failed_ids)
+            stats['stored'] += len(buffer)
+            buffer.clear()
+            failed_ids.clear()
+            # 回填到 1 或上一个高水位之后，本次的起始 ID 成为新的高水位
+            finished = cursor < end_id and end_id <= (high_water or 0) + 1
+            self.item_store.set_meta(self.CHECKPOINT_KEY, {
+                'cursor': cursor, 'end_id': end_id, 'origin': origin,
+                'high_water': max(origin, high_water or 0) if finished else high_water,
+            })
+            elapsed = time.monotonic() - started_at
+            self.logger.log_info(
+                f"回填进度：已处理 {stats['processed']} 个 ID，下一个 ID {cursor}，"
+                f"{stats['processed'] / elapsed if elapsed else 0:.1f} 条/秒，"
+                f"限流状态 {self.fetcher.throttle.stats()}。"
+            )
+
+        # 在途请求数保持在 max_workers 的两倍，按 ID 顺序取回结果以保证断点单调
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for item_id in ids:
+                in_flight.append(executor.submit(self._fetch, item_id))
+                while in_flight and (len(in_flight) >= self.max_workers * 2 or item_id == stop_id):
+                    cursor = self._collect(in_flight.popleft(), buffer, failed_ids, stats)
+                    if stats['processed'] % self.batch_size == 0:
+                        flush(cursor)
+        flush(cursor)
+
+        elapsed = time.monotonic() - started_at
+        stats['elapsed'] = elapsed
+        stats['items_per_second'] = stats['processed'] / elapsed if elapsed else 0.0
+        self.logger.log_info(f"回填完成：{stats}")
+        return stats
+
+    def retry_failed(self) -> int:
+        """重新请求 failed 表中记录的 ID，返回本次成功写入的条目数。"""
+        item_ids = self.item_store.failed_ids(self.CHECKPOINT_KEY)
+        stored = remaining = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for start in range(0, len(item_ids), self.batch_size):
+                results = list(executor.map(self._fetch, item_ids[start:start + self.batch_size]))
+                stored += self.item_store.put_many([item for _, item, failed in results if item])
+                self.item_store.remove_failed(self.CHECKPOINT_KEY,
+                                              [item_id for item_id, _, failed in results if not failed])
+                remaining += sum(1 for _, _, failed in results if failed)
+        self.logger.log_info(f"重试失败条目：写入 {stored} 个，仍失败 {remaining} 个。")
+        return stored
+
+    @staticmethod
+    def _collect(future, buffer: List[Dict], failed_ids: List[int], stats: Dict) -> int:
+        """收集一个请求结果，返回下一个待处理的 ID。"""
+        item_id, item, failed = future.result()
+        stats['processed'] += 1
+        if failed:
+            stats['failed'] += 1
+            failed_ids.append(item_id)
+        elif item:
+            buffer.append(item)
+        return item_id - 1
@@ -0,0 +1,232 @@
+# util/circuit_breaker.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, sqlite3, threading
+from typing import Dict
+from urllib.parse import urlparse
+
+from util.log_utils import logger
+from util.content_cache import canonical_url
+
+from config.config import (
+    BREAKER_PATH, BREAKER_FAILURE_THRESHOLD, BREAKER_HOST_TTL, BREAKER_URL_TTL, BREAKER_MAX_TTL,
+    BREAKER_URL_RETENTION, BREAKER_MAX_URLS, BREAKER_PROBE_TIMEOUT,
+)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+class CircuitBreaker:
+    """按主机熔断、按 URL 记录失败的持久化负缓存。
+
+    主机状态：
+        closed：正常放行，连续失败 failure_threshold 次后转为 open。
+        open：在 host_ttl * 2^(熔断次数-1) 秒内直接拒绝该主机的所有 URL。
+        half-open：open 到期后只放行一个探测请求，成功则回到 closed 并清零，
+            失败则再次 open，且冷却时间翻倍。探测请求由调用方通过 release 释放，
+            超过 probe_timeout 秒仍未返回时视为丢失，放行下一个探测请求。
+    单个 URL 失败后在 url_ttl * 2^(失败次数-1) 秒内不再尝试，冷却时间同样
+    随失败次数增长，最长不超过 max_ttl。状态保存在 SQLite 中，跨运行有效。
+    冷却结束超过 retention 秒的失败记录在打开时及之后每 PRUNE_INTERVAL 次失败
+    时删除，URL 记录数超过 max_urls 时删除最久未更新的记录。
+
+    Attributes:
+        path: SQLite 数据库文件路径。
+        failure_threshold: 主机熔断前允许的连续失败次数。
+        host_ttl: 主机第一次熔断的冷却时间（秒）。
+        url_ttl: URL 第一次失败后的冷却时间（秒）。
+        max_ttl: 冷却时间上限（秒）。
+        retention: 冷却结束后失败记录保留的时间（秒）。
+        max_urls: 最多保存的 URL 失败记录数。
+        probe_timeout: half-open 探测请求的最长占用时间（秒）。
+        rejected: 被拒绝的请求数。
+    """
+
+    # 每记录多少次失败清理一次过期记录
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, path: str = BREAKER_PATH, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 host_ttl: float = BREAKER_HOST_TTL, url_ttl: float = BREAKER_URL_TTL,
+                 max_ttl: float = BREAKER_MAX_TTL, retention: float = BREAKER_URL_RETENTION,
+                 max_urls: int = BREAKER_MAX_URLS, probe_timeout: float = BREAKER_PROBE_TIMEOUT,
+                 logger=logger):
+        """初始化 CircuitBreaker 实例。
+
+        Args:
+            path: SQLite 数据库文件路径，传入 `:memory:` 时仅保存在内存中。
+            failure_threshold: 主机熔断前允许的连续失败次数，默认取配置 BREAKER_FAILURE_THRESHOLD。
+            host_ttl: 主机第一次熔断的冷却时间，默认取配置 BREAKER_HOST_TTL。
+            url_ttl: URL 第一次失败后的冷却时间，默认取配置 BREAKER_URL_TTL。
+            max_ttl: 冷却时间上限，默认取配置 BREAKER_MAX_TTL。
+            retention: 冷却结束后失败记录保留的时间，默认取配置 BREAKER_URL_RETENTION。
+            max_urls: 最多保存的 URL 失败记录数，默认取配置 BREAKER_MAX_URLS。
+            probe_timeout: half-open 探测请求的最长占用时间，默认取配置 BREAKER_PROBE_TIMEOUT。
+        """
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.host_ttl = host_ttl
+        self.url_ttl = url_ttl
+        self.max_ttl = max_ttl
+        self.retention = retention
+        self.max_urls = max_urls
+        self.probe_timeout = probe_timeout
+        self.logger = logger
+        self.rejected = 0
+        self._failures_since_prune = 0
+        self._probing = {}      # 处于 half-open 且探测请求尚未返回的主机 -> 探测开始的时间
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS hosts ('
+                'host TEXT PRIMARY KEY, failures INTEGER NOT NULL, trips INTEGER NOT NULL, '
+                'open_until REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS urls ('
+                'url TEXT PRIMARY KEY, host TEXT NOT NULL, failures INTEGER NOT NULL, '
+                'retry_at REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            self._prune(time.time())
+
+    def _backoff(self, base: float, count: int) -> float:
+        return min(self.max_ttl, base * 2 ** max(0, count - 1))
+
+    def _host_state(self, host: str, now: float):
+        """返回主机的（状态, 连续失败次数, 熔断次数），调用方需持有锁。"""
+        row = self.conn.execute(
+            'SELECT failures, trips, open_until FROM hosts WHERE host = ?', (host,)
+        ).fetchone()
+        if row is None:
+            return CLOSED, 0, 0
+        failures, trips, open_until = row
+        if trips and failures >= self.failure_threshold:
+            return (OPEN if now < open_until else HALF_OPEN), failures, trips
+        return CLOSED, failures, trips
+
+    def state(self, host: str) -> str:
+        """返回主机当前的状态。"""
+        with self._lock:
+            return self._host_state(host, time.time())[0]
+
+    def allow(self, url: str) -> bool:
+        """判断是否可以请求该 URL。
+
+        half-open 状态下只有第一个调用者得到 True，作为探测请求；调用方结束请求后
+        应调用 release，未释放的探测请求在 probe_timeout 秒后过期。
+
+        Returns:
+            bool: URL 或其主机处于冷却期时返回 False。
+        """
+        host = urlparse(url).netloc
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute('SELECT retry_at FROM urls WHERE url = ?', (canonical_url(url),)).fetchone()
+            if row is not None and now < row[0]:
+                self.rejected += 1
+                return False
+            state = self._host_state(host, now)[0]
+            probing = now - self._probing.get(host, float('-inf')) < self.probe_timeout
+            if state == OPEN or (state == HALF_OPEN and probing):
+                self.rejected += 1
+                return False
+            if state == HALF_OPEN:
+                self._probing[host] = now
+        return True
+
+    def release(self, url: str) -> None:
+        """释放该 URL 所在主机的探测请求，不改变熔断状态；不是探测请求时不做任何事。"""
+        with self._lock:
+            self._probing.pop(urlparse(url).netloc, None)
+
+    def record_success(self, url: str) -> None:
+        """记录成功：清除该 URL 的失败记录，主机回到 closed。"""
+        host = urlparse(url).netloc
+        with self._lock, self.conn:
+            self._probing.pop(host, None)
+            self.conn.execute('DELETE FROM urls WHERE url = ?', (canonical_url(url),))
+            if self._host_state(host, time.time())[0] != CLOSED:
+                self.logger.log_info(f"【CircuitBreaker】{host} 恢复，熔断关闭")
+            self.conn.execute('DELETE FROM hosts WHERE host = ?', (host,))
+
+    def record_failure(self, url: str, count_host: bool = True) -> None:
+        """记录失败：延长该 URL 的冷却时间，主机连续失败达到阈值或探测失败时熔断。
+
+        Args:
+            url: 失败的 URL。
+            count_host: 是否计入主机的连续失败次数；主机正常响应、只是内容无法使用
+                （如非文本或超过大小上限）时传入 False，只记录该 URL。
+        """
+        host = urlparse(url).netloc
+        key = canonical_url(url)
+        now = time.time()
+        with self._lock, self.conn:
+            self._probing.pop(host, None)
+            row = self.conn.execute('SELECT failures FROM urls WHERE url = ?', (key,)).fetchone()
+            url_failures = (row[0] if row else 0) + 1
+            self.conn.execute(
+                'INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?, ?)',
+                (key, host, url_failures, now + self._backoff(self.url_ttl, url_failures), now)
+            )
+            self._failures_since_prune += 1
+            if self._failures_since_prune >= self.PRUNE_INTERVAL:
+                self._prune(now)
+            if not count_host:
+                return
+
+            state, failures, trips = self._host_state(host, now)
+            failures += 1
+            open_until = 0.0
+            if state == OPEN:
+                # 熔断前已发出的请求陆续失败，不重复延长冷却时间
+                open_until = self.conn.execute(
+                    'SELECT open_until FROM hosts WHERE host = ?', (host,)
+                ).fetchone()[0]
+            elif state == HALF_OPEN or failures >= self.failure_threshold:
+                trips += 1
+                ttl = self._backoff(self.host_ttl, trips)
+                open_until = now + ttl
+                self.logger.log_info(f"【CircuitBreaker】{host} 连续失败 {failures} 次，熔断 {ttl:.0f} 秒")
+            self.conn.execute(
+                'INSERT OR REPLACE INTO hosts VALUES (?, ?, ?, ?, ?)',
+                (host, failures, trips, open_until, now)
+            )
+
+    def _prune(self, now: float) -> None:
+        """删除冷却结束超过 retention 秒的 URL 与主机记录，URL 记录超过 max_urls 时删除最旧的，调用方需持有锁。"""
+        self._failures_since_prune = 0
+        cutoff = now - self.retention
+        expired = self.conn.execute('DELETE FROM urls WHERE retry_at < ?', (cutoff,)).rowcount
+        self.conn.execute('DELETE FROM hosts WHERE open_until < ? AND updated_at < ?', (cutoff, cutoff))
+        overflow = self.conn.execute('SELECT COUNT(*) FROM urls').fetchone()[0] - self.max_urls
+        if overflow > 0:
+            self.conn.execute(
+                'DELETE FROM urls WHERE url IN (SELECT url FROM urls ORDER BY updated_at LIMIT ?)', (overflow,)
+            )
+        if expired or overflow > 0:
+            self.logger.log_info(
+                f"【CircuitBreaker】清理 {expired} 条过期的 URL 记录，{max(overflow, 0)} 条超出上限的 URL 记录"
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """返回各状态的主机数、处于冷却期的 URL 数与拒绝次数。"""
+        now = time.time()
+        with self._lock:
+            hosts = [row[0] for row in self.conn.execute('SELECT host FROM hosts').fetchall()]
+            states = [self._host_state(host, now)[0] for host in hosts]
+            cooling = self.conn.execute('SELECT COUNT(*) FROM urls WHERE retry_at > ?', (now,)).fetchone()[0]
+        return {
+            'open': states.count(OPEN),
+            'half_open': states.count(HALF_OPEN),
+            'cooling_urls': cooling,
+            'rejected': self.rejected,
+        }
+
+    def close(self) -> None:
+        """关闭数据库连接。"""
+        with self._lock:
+            self.conn.close()
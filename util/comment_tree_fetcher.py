@@ -0,0 +1,121 @@
+# util/comment_tree_fetcher.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time
+from typing import Dict, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from util.log_utils import logger
+
+from config.config import COMMENT_MAX_DEPTH, COMMENT_MAX_PER_STORY, COMMENT_TIME_BUDGET
+
+class CommentTreeFetcher:
+    """按层并发抓取新闻评论树的类。
+
+    从新闻的 kids 开始逐层（广度优先）抓取评论，同一层的评论并发请求。
+    抓取受最大深度、每条新闻最大评论数和整体时间预算三者限制，超出预算时
+    返回已抓到的部分。每个评论只保留 id、by、time、text 与 children 字段。
+
+    Attributes:
+        fetcher: 用于请求条目的 HackerNewsFetcher。
+        max_depth: 最大深度，顶层评论深度为 1。
+        max_comments: 每条新闻最多抓取的评论数。
+        time_budget: 一次调用的整体时间预算（秒）。
+        max_workers: 并发请求数，默认与 fetcher.max_workers 一致。
+    """
+
+    def __init__(self, fetcher, max_depth: int = COMMENT_MAX_DEPTH,
+                 max_comments: int = COMMENT_MAX_PER_STORY,
+                 time_budget: float = COMMENT_TIME_BUDGET,
+                 max_workers: Optional[int] = None, logger=logger):
+        """初始化 CommentTreeFetcher 实例。
+
+        Args:
+            fetcher: HackerNewsFetcher 实例。
+            max_depth: 最大深度，默认取配置 COMMENT_MAX_DEPTH。
+            max_comments: 每条新闻最多抓取的评论数，默认取配置 COMMENT_MAX_PER_STORY。
+            time_budget: 整体时间预算（秒），默认取配置 COMMENT_TIME_BUDGET。
+            max_workers: 并发请求数，默认与 fetcher.max_workers 一致。
+        """
+        self.fetcher = fetcher
+        self.max_depth = max_depth
+        self.max_comments = max_comments
+        self.time_budget = time_budget
+        self.max_workers = max(1, max_workers or fetcher.max_workers)
+        self.logger = logger
+
+    @staticmethod
+    def _compact(item: Dict) -> Dict:
+        return {
+            'id': item['id'],
+            'by': item.get('by', ''),
+            'time': item.get('time'),
+            'text': item.get('text', ''),
+            'children': [],
+        }
+
+    def fetch_trees(self, stories: List[Dict]) -> Dict[int, List[Dict]]:
+        """为多条新闻抓取评论树，所有新闻共享时间预算与去重集合。
+
+        Args:
+            stories: 新闻详情列表。
+
+        Returns:
+            Dict[int, List[Dict]]: 新闻 ID 到顶层评论列表的映射。
+        """
+        deadline = time.monotonic() + self.time_budget
+        seen: Set[int] = set()
+        trees = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for story in stories:
+                trees[story['id']] = self._fetch_tree(executor, story, seen, deadline)
+        finally:
+            # 超时的请求不再等待
+            executor.shutdown(wait=False, cancel_futures=True)
+        return trees
+
+    def fetch_tree(self, story: Dict) -> List[Dict]:
+        """抓取单条新闻的评论树。
+
+        Args:
+            story: 新闻详情，需包含 id，可包含 kids。
+
+        Returns:
+            List[Dict]: 顶层评论列表，每个评论的 children 为其回复。
+        """
+        return self.fetch_trees([story])[story['id']]
+
+    def _fetch_tree(self, executor, story: Dict, seen: Set[int], deadline: float) -> List[Dict]:
+        roots: List[Dict] = []
+        count = 0
+        # 每个待抓取的评论记为（父节点的 children 列表, 评论 ID, 深度）
+        frontier = [(roots, kid, 1) for kid in story.get('kids', [])]
+        while frontier and count < self.max_comments:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            frontier = [entry for entry in frontier if entry[1] not in seen][:self.max_comments - count]
+            seen.update(entry[1] for entry in frontier)
+            futures = [executor.submit(self.fetcher.fetch_item, entry[1]) for entry in frontier]
+            done, not_done = wait(futures, timeout=remaining)
+
+            next_frontier = []
+            for (siblings, _, depth), future in zip(frontier, futures):
+                if future not in done:
+                    future.cancel()
+                    continue
+                item = future.result()
+                if not item or item.get('deleted') or item.get('dead'):
+                    continue
+                node = self._compact(item)
+                siblings.append(node)
+                count += 1
+                if depth < self.max_depth:
+                    next_frontier.extend((node['children'], kid, depth + 1) for kid in item.get('kids', []))
+            if not_done:
+                self.logger.log_info(f"新闻 ID {story['id']} 的评论抓取超出时间预算，已获取 {count} 条。")
+                break
+            frontier = next_frontier
+        return roots
@@ -0,0 +1,193 @@
+# util/content_cache.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, sqlite3, threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from util.log_utils import logger
+
+from config.config import (
+    CONTENT_CACHE_PATH, CONTENT_CACHE_TTL, CONTENT_CACHE_MAX_ENTRIES, CONTENT_CACHE_MAX_BYTES,
+)
+
+# 不影响页面内容的跟踪参数
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_hsenc', '_hsmi', 'ref', 'ref_src', 'ref_url', 'source', 'spm',
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def canonical_url(url: str) -> str:
+    """规范化 URL，作为缓存的键。
+
+    协议与主机名转为小写，去掉默认端口、片段和跟踪参数，其余查询参数按名称排序，
+    空路径补为 `/`。
+
+    Args:
+        url: 原始 URL。
+
+    Returns:
+        str: 规范化后的 URL。
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower().rstrip('.')
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(query), ''))
+
+
+class ContentCache:
+    """基于 SQLite 的正文提取结果缓存。
+
+    以规范化 URL 为键保存提取到的正文以及响应中的 ETag / Last-Modified。
+    未超过 ttl 的条目直接使用；过期条目由调用方带上验证信息重新请求，
+    服务端返回 304 时调用 touch() 续期，无需重新解析。条目数或总字节数
+    超过上限时按最近访问时间淘汰。
+
+    Attributes:
+        path: SQLite 数据库文件路径。
+        ttl: 条目无需验证即可使用的时长（秒）。
+        max_entries: 最大条目数。
+        max_bytes: 正文总字节数上限。
+        hits: 未过期命中次数。
+        misses: 未缓存次数。
+        stale: 已过期、需要重新验证的次数。
+        revalidated: 验证后仍可使用（304）的次数。
+        evictions: 被淘汰的条目数。
+    """
+
+    def __init__(self, path: str = CONTENT_CACHE_PATH, ttl: float = CONTENT_CACHE_TTL,
+                 max_entries: int = CONTENT_CACHE_MAX_ENTRIES, max_bytes: int = CONTENT_CACHE_MAX_BYTES,
+                 logger=logger):
+        """初始化 ContentCache 实例。
+
+        Args:
+            path: SQLite 数据库文件路径，传入 `:memory:` 时仅缓存在内存中。
+            ttl: 条目无需验证即可使用的时长，默认取配置 CONTENT_CACHE_TTL。
+            max_entries: 最大条目数，默认取配置 CONTENT_CACHE_MAX_ENTRIES。
+            max_bytes: 正文总字节数上限，默认取配置 CONTENT_CACHE_MAX_BYTES。
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS contents ('
+                'url TEXT PRIMARY KEY, content TEXT NOT NULL, etag TEXT, last_modified TEXT, '
+                'size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_contents_accessed ON contents (accessed_at)')
+
+    def get(self, url: str) -> Optional[Dict]:
+        """读取缓存的正文。
+
+        Args:
+            url: 页面 URL，会先规范化。
+
+        Returns:
+            Optional[Dict]: 未缓存时返回 None，否则返回包含 content、etag、last_modified
+                与 fresh（是否未过期）的字典。
+        """
+        key = canonical_url(url)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT content, etag, last_modified, fetched_at FROM contents WHERE url = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            fresh = now - row[3] <= self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale += 1
+            with self.conn:
+                self.conn.execute('UPDATE contents SET accessed_at = ? WHERE url = ?', (now, key))
+        return {'content': row[0], 'etag': row[1], 'last_modified': row[2], 'fresh': fresh}
+
+    def put(self, url: str, content: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """写入提取到的正文及响应的验证信息，空正文不缓存。"""
+        if not content:
+            return
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO contents VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (canonical_url(url), content, etag, last_modified,
+                     len(content.encode('utf-8')), now, now)
+                )
+            self._evict()
+
+    def touch(self, url: str) -> None:
+        """服务端返回 304 时调用，把条目的抓取时间更新为当前时间。"""
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                'UPDATE contents SET fetched_at = ?, accessed_at = ? WHERE url = ?',
+                (now, now, canonical_url(url))
+            )
+            self.revalidated += 1
+
+    def _evict(self) -> None:
+        """按最近访问时间淘汰，直到条目数与总字节数都不超过上限，调用方需持有锁。"""
+        count, total = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM contents').fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = 0
+        with self.conn:
+            rows = self.conn.execute('SELECT url, size FROM contents ORDER BY accessed_at').fetchall()
+            for url, size in rows:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                self.conn.execute('DELETE FROM contents WHERE url = ?', (url,))
+                count -= 1
+                total -= size
+                evicted += 1
+        self.evictions += evicted
+        self.logger.log_info(f"【ContentCache】淘汰 {evicted} 条缓存，剩余 {count} 条，共 {total} 字节。")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM contents').fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        """返回命中统计，命中率把验证后仍可使用的条目也计为命中。"""
+        lookups = self.hits + self.misses + self.stale
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'revalidated': self.revalidated,
+            'evictions': self.evictions,
+            'hit_rate': round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """关闭数据库连接。"""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,135 @@
+# util/density_extractor.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import re
+from typing import List, Tuple
+
+from lxml.html import HtmlElement
+
+from util.html_document import HtmlDocument, node_to_text, SKIP_TAGS, WHITESPACE
+
+from config.config import DENSITY_MIN_CHARS
+
+# 作为正文段落计分的标签
+PARAGRAPH_TAGS = ('p', 'pre', 'blockquote', 'li')
+# class / id 中出现时加分或减分的关键词
+POSITIVE_PATTERN = re.compile(r'article|body|content|entry|main|post|story|text', re.I)
+NEGATIVE_PATTERN = re.compile(
+    r'comment|footer|footnote|header|menu|meta|nav|related|share|sidebar|social|sponsor|widget|\bad', re.I
+)
+# 本身即表明用途的标签
+POSITIVE_TAGS = {'article', 'main'}
+NEGATIVE_TAGS = {'nav', 'footer', 'header', 'aside', 'form'}
+
+
+def _text_length(node: HtmlElement) -> int:
+    return len(WHITESPACE.sub(' ', node.text_content()).strip())
+
+def _link_density(node: HtmlElement, length: int) -> float:
+    """节点中链接文本占全部文本的比例。"""
+    if not length:
+        return 0.0
+    links = sum(_text_length(link) for link in node.iter('a'))
+    return min(1.0, links / length)
+
+def _weight(node: HtmlElement) -> float:
+    """按标签与 class / id 调整候选节点的分数。"""
+    weight = 1.0
+    tag = node.tag if isinstance(node.tag, str) else ''
+    if tag in POSITIVE_TAGS:
+        weight += 0.25
+    elif tag in NEGATIVE_TAGS:
+        weight -= 0.5
+    elif tag == 'body':
+        weight -= 0.25  # 整页作为正文时多半混入了评论、推荐等内容
+    names = f"{node.get('class', '')} {node.get('id', '')}"
+    if POSITIVE_PATTERN.search(names):
+        weight += 0.25
+    if NEGATIVE_PATTERN.search(names):
+        weight -= 0.5
+    return max(weight, 0.0)
+
+
+class DensityExtractor:
+    """基于文本密度与链接密度的轻量正文提取器。
+
+    每个足够长、链接不多的段落按长度与逗号数计分，分数加到父节点，一半加到
+    祖父节点；按标签与 class / id 调整后分数最高的节点作为正文。只读取共享的
+    lxml 树，不做修改。
+
+    置信度为三项之积：正文节点包含的段落文本占全页段落文本的比例、正文长度
+    相对 min_chars 的饱和值，以及 1 减去正文节点的链接密度。置信度高时可以跳过
+    newspaper3k 等较慢的提取器。
+
+    Attributes:
+        min_chars: 置信度不再因长度打折的正文字数。
+        min_paragraph: 参与计分的段落最少字数。
+        max_link_density: 参与计分的段落最大链接密度。
+    """
+
+    def __init__(self, min_chars: int = DENSITY_MIN_CHARS, min_paragraph: int = 25,
+                 max_link_density: float = 0.5):
+        """初始化 DensityExtractor 实例。
+
+        Args:
+            min_chars: 置信度不再因长度打折的正文字数，默认取配置 DENSITY_MIN_CHARS。
+            min_paragraph: 参与计分的段落最少字数。
+            max_link_density: 参与计分的段落最大链接密度。
+        """
+        self.min_chars = min_chars
+        self.min_paragraph = min_paragraph
+        self.max_link_density = max_link_density
+
+    def _paragraphs(self, tree: HtmlElement) -> List[Tuple[HtmlElement, float, float]]:
+        """返回参与计分的段落：（节点, 分数, 去掉链接后的文本长度）。"""
+        paragraphs = []
+        for node in tree.iter(*PARAGRAPH_TAGS):
+            if any(ancestor.tag in SKIP_TAGS for ancestor in node.iterancestors()):
+                continue
+            length = _text_length(node)
+            if length < self.min_paragraph:
+                continue
+            link_density = _link_density(node, length)
+            if link_density > self.max_link_density:
+                continue
+            text = node.text_content()
+            score = (1 + text.count(',') + text.count('，') + min(length / 100, 3)) * (1 - link_density)
+            paragraphs.append((node, score, length * (1 - link_density)))
+        return paragraphs
+
+    def extract(self, document: HtmlDocument) -> Tuple[str, float]:
+        """
+        提取正文并给出置信度。
+
+        Args:
+            document: 共享的 HtmlDocument。
+
+        Returns:
+            Tuple[str, float]: (正文, 0 到 1 之间的置信度)，找不到正文时返回 ("", 0.0)。
+        """
+        paragraphs = self._paragraphs(document.tree)
+        if not paragraphs:
+            return "", 0.0
+
+        scores = {}
+        for node, score, _ in paragraphs:
+            parent = node.getparent()
+            if parent is None:
+                continue
+            scores[parent] = scores.get(parent, 0.0) + score
+            grandparent = parent.getparent()
+            if grandparent is not None:
+                scores[grandparent] = scores.get(grandparent, 0.0) + score / 2
+        if not scores:
+            return "", 0.0
+        best = max(scores, key=lambda node: scores[node] * _weight(node))
+
+        content = node_to_text(best)
+        total = sum(length for _, _, length in paragraphs)
+        inside = sum(length for node, _, length in paragraphs if best in node.iterancestors())
+        concentration = inside / total if total else 0.0
+        saturation = min(1.0, len(content) / self.min_chars)
+        link_density = _link_density(best, _text_length(best))
+        confidence = round(concentration * saturation * (1 - link_density), 3)
+        return content, confidence
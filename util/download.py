@@ -0,0 +1,139 @@
+# util/download.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import re, codecs
+from typing import Iterator, Optional, Tuple
+
+import charset_normalizer
+
+from config.config import HTML_MAX_BYTES, DOWNLOAD_CHUNK_SIZE
+
+PDF, HTML = 'pdf', 'html'
+
+# 可以交给正文提取器处理的非 text/* 类型
+MARKUP_TYPES = {'application/xhtml+xml', 'application/xml', 'application/rss+xml', 'application/atom+xml'}
+# 服务端不确定类型时常用的值，此时根据内容判断
+GENERIC_TYPES = {'', 'application/octet-stream', 'binary/octet-stream', 'application/unknown'}
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+
+class ResponseTooLarge(Exception):
+    """响应体超过允许下载的字节数。"""
+    pass
+
+def parse_content_type(header: Optional[str]) -> Tuple[str, Optional[str]]:
+    """解析 Content-Type 响应头。
+
+    Returns:
+        Tuple[str, Optional[str]]: (小写的 MIME 类型, 声明的字符集或 None)。
+    """
+    mime, _, params = (header or '').partition(';')
+    charset = None
+    for param in params.split(';'):
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset' and value.strip():
+            charset = value.strip().strip('"\'')
+    return mime.strip().lower(), charset
+
+def sniff_kind(mime: str, head: bytes) -> Optional[str]:
+    """根据 MIME 类型与响应开头的字节判断内容类别。
+
+    开头的魔数优先于响应头，服务端把 PDF 标成 octet-stream 或 text/html 时也能识别。
+
+    Args:
+        mime: parse_content_type 返回的 MIME 类型。
+        head: 响应体开头的若干字节。
+
+    Returns:
+        Optional[str]: PDF、HTML，或 None 表示视频、压缩包等无法提取正文的类型。
+    """
+    if b'%PDF-' in head[:1024] or mime == 'application/pdf':
+        return PDF
+    if mime.startswith('text/') or mime in MARKUP_TYPES:
+        return HTML
+    if mime in GENERIC_TYPES and looks_like_text(head):
+        return HTML
+    return None
+
+def looks_like_text(head: bytes) -> bool:
+    """开头的字节中没有 NUL 等控制字符时视为文本。"""
+    sample = head[:512]
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return True
+    return not any(byte < 0x09 or 0x0e <= byte < 0x20 for byte in sample if byte != 0x1b)
+
+def iter_limited(chunks: Iterator[bytes], max_bytes: int, written: int = 0) -> Iterator[bytes]:
+    """逐块产出响应体，累计超过 max_bytes 时抛出 ResponseTooLarge。"""
+    for chunk in chunks:
+        written += len(chunk)
+        if written > max_bytes:
+            raise ResponseTooLarge(f'more than {max_bytes} bytes')
+        yield chunk
+
+def check_length(response, max_bytes: int) -> None:
+    """Content-Length 超过 max_bytes 时关闭响应并抛出 ResponseTooLarge，不读取响应体。"""
+    length = response.headers.get('Content-Length', '')
+    if str(length).isdigit() and int(length) > max_bytes:
+        response.close()
+        raise ResponseTooLarge(f'Content-Length {length} > {max_bytes}')
+
+def read_body(response, max_bytes: int = HTML_MAX_BYTES, chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+              prefix: bytes = b'', chunks: Optional[Iterator[bytes]] = None) -> bytes:
+    """读取以 stream=True 发出的响应的全部内容，超过 max_bytes 时放弃。
+
+    Args:
+        response: requests 响应。
+        max_bytes: 允许读取的最大字节数。
+        chunk_size: 每次读取的字节数。
+        prefix: 调用方已经从响应中读出的开头部分。
+        chunks: 调用方已经创建的 iter_content 迭代器，默认新建一个。
+
+    Returns:
+        bytes: 响应体。
+
+    Raises:
+        ResponseTooLarge: 响应体超过 max_bytes，响应已关闭。
+    """
+    check_length(response, max_bytes)
+    if chunks is None:
+        chunks = response.iter_content(chunk_size=chunk_size)
+    parts = [prefix]
+    try:
+        parts.extend(iter_limited(chunks, max_bytes, len(prefix)))
+    except ResponseTooLarge:
+        response.close()
+        raise
+    return b''.join(parts)
+
+def detect_encoding(body: bytes, declared: Optional[str] = None) -> str:
+    """确定响应体的编码，不解码整个响应体。
+
+    依次使用 BOM、响应头声明的字符集、页面 <meta> 中声明的字符集，都没有时
+    由 charset_normalizer 根据开头的内容推测。
+    """
+    for bom, encoding in BOMS:
+        if body.startswith(bom):
+            return encoding
+    candidates = [declared]
+    match = META_CHARSET.search(body[:4096])
+    if match:
+        candidates.append(match.group(1).decode('ascii', 'ignore'))
+    for candidate in candidates:
+        if candidate:
+            try:
+                return codecs.lookup(candidate).name
+            except LookupError:
+                continue
+    best = charset_normalizer.from_bytes(body[:64 * 1024]).best()
+    return best.encoding if best is not None else 'utf-8'
+
+def decode_html(body: bytes, declared: Optional[str] = None) -> str:
+    """按 detect_encoding 确定的编码把响应体解码一次，无法解码的字节用替换字符表示。"""
+    return body.decode(detect_encoding(body, declared), errors='replace')
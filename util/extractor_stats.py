@@ -0,0 +1,155 @@
+# util/extractor_stats.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import json, time, random, sqlite3, threading, argparse
+from typing import Dict, List, Optional, Sequence
+
+from util.log_utils import logger
+
+from config.config import EXTRACTOR_STATS_PATH, EXTRACTOR_EXPLORE_RATE, EXTRACTOR_MIN_ATTEMPTS
+
+# 默认的提取顺序
+EXTRACTORS = ('newspaper3k', 'readability', 'gne')
+
+class ExtractorStats:
+    """按主机持久化各正文提取器的表现，并据此决定提取顺序。
+
+    每次提取记录成功与否、正文长度和耗时。排序时按平滑后的成功率从高到低，
+    成功率相同时耗时短的优先；尝试次数不足 min_attempts 的主机使用默认顺序。
+    以 epsilon 的概率把一个非最优的提取器提到最前，避免历史数据过时后无法纠正。
+
+    Attributes:
+        path: SQLite 数据库文件路径。
+        epsilon: 探索概率。
+        min_attempts: 使用历史数据排序前该主机需要的最少尝试次数。
+    """
+
+    def __init__(self, path: str = EXTRACTOR_STATS_PATH, epsilon: float = EXTRACTOR_EXPLORE_RATE,
+                 min_attempts: int = EXTRACTOR_MIN_ATTEMPTS, seed: Optional[int] = None, logger=logger):
+        """初始化 ExtractorStats 实例。
+
+        Args:
+            path: SQLite 数据库文件路径，传入 `:memory:` 时仅保存在内存中。
+            epsilon: 探索概率，默认取配置 EXTRACTOR_EXPLORE_RATE。
+            min_attempts: 使用历史数据排序前需要的最少尝试次数，默认取配置 EXTRACTOR_MIN_ATTEMPTS。
+            seed: 探索使用的随机种子。
+        """
+        self.path = path
+        self.epsilon = epsilon
+        self.min_attempts = min_attempts
+        self.logger = logger
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS extractor_stats ('
+                'host TEXT NOT NULL, extractor TEXT NOT NULL, '
+                'attempts INTEGER NOT NULL, successes INTEGER NOT NULL, '
+                'total_length INTEGER NOT NULL, total_latency REAL NOT NULL, '
+                'updated_at REAL NOT NULL, PRIMARY KEY (host, extractor))'
+            )
+
+    def record(self, host: str, extractor: str, success: bool, length: int, latency: float) -> None:
+        """记录一次提取的结果。
+
+        Args:
+            host: 页面所在主机。
+            extractor: 提取器名称。
+            success: 是否提取到正文。
+            length: 正文长度。
+            latency: 提取耗时（秒）。
+        """
+        with self._lock, self.conn:
+            self.conn.execute(
+                'INSERT INTO extractor_stats VALUES (?, ?, 1, ?, ?, ?, ?) '
+                'ON CONFLICT (host, extractor) DO UPDATE SET '
+                'attempts = attempts + 1, successes = successes + excluded.successes, '
+                'total_length = total_length + excluded.total_length, '
+                'total_latency = total_latency + excluded.total_latency, updated_at = excluded.updated_at',
+                (host, extractor, int(success), length if success else 0, latency, time.time())
+            )
+
+    def host_stats(self, host: str) -> Dict[str, Dict[str, float]]:
+        """返回某个主机上各提取器的尝试次数、成功率、平均正文长度与平均耗时。"""
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT extractor, attempts, successes, total_length, total_latency '
+                'FROM extractor_stats WHERE host = ?', (host,)
+            ).fetchall()
+        return {extractor: self._summary(*values) for extractor, *values in rows}
+
+    @staticmethod
+    def _summary(attempts: int, successes: int, total_length: int, total_latency: float) -> Dict[str, float]:
+        return {
+            'attempts': attempts,
+            'success_rate': round(successes / attempts, 3) if attempts else 0.0,
+            'avg_length': round(total_length / successes) if successes else 0,
+            'avg_latency': round(total_latency / attempts, 4) if attempts else 0.0,
+        }
+
+    def rank(self, host: str, extractors: Sequence[str] = EXTRACTORS) -> List[str]:
+        """返回该主机上提取器的尝试顺序。"""
+        stats = self.host_stats(host)
+        if sum(stats.get(name, {}).get('attempts', 0) for name in extractors) < self.min_attempts:
+            return list(extractors)
+
+        def score(name):
+            entry = stats.get(name)
+            if entry is None:
+                return (-0.5, 0.0)  # 没有记录时成功率按 1/2 估计
+            # 拉普拉斯平滑，避免一两次结果决定排序
+            successes = entry['success_rate'] * entry['attempts']
+            return (-(successes + 1) / (entry['attempts'] + 2), entry['avg_latency'])
+
+        order = sorted(extractors, key=score)
+        if len(order) > 1 and self._random.random() < self.epsilon:
+            order.insert(0, order.pop(self._random.randrange(1, len(order))))
+        return order
+
+    def export(self, path: Optional[str] = None) -> List[Dict]:
+        """导出所有主机的统计结果。
+
+        Args:
+            path: 可选的 JSON 文件路径，提供时同时写入文件。
+
+        Returns:
+            List[Dict]: 每个（主机, 提取器）一条记录，按主机排序。
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                'SELECT host, extractor, attempts, successes, total_length, total_latency '
+                'FROM extractor_stats ORDER BY host, extractor'
+            ).fetchall()
+        report = [{'host': host, 'extractor': extractor, **self._summary(*values)}
+                  for host, extractor, *values in rows]
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+    def close(self) -> None:
+        """关闭数据库连接。"""
+        with self._lock:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='导出各主机的正文提取器统计')
+    parser.add_argument('--db', default=EXTRACTOR_STATS_PATH, help='统计数据库路径')
+    parser.add_argument('--json', default=None, help='写入 JSON 文件，默认打印到终端')
+    parser.add_argument('--host', default=None, help='只显示某个主机')
+    args = parser.parse_args()
+
+    stats = ExtractorStats(args.db)
+    report = stats.export(args.json)
+    for row in report:
+        if args.host and row['host'] != args.host:
+            continue
+        print(f"{row['host']:<32s} {row['extractor']:<12s} attempts={row['attempts']:<5d} "
+              f"success={row['success_rate']:.2f} length={row['avg_length']:<6d} latency={row['avg_latency']:.3f}s")
@@ -0,0 +1,36 @@
+# util/gne_extractor.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import unicodedata
+
+from gne import GeneralNewsExtractor
+from gne.utils import remove_noise_node, pre_parse
+from lxml import etree
+
+# gne 导入较慢，本模块只在第一次使用 gne 提取时导入
+
+
+class TreeNewsExtractor(GeneralNewsExtractor):
+    """直接处理 lxml 树的 GeneralNewsExtractor，只提取正文，实例可以重复使用。"""
+
+    def extract_content(self, element, normalize=True) -> str:
+        """
+        从 lxml 树中提取正文，会修改传入的树。
+
+        与 GeneralNewsExtractor.extract 的预处理一致：按 NFKC 归一化文本、去掉 <br>、
+        删除噪声节点后按文本密度选出正文节点。
+
+        Returns:
+            str: 正文，找不到时返回空字符串。
+        """
+        if normalize:
+            for node in element.iter():
+                if node.text:
+                    node.text = unicodedata.normalize('NFKC', node.text)
+                if node.tail:
+                    node.tail = unicodedata.normalize('NFKC', node.tail)
+        etree.strip_tags(element, 'br')
+        remove_noise_node(element, None)
+        content = self._content_extractor.extract(pre_parse(element))
+        return content[0][1]['text'] if content else ""
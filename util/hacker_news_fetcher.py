@@ -2,26 +2,153 @@
 import sys,os
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
 
-import requests
-from typing import List, Dict
+import time, requests
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from util.log_utils import logger
+from util.item_store import ItemStore
+from util.singleflight import SingleFlight
+from util.rate_limiter import get_throttle
+from util.http_transport import HttpTransport, transport as shared_transport
+
+from config.config import HN_API_BASE, HN_TIMEOUT, HN_MAX_WORKERS, HN_UPDATES_WINDOW
+
+# 可抓取的新闻列表及其 API 路径
+FEEDS = {
+    'top': 'topstories.json',
+    'new': 'newstories.json',
+    'best': 'beststories.json',
+    'ask': 'askstories.json',
+    'show': 'showstories.json',
+    'job': 'jobstories.json',
+}
 
 class HackerNewsFetcher:
     """用于从 Hacker News API 获取最新新闻的类。
 
     Attributes:
         top_n: 要获取的新闻数量。
+        max_workers: 并发抓取条目详情的线程数，1 表示串行抓取。
+        timeout: 单次请求的超时时间（秒）。
+        base_url: Hacker News API 的根地址。
+        transport: 发送请求的 HttpTransport。
+        session: transport 中复用 keep-alive 连接的 requests.Session。
+        item_store: 可选的 ItemStore，命中时不再请求 API。
+        throttle: 与其他组件共享的 API 主机限流器。
+        incremental: 是否启用增量模式，每次获取新闻前先通过 updates.json 同步变更。
     """
 
-    def __init__(self, top_n: int = 10, logger=logger):
+    def __init__(self, top_n: int = 10, logger=logger,
+                 max_workers: int = HN_MAX_WORKERS,
+                 timeout: float = HN_TIMEOUT,
+                 base_url: str = HN_API_BASE,
+                 item_store: Optional[ItemStore] = None,
+                 incremental: bool = False,
+                 transport: Optional[HttpTransport] = None):
         """初始化 HackerNewsFetcher 实例。
 
         Args:
             top_n: 要获取的新闻数量，默认为 10 条。
+            max_workers: 并发抓取条目详情的线程数，默认取配置 HN_MAX_WORKERS。
+            timeout: 单次请求的超时时间（秒），默认取配置 HN_TIMEOUT。
+            base_url: Hacker News API 的根地址，默认取配置 HN_API_BASE。
+            item_store: 可选的 ItemStore 条目缓存，默认不使用缓存。
+            incremental: 是否启用增量模式，需要同时提供 item_store。
+            transport: 可选的 HttpTransport，默认使用进程内共享的传输层。
         """
         self.top_n = top_n
         self.logger = logger
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.base_url = base_url.rstrip('/')
+        self.item_store = item_store
+        self.incremental = incremental and item_store is not None
+        # 自该时间起 updates.json 的同步没有中断，此后抓取的条目无需按有效期刷新
+        self._trusted_since = None
+        # 合并同一条目的并发请求
+        self._singleflight = SingleFlight()
+        self.throttle = get_throttle(urlparse(self.base_url).netloc)
+        # 默认使用直连的共享传输层，请求经过 transport 时会使用上面的主机限流器
+        self.transport = transport if transport is not None else shared_transport
+        self.session = self.transport.session
+
+    def get_json(self, path: str):
+        """请求 API 的某个路径并返回解析后的 JSON。
+
+        Args:
+            path: 相对于 base_url 的路径，例如 `topstories.json`。
+
+        Returns:
+            解析后的 JSON 数据。
+
+        Raises:
+            requests.RequestException: 请求失败或状态码异常时抛出。
+        """
+        response = self.transport.get(f'{self.base_url}/{path}', timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _map(self, func, news_ids: List[int]) -> list:
+        """对每个新闻 ID 调用 func，返回与 news_ids 顺序一致的结果列表。
+
+        当 max_workers 大于 1 时使用有界线程池并发执行。
+        """
+        if self.max_workers == 1 or len(news_ids) <= 1:
+            return [func(news_id) for news_id in news_ids]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(news_ids))) as executor:
+            return list(executor.map(func, news_ids))
+
+    def fetch_news_details(self, news_ids: List[int]) -> List[Dict]:
+        """批量获取新闻详情。
+
+        当 max_workers 大于 1 时使用有界线程池并发请求，结果顺序与 news_ids
+        保持一致，获取失败的条目会被跳过。
+
+        Args:
+            news_ids: 新闻 ID 列表。
+
+        Returns:
+            List[Dict]: 成功获取的新闻详情列表。
+        """
+        details = self._map(self.fetch_news_detail, news_ids)
+        return [detail for detail in details if detail]
+
+    def iter_news_details(self, news_ids: List[int]) -> Iterator[Tuple[int, Dict]]:
+        """按完成顺序逐个产出新闻详情，供流水线在全部完成前开始处理。
+
+        Args:
+            news_ids: 新闻 ID 列表。
+
+        Yields:
+            Tuple[int, Dict]: （在 news_ids 中的序号, 新闻详情），获取失败时详情为空字典。
+        """
+        if self.max_workers == 1 or len(news_ids) <= 1:
+            for index, news_id in enumerate(news_ids):
+                yield index, self.fetch_news_detail(news_id)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(news_ids))) as executor:
+            futures = {executor.submit(self.fetch_news_detail, news_id): index
+                       for index, news_id in enumerate(news_ids)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def iter_latest_news(self) -> Iterator[Tuple[int, Dict]]:
+        """流式获取最新的新闻，详见 iter_news_details。
+
+        Yields:
+            Tuple[int, Dict]: （在热门列表中的序号, 新闻详情）。
+        """
+        if self.incremental:
+            self.sync_updates()
+        try:
+            news_ids = self.get_json('topstories.json')[:self.top_n]
+        except requests.RequestException as e:
+            self.logger.log_exception()
+            return
+        self.logger.log_info(f"获取到的新闻 ID：{news_ids}")
+        yield from self.iter_news_details(news_ids)
 
     def fetch_latest_news(self) -> List[Dict]:
         """获取最新的新闻列表。
@@ -29,20 +156,19 @@ class HackerNewsFetcher:
         Returns:
             List[Dict]: 包含新闻详情的列表。
         """
+        if self.incremental:
+            self.sync_updates()
         try:
             # 获取最新的新闻 ID 列表
-            response = requests.get('https://hacker-news.firebaseio.com/v0/topstories.json')
-            response.raise_for_status()
-            news_ids = response.json()[:self.top_n]
+            news_ids = self.get_json('topstories.json')[:self.top_n]
             self.logger.log_info(f"获取到的新闻 ID：{news_ids}")
 
             # 获取每个新闻的详细信息
-            news_list = []
-            for news_id in news_ids:
-                news_detail = self.fetch_news_detail(news_id)
-                if news_detail:
-                    news_list.append(news_detail)
+            news_list = self.fetch_news_details(news_ids)
             self.logger.log_info(f"共获取到 {len(news_list)} 条新闻。")
+            self.logger.log_info(f"API 限流状态：{self.throttle.stats()}")
+            if self.item_store is not None:
+                self.logger.log_info(f"条目缓存统计：{self.item_store.stats()}")
             return news_list
         except requests.RequestException as e:
             self.logger.log_exception()
@@ -57,17 +183,152 @@ class HackerNewsFetcher:
         Returns:
             Dict: 新闻的详细信息。
         """
-        try:
-            url = f'https://hacker-news.firebaseio.com/v0/item/{news_id}.json'
-            response = requests.get(url)
-            response.raise_for_status()
-            news_detail = response.json()
+        news_detail = self.fetch_item(news_id)
+        if news_detail:
             self.logger.log_info(f"新闻 ID {news_id} 的详情已获取。")
-            return news_detail
+        return news_detail
+
+    def fetch_item(self, item_id: int, fields: Optional[Iterable[str]] = None) -> Dict:
+        """获取任意条目（新闻、评论等），启用缓存时优先读取缓存。
+
+        与 fetch_news_detail 相同，但成功时不记录日志，适合评论等大批量条目。
+        同一条目的并发请求会被合并为一次。
+
+        Args:
+            item_id: 条目 ID。
+            fields: 调用方需要的字段，用于判断缓存是否过期，None 表示全部字段。
+
+        Returns:
+            Dict: 条目详情，获取失败或条目不存在时返回空字典。
+        """
+        if self.item_store is not None:
+            cached = self.item_store.get(item_id, fields=fields, trusted_since=self._trusted_since)
+            if cached:
+                return cached
+        return self._singleflight.do(('item', item_id), lambda: self._fetch_and_store(item_id))
+
+    def _fetch_and_store(self, item_id: int) -> Dict:
+        item = self._fetch_item(item_id)
+        if item and self.item_store is not None:
+            self.item_store.put(item)
+        return item
+
+    def fetch_feeds(self, feeds: Iterable[str] = ('top', 'new'),
+                    top_n: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """一次获取多个新闻列表，所有列表的条目合并后只请求一次。
+
+        Args:
+            feeds: 列表名称，可选 top、new、best、ask、show、job。
+            top_n: 每个列表取前多少条，默认为 self.top_n。
+
+        Returns:
+            Dict[str, List[Dict]]: 列表名称到新闻详情列表的映射，保持各列表原有顺序，
+                获取失败的列表为空列表，获取失败的条目会被跳过。
+        """
+        top_n = self.top_n if top_n is None else top_n
+        feeds = list(dict.fromkeys(feeds))
+        unknown = [feed for feed in feeds if feed not in FEEDS]
+        if unknown:
+            raise ValueError(f"未知的新闻列表：{unknown}，可选 {list(FEEDS)}")
+
+        def fetch_ids(feed):
+            try:
+                return self.get_json(FEEDS[feed])[:top_n]
+            except requests.RequestException as e:
+                self.logger.log_exception()
+                return []
+        feed_ids = dict(zip(feeds, self._map(fetch_ids, feeds)))
+
+        # 各列表之间重叠较多，先取并集再统一抓取
+        unique_ids = list(dict.fromkeys(news_id for ids in feed_ids.values() for news_id in ids))
+        items = dict(zip(unique_ids, self._map(self.fetch_item, unique_ids)))
+        total = sum(len(ids) for ids in feed_ids.values())
+        self.logger.log_info(f"获取 {feeds} 共 {total} 个条目，去重后请求 {len(unique_ids)} 个。")
+        return {
+            feed: [items[news_id] for news_id in ids if items[news_id]]
+            for feed, ids in feed_ids.items()
+        }
+
+    def sync_updates(self) -> Dict[str, int]:
+        """通过 maxitem.json 与 updates.json 增量同步本地缓存。
+
+        只重新抓取 updates.json 中列出且已在缓存中的条目与用户资料，未缓存的
+        条目留到真正需要时再抓取。同步结果与本次的 maxitem 会写入缓存的元数据。
+
+        Returns:
+            Dict[str, int]: 本次刷新的条目数、用户数，以及自上次同步以来新增的条目数。
+        """
+        if self.item_store is None:
+            return {'items': 0, 'profiles': 0, 'new_items': 0}
+        try:
+            max_item = self.get_json('maxitem.json')
+            updates = self.get_json('updates.json') or {}
+        except requests.RequestException as e:
+            self.logger.log_exception()
+            self._trusted_since = None
+            return {'items': 0, 'profiles': 0, 'new_items': 0}
+
+        now = time.time()
+        last_max_item = self.item_store.get_meta('maxitem')
+        last_synced_at = self.item_store.get_meta('updates_synced_at')
+        new_items = max_item - last_max_item if last_max_item else 0
+
+        # 只刷新本地已有的条目与用户资料，刷新后抓取时间不早于 trusted_since
+        changed_ids = self.item_store.cached_items(updates.get('items', []))
+        refreshed = [item for item in self._map(self._fetch_item, changed_ids) if item]
+        self.item_store.put_many(refreshed)
+        changed_users = self.item_store.cached_users(updates.get('profiles', []))
+        users = [user for user in self._map(self._fetch_user, changed_users) if user]
+        self.item_store.put_users(users)
+
+        # 两次同步间隔超出 updates.json 的窗口时可能遗漏变更，从本次同步重新开始计算
+        trusted_since = self.item_store.get_meta('trusted_since')
+        if not last_synced_at or not trusted_since or now - last_synced_at > HN_UPDATES_WINDOW:
+            trusted_since = now
+            self.item_store.set_meta('trusted_since', trusted_since)
+        self.item_store.set_meta('maxitem', max_item)
+        self.item_store.set_meta('updates_synced_at', now)
+        self._trusted_since = trusted_since
+        self.logger.log_info(
+            f"增量同步完成：刷新 {len(refreshed)} 个条目、{len(users)} 个用户，"
+            f"新增条目 {new_items} 个，maxitem={max_item}。"
+        )
+        return {'items': len(refreshed), 'profiles': len(users), 'new_items': new_items}
+
+    def _fetch_item(self, news_id: int) -> Dict:
+        """直接请求 API 获取条目，不经过缓存。"""
+        try:
+            return self.get_json(f'item/{news_id}.json') or {}
+        except requests.RequestException as e:
+            self.logger.log_exception()
+            return {}
+
+    def _fetch_user(self, user_id: str) -> Dict:
+        """直接请求 API 获取用户资料，不经过缓存。"""
+        try:
+            return self.get_json(f'user/{user_id}.json') or {}
         except requests.RequestException as e:
             self.logger.log_exception()
             return {}
-        
+
+    def fetch_user(self, user_id: str) -> Dict:
+        """获取用户资料，启用缓存时优先读取缓存。
+
+        Args:
+            user_id: 用户名。
+
+        Returns:
+            Dict: 用户资料，获取失败时返回空字典。
+        """
+        if self.item_store is not None:
+            cached = self.item_store.get_user(user_id)
+            if cached:
+                return cached
+        user = self._fetch_user(user_id)
+        if user and self.item_store is not None:
+            self.item_store.put_users([user])
+        return user
+
     def fetch_latest_urls(self) -> List[str]:
         """获取最新的新闻链接列表。
 
@@ -75,14 +336,8 @@ class HackerNewsFetcher:
             List[str]: 新闻链接列表。
         """
         try:
-            response = requests.get('https://hacker-news.firebaseio.com/v0/newstories.json')
-            response.raise_for_status()
-            news_ids = response.json()[:self.top_n]
-            urls = []
-            for news_id in news_ids:
-                url = self.fetch_news_url(news_id)
-                if url:
-                    urls.append(url)
+            news_ids = self.get_json('newstories.json')[:self.top_n]
+            urls = [url for url in self._map(self.fetch_news_url, news_ids) if url]
             self.logger.log_info(f"获取到 {len(urls)} 个新闻链接。")
             return urls
         except requests.RequestException as e:
@@ -98,21 +353,14 @@ class HackerNewsFetcher:
         Returns:
             str: 新闻的链接。
         """
-        try:
-            url = f'https://hacker-news.firebaseio.com/v0/item/{news_id}.json'
-            response = requests.get(url)
-            response.raise_for_status()
-            news_detail = response.json()
-            news_url = news_detail.get('url', '')
-            return news_url
-        except requests.RequestException as e:
-            self.logger.log_exception()
-            return ""
-        
+        # url 为不可变字段，缓存命中后无需刷新；与 fetch_news_detail 共用同一条目请求
+        news_detail = self.fetch_item(news_id, fields=('url',))
+        return news_detail.get('url', '')
+
 if __name__ == "__main__":
     fetcher = HackerNewsFetcher()
     news_list = fetcher.fetch_latest_news()
     from pprint import pprint
     pprint(news_list)
     news_urls = fetcher.fetch_latest_urls()
-    pprint(news_urls)
\ No newline at end of file
+    pprint(news_urls)
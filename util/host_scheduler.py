@@ -0,0 +1,256 @@
+# util/host_scheduler.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, threading, requests, contextvars
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from util.log_utils import logger
+from util.singleflight import SingleFlight
+from util.http_transport import transport
+
+from config.config import (
+    TIMEOUT, HOST_MAX_CONCURRENCY, HOST_MIN_DELAY,
+    ROBOTS_TTL, ROBOTS_MAX_CRAWL_DELAY, ROBOTS_OBEY_DISALLOW,
+)
+
+class DisallowedByRobots(Exception):
+    """URL 被 robots.txt 禁止抓取。"""
+    pass
+
+class RobotsCache:
+    """按站点缓存 robots.txt 的解析结果。
+
+    robots.txt 获取失败、返回 4xx 或 5xx 时视为允许抓取且没有 Crawl-delay，
+    同一站点的并发查询只会发出一次请求。
+
+    Attributes:
+        ttl: 缓存有效期（秒）。
+        user_agent: 匹配 robots.txt 规则时使用的 User-agent。
+    """
+
+    def __init__(self, ttl: float = ROBOTS_TTL, user_agent: str = '*', timeout: float = TIMEOUT):
+        self.ttl = ttl
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self._cache: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._singleflight = SingleFlight()
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f'{parsed.scheme or "http"}://{parsed.netloc.lower()}'
+
+    def _fetch(self, origin: str) -> Optional[RobotFileParser]:
+        try:
+            response = transport.get(f'{origin}/robots.txt', timeout=self.timeout)
+        except requests.RequestException:
+            return None
+        if response.status_code != 200:
+            return None
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        return parser
+
+    def get(self, url: str) -> Optional[RobotFileParser]:
+        """返回 url 所在站点的 robots.txt 解析结果，没有可用规则时返回 None。"""
+        origin = self._origin(url)
+        with self._lock:
+            cached = self._cache.get(origin)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        parser = self._singleflight.do(origin, lambda: self._fetch(origin))
+        with self._lock:
+            self._cache[origin] = (time.monotonic(), parser)
+        return parser
+
+    def cached_crawl_delay(self, url: str) -> float:
+        """只读缓存的 Crawl-delay，未缓存时返回 0，不会发出请求。"""
+        with self._lock:
+            cached = self._cache.get(self._origin(url))
+        return self._crawl_delay(cached[1]) if cached else 0.0
+
+    def _crawl_delay(self, parser: Optional[RobotFileParser]) -> float:
+        if parser is None:
+            return 0.0
+        delay = parser.crawl_delay(self.user_agent)
+        try:
+            return min(float(delay or 0), ROBOTS_MAX_CRAWL_DELAY)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def crawl_delay(self, url: str) -> float:
+        """返回站点的 Crawl-delay（秒），最大不超过 ROBOTS_MAX_CRAWL_DELAY。"""
+        return self._crawl_delay(self.get(url))
+
+    def can_fetch(self, url: str) -> bool:
+        """robots.txt 是否允许抓取该 URL。"""
+        parser = self.get(url)
+        return parser is None or parser.can_fetch(self.user_agent, url)
+
+
+# 进程内共享的 robots.txt 缓存
+robots_cache = RobotsCache()
+
+
+class HostScheduler:
+    """按主机调度抓取任务的线程池。
+
+    每个主机有独立的任务队列，调度线程在主机之间轮转挑选可运行的任务：
+    同一主机的在途任务不超过 per_host_limit，相邻两次开始的间隔不小于
+    min_delay 与 robots.txt 中 Crawl-delay 的较大值。某个主机需要等待时，
+    空闲的工作线程会去处理其他主机的任务，从而保持整个线程池忙碌。
+
+    Attributes:
+        max_workers: 工作线程数。
+        per_host_limit: 每个主机的最大并发数。
+        min_delay: 同一主机相邻两次请求的最短间隔（秒）。
+        robots: RobotsCache 实例，为 None 时不读取 robots.txt。
+        obey_disallow: 是否跳过 robots.txt 禁止的 URL。
+    """
+
+    def __init__(self, max_workers: int = 5, per_host_limit: int = HOST_MAX_CONCURRENCY,
+                 min_delay: float = HOST_MIN_DELAY, robots: Optional[RobotsCache] = robots_cache,
+                 obey_disallow: bool = ROBOTS_OBEY_DISALLOW, logger=logger):
+        """初始化 HostScheduler 实例。
+
+        Args:
+            max_workers: 工作线程数，默认为 5。
+            per_host_limit: 每个主机的最大并发数，默认取配置 HOST_MAX_CONCURRENCY。
+            min_delay: 同一主机相邻两次请求的最短间隔，默认取配置 HOST_MIN_DELAY。
+            robots: RobotsCache 实例，默认使用模块级共享的缓存，为 None 时不读取 robots.txt。
+            obey_disallow: 是否跳过 robots.txt 禁止的 URL，默认取配置 ROBOTS_OBEY_DISALLOW。
+        """
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.min_delay = min_delay
+        self.robots = robots
+        self.obey_disallow = obey_disallow
+        self.logger = logger
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._cond = threading.Condition()
+        self._queues: Dict[str, deque] = {}
+        self._hosts = deque()   # 有待处理任务的主机，按轮转顺序排列
+        self._active: Dict[str, int] = {}
+        self._next_start: Dict[str, float] = {}
+        self._robots_ready = set()  # 已加载 robots.txt 的主机
+        self._running = 0
+        self._pending = 0
+        self._closed = False
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, url: str, fn: Callable, *args, **kwargs) -> Future:
+        """提交一个针对 url 的任务。
+
+        Args:
+            url: 任务访问的 URL，用于确定所属主机。
+            fn: 要执行的函数。
+            *args, **kwargs: 传给 fn 的参数。
+
+        Returns:
+            Future: 任务结果。robots.txt 禁止抓取时抛出 DisallowedByRobots。
+        """
+        future = Future()
+        host = urlparse(url).netloc.lower()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('HostScheduler 已关闭')
+            if host not in self._queues or not self._queues[host]:
+                self._queues[host] = deque()
+                self._hosts.append(host)
+            # 保存提交时的上下文，任务继承调用方的截止时间等 contextvars
+            self._queues[host].append((future, url, fn, args, kwargs, contextvars.copy_context()))
+            self._pending += 1
+            self._cond.notify_all()
+        return future
+
+    def map(self, fn: Callable, urls: List[str], *iterables) -> List:
+        """对每个 URL 调用 fn(url, *其他参数)，按输入顺序返回结果。"""
+        futures = [self.submit(url, fn, url, *args) for url, *args in zip(urls, *iterables)]
+        return [future.result() for future in futures]
+
+    def _delay(self, url: str) -> float:
+        crawl_delay = self.robots.cached_crawl_delay(url) if self.robots is not None else 0.0
+        return max(self.min_delay, crawl_delay)
+
+    def _next_task(self):
+        """挑选下一个可运行的任务，返回（任务, 需要等待的秒数），调用方需持有锁。"""
+        if self._running >= self.max_workers or not self._hosts:
+            return None, None
+        now = time.monotonic()
+        earliest = None
+        for _ in range(len(self._hosts)):
+            host = self._hosts[0]
+            self._hosts.rotate(-1)
+            active = self._active.get(host, 0)
+            if active >= self.per_host_limit:
+                continue
+            if active and self.robots is not None and host not in self._robots_ready:
+                continue    # robots.txt 尚未加载，Crawl-delay 未知时每个主机只放行一个请求
+            next_start = self._next_start.get(host, 0.0)
+            if next_start > now:
+                earliest = next_start if earliest is None else min(earliest, next_start)
+                continue
+            task = self._queues[host].popleft()
+            if not self._queues[host]:
+                self._hosts.pop()   # 轮转后该主机位于队尾
+            self._active[host] = self._active.get(host, 0) + 1
+            self._next_start[host] = now + self._delay(task[1])
+            self._running += 1
+            self._pending -= 1
+            return (host, task), None
+        return None, (earliest - now if earliest is not None else None)
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while not (self._closed and self._pending == 0):
+                task, wait = self._next_task()
+                if task is not None:
+                    self._executor.submit(self._run, *task)
+                else:
+                    self._cond.wait(timeout=wait)
+
+    def _run(self, host: str, task) -> None:
+        future, url, fn, args, kwargs, context = task
+        started = time.monotonic()
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                if self.robots is not None:
+                    if self.obey_disallow and not self.robots.can_fetch(url):
+                        raise DisallowedByRobots(url)
+                    delay = max(self.min_delay, self.robots.crawl_delay(url))
+                    with self._cond:
+                        self._next_start[host] = max(self._next_start.get(host, 0.0), started + delay)
+                        self._robots_ready.add(host)
+                future.set_result(context.run(fn, *args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+        finally:
+            with self._cond:
+                self._active[host] -= 1
+                self._running -= 1
+                self._cond.notify_all()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """不再接受新任务；wait 为 True 时等待已提交的任务全部完成。"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            self._dispatcher.join()
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> 'HostScheduler':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown(wait=True)
+
@@ -0,0 +1,86 @@
+# util/html_document.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import re, copy
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+from lxml.html import HtmlElement
+
+# 转为文本时前后换行的块级标签
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure',
+    'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol',
+    'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul',
+}
+# 转为文本时整体跳过的标签
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'iframe', 'svg'}
+WHITESPACE = re.compile(r'\s+')
+
+
+class HtmlDocument:
+    """解析一次、供多个提取器共用的 HTML 文档。
+
+    lxml 树在第一次访问 tree 时解析。readability 与 gne 会修改传入的树，
+    因此通过 copy() 取得各自的副本，深拷贝比重新解析 HTML 快得多。
+
+    Attributes:
+        html: 已解码的 HTML。
+        url: 页面 URL。
+    """
+
+    def __init__(self, html: str, url: str = ''):
+        self.html = html
+        self.url = url
+        self._tree: Optional[HtmlElement] = None
+
+    @property
+    def tree(self) -> HtmlElement:
+        """解析后的 lxml 树，调用方不应修改。"""
+        if self._tree is None:
+            self._tree = parse_html(self.html)
+        return self._tree
+
+    def copy(self) -> HtmlElement:
+        """返回 lxml 树的深拷贝，供会修改树的提取器使用。"""
+        return copy.deepcopy(self.tree)
+
+
+def parse_html(html: str) -> HtmlElement:
+    """把 HTML 解析为 lxml 树。
+
+    带有 XML 编码声明的 str 不能直接交给 lxml，此时按 UTF-8 编码后再解析。
+    """
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        return lxml.html.document_fromstring(html.encode('utf-8'), parser=parser)
+
+def node_to_text(node: HtmlElement) -> str:
+    """遍历 lxml 节点生成纯文本，块级元素之间换行，跳过脚本与样式。
+
+    源码中的换行与连续空白合并为一个空格，只在块级元素处换行，空行去掉。
+    """
+    parts = []
+    walker = etree.iterwalk(node, events=('start', 'end'))
+    for event, element in walker:
+        tag = element.tag.lower() if isinstance(element.tag, str) else None
+        if event == 'start':
+            if tag in SKIP_TAGS or tag is None:
+                walker.skip_subtree()
+                continue
+            if tag in BLOCK_TAGS:
+                parts.append('\n')
+            if element.text:
+                parts.append(WHITESPACE.sub(' ', element.text))
+        else:
+            if tag in BLOCK_TAGS:
+                parts.append('\n')
+            # 根节点的 tail 不属于该节点的内容
+            if element.tail and element is not node:
+                parts.append(WHITESPACE.sub(' ', element.tail))
+    lines = (line.strip() for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
@@ -0,0 +1,174 @@
+# util/http_transport.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, threading
+from functools import partial
+from typing import Dict, Optional, Tuple, Union
+
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from urllib3.util.request import ACCEPT_ENCODING
+
+from util.log_utils import logger
+from util.rate_limiter import get_throttle
+from util.utils import time_left
+
+from config.config import (
+    PROXIES, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_HOSTS, HTTP_POOL_MAXSIZE,
+)
+
+class HttpTransport:
+    """所有出站 HTTP 请求共用的传输层。
+
+    基于一个 requests.Session：每个主机一个 keep-alive 连接池（最多保留
+    pool_hosts 个主机），DNS 解析结果与 TLS 会话随连接复用；Accept-Encoding
+    按已安装的解码器声明 gzip/deflate/br/zstd；证书与连接/读取超时统一配置，
+    只有显式传入 proxies 时才经过代理。
+    每个请求都经过对应主机的 AdaptiveThrottle，并按主机记录统计信息。
+
+    Attributes:
+        session: 共享的 requests.Session。
+        proxies: 请求使用的代理，为空时直连。
+        connect_timeout: 建立连接的超时时间（秒）。
+        read_timeout: 默认的读取超时时间（秒）。
+    """
+
+    def __init__(self, proxies: Optional[Dict[str, str]] = None,
+                 connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = HTTP_READ_TIMEOUT,
+                 pool_hosts: int = HTTP_POOL_HOSTS,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 logger=logger):
+        """初始化 HttpTransport 实例。
+
+        Args:
+            proxies: 请求使用的代理，默认不使用代理；下载正文时传入配置 PROXIES。
+            connect_timeout: 建立连接的超时时间，默认取配置 HTTP_CONNECT_TIMEOUT。
+            read_timeout: 默认的读取超时时间，默认取配置 HTTP_READ_TIMEOUT。
+            pool_hosts: 最多保留连接池的主机数，默认取配置 HTTP_POOL_HOSTS。
+            pool_maxsize: 每个主机连接池的最大连接数，默认取配置 HTTP_POOL_MAXSIZE。
+        """
+        self.proxies = dict(proxies or {})
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.logger = logger
+        self.session = requests.Session()
+        self.session.verify = certifi.where()
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        self.adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _timeout(self, timeout: Union[None, float, Tuple[float, float]]) -> Tuple[float, float]:
+        """把超时参数统一为（连接超时, 读取超时），并以调用链的截止时间为上限。
+
+        Raises:
+            requests.Timeout: 已经超过截止时间。
+        """
+        if timeout is None:
+            timeout = (self.connect_timeout, self.read_timeout)
+        elif not isinstance(timeout, tuple):
+            timeout = (min(self.connect_timeout, timeout), timeout)
+        left = time_left()
+        if left is None:
+            return timeout
+        if left <= 0:
+            raise requests.Timeout('deadline exceeded')
+        return (min(timeout[0], left), min(timeout[1], left))
+
+    def _record(self, host: str, response=None, error: Optional[BaseException] = None,
+                elapsed: float = 0.0, stream: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(host, {'requests': 0, 'errors': 0, 'bytes': 0, 'elapsed': 0.0})
+            stats['requests'] += 1
+            stats['elapsed'] += elapsed
+            status = getattr(response, 'status_code', None)
+            if error is not None or (isinstance(status, int) and status >= 400):
+                stats['errors'] += 1
+            elif stream:
+                # 流式响应的正文尚未读取，按 Content-Length 估计
+                length = response.headers.get('Content-Length', '')
+                stats['bytes'] += int(length) if str(length).isdigit() else 0
+            elif isinstance(response.content, bytes):
+                stats['bytes'] += len(response.content)
+
+    def request(self, method: str, url: str, timeout=None, throttle: bool = True, **kwargs) -> requests.Response:
+        """发送请求。
+
+        Args:
+            method: HTTP 方法。
+            url: 请求地址。
+            timeout: 读取超时（秒）或（连接超时, 读取超时），默认使用传输层配置；
+                设置了截止时间（util.utils.deadline）时不超过剩余时间。
+            throttle: 是否经过主机的 AdaptiveThrottle，默认为 True。
+            **kwargs: 传给 requests.Session.request 的其他参数。
+
+        Returns:
+            requests.Response: 响应对象，不检查状态码。
+
+        Raises:
+            requests.RequestException: 请求失败时抛出。
+        """
+        host = urlparse(url).netloc
+        if self.proxies:
+            # 显式传入，优先于环境变量中的代理设置
+            kwargs.setdefault('proxies', self.proxies)
+        try:
+            timeout = self._timeout(timeout)
+        except requests.Timeout as e:
+            self._record(host, error=e)
+            raise
+        # GET 走 session.get，与直接使用 Session 的代码保持同一入口
+        send = self.session.get if method.upper() == 'GET' else partial(self.session.request, method)
+        started = time.monotonic()
+        try:
+            if throttle:
+                with get_throttle(host).slot() as slot:
+                    response = send(url, timeout=timeout, **kwargs)
+                    slot.record(response)
+            else:
+                response = send(url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            self._record(host, error=e, elapsed=time.monotonic() - started)
+            raise
+        self._record(host, response, elapsed=time.monotonic() - started, stream=kwargs.get('stream', False))
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """发送 GET 请求，参数同 request。"""
+        return self.request('GET', url, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """按主机返回请求数、错误数、字节数、累计耗时以及新建连接数。
+
+        新建连接数远小于请求数说明 keep-alive 连接得到了复用。
+        """
+        with self._lock:
+            stats = {host: dict(values) for host, values in self._stats.items()}
+        managers = [self.adapter.poolmanager, *self.adapter.proxy_manager.values()]
+        for manager in managers:
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                host = pool.host if pool.port in (None, 80, 443) else f'{pool.host}:{pool.port}'
+                entry = stats.setdefault(host, {'requests': 0, 'errors': 0, 'bytes': 0, 'elapsed': 0.0})
+                entry['connections'] = entry.get('connections', 0) + pool.num_connections
+        for entry in stats.values():
+            entry['elapsed'] = round(entry['elapsed'], 3)
+        return stats
+
+    def close(self) -> None:
+        """关闭所有连接。"""
+        self.session.close()
+
+
+# 进程内共享的传输层：Hacker News API 与 robots.txt 请求直连
+transport = HttpTransport()
+# 下载文章正文与 PDF 的传输层，经过配置的代理
+download_transport = HttpTransport(proxies=PROXIES)
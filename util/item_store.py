@@ -0,0 +1,272 @@
+# util/item_store.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import json, time, sqlite3, threading
+from typing import Dict, Iterable, List, Optional
+
+from util.log_utils import logger
+
+from config.config import ITEM_CACHE_PATH, ITEM_CACHE_MAX_ITEMS, ITEM_VOLATILE_TTL
+
+# 会随时间变化的字段及其有效期（秒），未列出的字段（title、url、by、time 等）视为不可变
+VOLATILE_FIELD_TTLS = {
+    'score': ITEM_VOLATILE_TTL,
+    'descendants': ITEM_VOLATILE_TTL,
+    'kids': ITEM_VOLATILE_TTL,
+    'text': ITEM_VOLATILE_TTL,
+    'dead': ITEM_VOLATILE_TTL,
+    'deleted': ITEM_VOLATILE_TTL,
+    'parts': ITEM_VOLATILE_TTL,
+}
+
+class ItemStore:
+    """基于 SQLite 的 Hacker News 条目本地缓存。
+
+    每个条目整体存储，同时记录抓取时间。读取时按调用方关心的字段判断是否
+    过期：只需要不可变字段时缓存永久有效，需要 score 等易变字段时按
+    field_ttls 中最短的有效期判断。条目数超过 max_items 时按最近访问时间淘汰；
+    条目数在打开时统计一次，之后随写入与删除增减，写入时不再全表计数。
+    max_items 为 None 或 sys.maxsize 时不做淘汰，也不维护条目数。
+
+    Attributes:
+        path: SQLite 数据库文件路径。
+        max_items: 缓存的最大条目数，None 表示不限。
+        field_ttls: 易变字段的有效期（秒）。
+        hits: 命中次数。
+        misses: 未缓存的次数。
+        stale: 已缓存但字段过期的次数。
+        evictions: 被淘汰的条目数。
+    """
+
+    def __init__(self, path: str = ITEM_CACHE_PATH, max_items: Optional[int] = ITEM_CACHE_MAX_ITEMS,
+                 field_ttls: Optional[Dict[str, float]] = None, logger=logger):
+        """初始化 ItemStore 实例。
+
+        Args:
+            path: SQLite 数据库文件路径，传入 `:memory:` 时仅缓存在内存中。
+            max_items: 缓存的最大条目数，默认取配置 ITEM_CACHE_MAX_ITEMS；None 或
+                sys.maxsize 表示不淘汰，用于归档库。
+            field_ttls: 易变字段的有效期（秒），默认使用 VOLATILE_FIELD_TTLS。
+        """
+        self.path = path
+        self.max_items = None if max_items is None or max_items >= sys.maxsize else max_items
+        self.field_ttls = dict(VOLATILE_FIELD_TTLS if field_ttls is None else field_ttls)
+        self.logger = logger
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+        # 当前条目数，只在需要淘汰时维护
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS items ('
+                'id INTEGER PRIMARY KEY, data TEXT NOT NULL, '
+                'fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_items_accessed ON items (accessed_at)')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS users ('
+                'id TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL)'
+            )
+            self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS failed (key TEXT NOT NULL, id INTEGER NOT NULL, PRIMARY KEY (key, id))'
+            )
+            if self.max_items is not None:
+                self._size = self.conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def _max_age(self, item: Dict, fields: Optional[Iterable[str]]) -> Optional[float]:
+        """返回 fields 中最短的有效期，全部为不可变字段时返回 None。"""
+        if fields is None:
+            fields = set(item) | set(self.field_ttls)
+        ttls = [self.field_ttls[field] for field in fields if field in self.field_ttls]
+        return min(ttls) if ttls else None
+
+    def get(self, item_id: int, fields: Optional[Iterable[str]] = None,
+            trusted_since: Optional[float] = None) -> Optional[Dict]:
+        """读取缓存中的条目。
+
+        Args:
+            item_id: 条目 ID。
+            fields: 调用方需要的字段，None 表示需要全部字段。
+            trusted_since: 抓取时间不早于该时间戳的条目不检查有效期，用于此后的变更
+                都已通过 updates.json 同步的场景。
+
+        Returns:
+            Optional[Dict]: 条目未缓存或所需字段已过期时返回 None。
+        """
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT data, fetched_at FROM items WHERE id = ?', (item_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            item = json.loads(row[0])
+            trusted = trusted_since is not None and row[1] >= trusted_since
+            max_age = None if trusted else self._max_age(item, fields)
+            if max_age is not None and now - row[1] > max_age:
+                self.stale += 1
+                return None
+            self.hits += 1
+            with self.conn:
+                self.conn.execute('UPDATE items SET accessed_at = ? WHERE id = ?', (now, item_id))
+        return item
+
+    def put(self, item: Dict) -> None:
+        """写入单个条目，没有 id 的条目会被忽略。"""
+        self.put_many([item])
+
+    def put_many(self, items: Iterable[Dict]) -> int:
+        """在一个事务中批量写入条目。
+
+        Args:
+            items: 条目列表，没有 id 的条目会被忽略。
+
+        Returns:
+            int: 实际写入的条目数。
+        """
+        now = time.time()
+        rows = [(item['id'], json.dumps(item, ensure_ascii=False), now, now)
+                for item in items if item and 'id' in item]
+        if not rows:
+            return 0
+        with self._lock:
+            if self._size is not None:
+                # INSERT OR REPLACE 不区分新增与覆盖，先按主键查出已存在的条目
+                ids = list({row[0] for row in rows})
+                self._size += len(ids) - len(self._existing_ids(ids))
+            with self.conn:
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO items (id, data, fetched_at, accessed_at) VALUES (?, ?, ?, ?)',
+                    rows
+                )
+            self._evict()
+        return len(rows)
+
+    def _existing_ids(self, ids: List, table: str = 'items') -> List:
+        """返回 ids 中已存在于 table（items 或 users）的 ID，调用方需持有锁。"""
+        found = []
+        # 分批查询，避免超过 SQLite 的参数个数限制
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            found.extend(row[0] for row in self.conn.execute(
+                f'SELECT id FROM {table} WHERE id IN ({placeholders})', chunk
+            ))
+        return found
+
+    def cached_items(self, item_ids: Iterable[int]) -> List[int]:
+        """返回 item_ids 中已缓存的条目 ID，不计入命中统计。"""
+        with self._lock:
+            return self._existing_ids(list(item_ids))
+
+    def get_user(self, user_id: str) -> Optional[Dict]:
+        """读取缓存中的用户资料，未缓存时返回 None。"""
+        with self._lock:
+            row = self.conn.execute('SELECT data FROM users WHERE id = ?', (user_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_users(self, users: Iterable[Dict]) -> int:
+        """批量写入用户资料，返回实际写入的数量。"""
+        now = time.time()
+        rows = [(user['id'], json.dumps(user, ensure_ascii=False), now)
+                for user in users if user and 'id' in user]
+        if rows:
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO users (id, data, fetched_at) VALUES (?, ?, ?)', rows
+                )
+        return len(rows)
+
+    def cached_users(self, user_ids: Iterable[str]) -> List[str]:
+        """返回 user_ids 中已缓存的用户 ID。"""
+        with self._lock:
+            return self._existing_ids(list(user_ids), 'users')
+
+    def get_meta(self, key: str, default=None):
+        """读取元数据，例如上次同步时的 maxitem。"""
+        with self._lock:
+            row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key: str, value) -> None:
+        """写入可 JSON 序列化的元数据。"""
+        with self._lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                              (key, json.dumps(value)))
+
+    def add_failed(self, key: str, item_ids: Iterable[int]) -> None:
+        """记录请求失败的条目 ID，key 区分不同的任务（例如回填）。"""
+        with self._lock, self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO failed (key, id) VALUES (?, ?)',
+                                  [(key, item_id) for item_id in item_ids])
+
+    def failed_ids(self, key: str) -> List[int]:
+        """返回 key 下记录的失败条目 ID，从大到小排列。"""
+        with self._lock:
+            return [row[0] for row in self.conn.execute(
+                'SELECT id FROM failed WHERE key = ? ORDER BY id DESC', (key,)
+            )]
+
+    def remove_failed(self, key: str, item_ids: Iterable[int]) -> None:
+        """删除 key 下已经处理成功的失败记录。"""
+        with self._lock, self.conn:
+            self.conn.executemany('DELETE FROM failed WHERE key = ? AND id = ?',
+                                  [(key, item_id) for item_id in item_ids])
+
+    def invalidate(self, item_ids: Iterable[int]) -> None:
+        """删除指定条目，下次读取时会重新抓取。"""
+        with self._lock, self.conn:
+            cursor = self.conn.executemany('DELETE FROM items WHERE id = ?', [(item_id,) for item_id in item_ids])
+            if self._size is not None:
+                self._size -= cursor.rowcount
+
+    def _evict(self) -> None:
+        """条目数超过 max_items 时淘汰最久未访问的条目，调用方需持有锁。"""
+        if self._size is None or self._size <= self.max_items:
+            return
+        overflow = self._size - self.max_items
+        with self.conn:
+            cursor = self.conn.execute(
+                'DELETE FROM items WHERE id IN '
+                '(SELECT id FROM items ORDER BY accessed_at LIMIT ?)', (overflow,)
+            )
+        self._size -= cursor.rowcount
+        self.evictions += cursor.rowcount
+        self.logger.log_info(f"ItemStore 已淘汰 {cursor.rowcount} 个条目。")
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._size is not None:
+                return self._size
+            return self.conn.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        """返回命中统计。
+
+        Returns:
+            Dict[str, float]: 包含 hits、misses、stale、evictions、size 与 hit_rate。
+        """
+        lookups = self.hits + self.misses + self.stale
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'evictions': self.evictions,
+            'size': len(self),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
@@ -2,6 +2,7 @@
 import sys,os
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
 
+import re, html
 from typing import List, Dict
 from datetime import datetime
 
@@ -35,8 +36,32 @@ class MarkdownFormatter:
                 if paragraph:
                     paragraph = paragraph.replace('\n','\n- ')
                     markdown_lines.append(f'> {paragraph} \n')
+            comments = news.get('comments', [])
+            if comments:
+                markdown_lines.append("#### 💬 评论\n")
+                markdown_lines.extend(MarkdownFormatter.format_comments(comments))
             markdown_lines.append("\n\n---\n\n")
             
         markdown_content = '\n'.join(markdown_lines)
         logger.log_info("新闻已格式化为 Markdown。")
-        return markdown_content
\ No newline at end of file
+        return markdown_content
+
+    @staticmethod
+    def format_comments(comments: List[Dict], depth: int = 0) -> List[str]:
+        """将评论树格式化为缩进的 Markdown 列表。
+
+        Args:
+            comments: CommentTreeFetcher 返回的评论列表。
+            depth: 当前缩进层级。
+
+        Returns:
+            List[str]: 每条评论一行的 Markdown 文本。
+        """
+        lines = []
+        for comment in comments:
+            # HN 评论正文为 HTML，段落以 <p> 分隔
+            text = re.sub(r'<[^>]+>', '', comment.get('text', '').replace('<p>', ' '))
+            text = html.unescape(text).strip()
+            lines.append(f"{'  ' * depth}- **{comment.get('by', '')}**: {text}")
+            lines.extend(MarkdownFormatter.format_comments(comment.get('children', []), depth + 1))
+        return lines
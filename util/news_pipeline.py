@@ -0,0 +1,87 @@
+# util/news_pipeline.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time
+from typing import Dict, List, Optional
+
+from util.log_utils import logger
+from util.host_scheduler import HostScheduler
+
+from config.config import PIPELINE_MAX_WORKERS
+
+class NewsPipeline:
+    """抓取、正文提取与评论抓取的流式流水线。
+
+    HackerNewsFetcher 每获取到一条新闻就立即提交给按主机调度的提取线程池
+    （HostScheduler），不必等待全部新闻获取完成；评论树在新闻列表就绪后与正文提取并行抓取。
+    所有结果按热门列表中的顺序重新组装，因此整体耗时接近最慢的一篇文章。
+
+    Attributes:
+        fetcher: HackerNewsFetcher 实例。
+        content_extractor: ContentExtractor 实例。
+        comment_fetcher: 可选的 CommentTreeFetcher 实例。
+        max_workers: 正文提取的并发数。
+        lang: 正文提取使用的语言。
+        scheduler: 可选的 HostScheduler 实例。
+    """
+
+    def __init__(self, fetcher, content_extractor, comment_fetcher=None,
+                 max_workers: int = PIPELINE_MAX_WORKERS, lang: str = 'en', scheduler=None, logger=logger):
+        """初始化 NewsPipeline 实例。
+
+        Args:
+            fetcher: HackerNewsFetcher 实例。
+            content_extractor: 提供 extract_content(url, lang) 的提取器。
+            comment_fetcher: 可选的 CommentTreeFetcher，为 None 时不抓取评论。
+            max_workers: 正文提取的并发数，默认取配置 PIPELINE_MAX_WORKERS。
+            lang: 正文提取使用的语言，默认为 en。
+            scheduler: 可选的 HostScheduler，为 None 时按 max_workers 新建一个。
+        """
+        self.fetcher = fetcher
+        self.content_extractor = content_extractor
+        self.comment_fetcher = comment_fetcher
+        self.max_workers = max(1, max_workers)
+        self.lang = lang
+        self.scheduler = scheduler
+        self.logger = logger
+
+    def _extract(self, news: Dict) -> Dict:
+        url = news.get('url', '')
+        if url:
+            text = self.content_extractor.extract_content(url, self.lang)
+            news['text'] = news.get('text', '') + '\n\n' + text
+            self.logger.log_info(f"新闻内容已提取: {url}")
+        return news
+
+    def run(self) -> List[Dict]:
+        """运行流水线。
+
+        Returns:
+            List[Dict]: 按热门列表顺序排列的新闻，已填充 text（及 comments），
+                获取失败的新闻会被跳过。
+        """
+        started = time.monotonic()
+        slots: Dict[int, Optional[Dict]] = {}
+        with self.scheduler or HostScheduler(max_workers=self.max_workers) as scheduler:
+            futures = {}
+            for index, news in self.fetcher.iter_latest_news():
+                if news and news.get('url'):
+                    futures[index] = scheduler.submit(news['url'], self._extract, news)
+                slots[index] = news or None
+
+            news_list = [slots[index] for index in sorted(slots) if slots[index]]
+            if self.comment_fetcher is not None and news_list:
+                comment_trees = self.comment_fetcher.fetch_trees(news_list)
+                for news in news_list:
+                    news['comments'] = comment_trees.get(news['id'], [])
+
+            for index in futures:
+                try:
+                    futures[index].result()
+                except Exception as e:
+                    # 提取失败时保留新闻本身
+                    self.logger.log_exception()
+
+        self.logger.log_info(f"流水线处理 {len(news_list)} 条新闻，耗时 {time.monotonic() - started:.2f} 秒。")
+        return news_list
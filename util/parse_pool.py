@@ -0,0 +1,99 @@
+# util/parse_pool.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+from typing import Callable, Optional
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from util.log_utils import logger
+
+from config.config import PARSE_MAX_WORKERS
+
+class ParsePool:
+    """用于 CPU 密集型解析的常驻进程池。
+
+    newspaper3k、readability 与 gne 的解析主要是 lxml 和正则运算，在线程中会
+    被 GIL 串行化。ParsePool 在启动时创建全部工作进程并执行 initializer 预加载
+    重型库，之后的任务无需再付出导入和冷启动的开销。配合 then() 可以把线程中的
+    下载结果直接交给进程池解析，组成“线程做 I/O、进程做解析”的混合执行器。
+
+    max_workers 为 0 时不创建进程，任务在调用线程中直接执行，便于调试和小批量任务。
+
+    Attributes:
+        max_workers: 工作进程数。
+    """
+
+    def __init__(self, max_workers: int = PARSE_MAX_WORKERS, initializer: Optional[Callable] = None,
+                 initargs: tuple = (), logger=logger):
+        """初始化 ParsePool 实例。
+
+        Args:
+            max_workers: 工作进程数，默认取配置 PARSE_MAX_WORKERS，0 表示在调用线程中执行。
+            initializer: 每个工作进程启动时执行一次的函数，用于预加载库与创建长期对象。
+            initargs: 传给 initializer 的参数。
+        """
+        self.max_workers = max(0, max_workers)
+        self.logger = logger
+        self._executor = None
+        if self.max_workers:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 initializer=initializer, initargs=initargs)
+            # 预先提交空任务，让所有工作进程立即启动并完成初始化
+            for future in [self._executor.submit(_noop) for _ in range(self.max_workers)]:
+                future.result()
+        elif initializer is not None:
+            initializer(*initargs)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """提交一个解析任务，fn 与参数需要可以被 pickle。"""
+        if self._executor is not None:
+            return self._executor.submit(fn, *args)
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def then(self, future: Future, fn: Callable, *args) -> Future:
+        """future 完成后把它的结果作为第一个参数交给 fn 在进程池中执行。
+
+        Args:
+            future: 上一阶段（通常是线程中的下载）的 Future。
+            fn: 解析函数，调用方式为 fn(future.result(), *args)。
+            *args: 传给 fn 的其他参数。
+
+        Returns:
+            Future: 解析结果，上一阶段失败时传递同样的异常。
+        """
+        chained = Future()
+
+        def on_parsed(parsed: Future) -> None:
+            try:
+                chained.set_result(parsed.result())
+            except BaseException as e:
+                chained.set_exception(e)
+
+        def on_done(done: Future) -> None:
+            try:
+                self.submit(fn, done.result(), *args).add_done_callback(on_parsed)
+            except BaseException as e:
+                chained.set_exception(e)
+
+        future.add_done_callback(on_done)
+        return chained
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭进程池。"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown(wait=True)
+
+
+def _noop() -> None:
+    pass
@@ -0,0 +1,124 @@
+# util/pdf_extractor.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import tempfile
+from collections import deque
+from typing import Callable, Iterator, List, Optional
+
+from util.download import ResponseTooLarge, check_length, iter_limited
+
+from config.config import (
+    PDF_MAX_BYTES, PDF_MAX_PAGES, PDF_MAX_CHARS, PDF_PARALLEL_MIN_PAGES, DOWNLOAD_CHUNK_SIZE,
+)
+
+class PdfTooLarge(ResponseTooLarge):
+    """PDF 超过允许下载的字节数。"""
+    pass
+
+def spool_to_tempfile(response, max_bytes: int = PDF_MAX_BYTES, chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+                      prefix: bytes = b'', chunks: Optional[Iterator[bytes]] = None) -> str:
+    """把流式响应逐块写入临时文件，不在内存中保留完整内容。
+
+    Args:
+        response: 以 stream=True 发出的 requests 响应。
+        max_bytes: 允许写入的最大字节数。
+        chunk_size: 每次读取的字节数。
+        prefix: 调用方已经从响应中读出的开头部分。
+        chunks: 调用方已经创建的 iter_content 迭代器，默认新建一个。
+
+    Returns:
+        str: 临时文件路径，由调用方负责删除。
+
+    Raises:
+        PdfTooLarge: Content-Length 或实际读取的字节数超过 max_bytes 时抛出，临时文件已删除。
+    """
+    try:
+        check_length(response, max_bytes)
+    except ResponseTooLarge as e:
+        raise PdfTooLarge(str(e)) from None
+    if chunks is None:
+        chunks = response.iter_content(chunk_size=chunk_size)
+    handle, path = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(prefix)
+            for chunk in iter_limited(chunks, max_bytes, len(prefix)):
+                f.write(chunk)
+    except BaseException as e:
+        response.close()
+        os.remove(path)
+        if isinstance(e, ResponseTooLarge):
+            raise PdfTooLarge(str(e)) from None
+        raise
+    return path
+
+def extract_pages(path: str, start: int, stop: int, max_chars: int = PDF_MAX_CHARS) -> str:
+    """提取 [start, stop) 页的文本，累计超过 max_chars 时提前停止。
+
+    作为模块级函数，可以直接提交给进程池，每个进程各自打开文件。
+    """
+    import fitz  # PyMuPDF 导入较慢，只在提取 PDF 时导入
+    parts: List[str] = []
+    total = 0
+    with fitz.open(path) as document:
+        for page_num in range(start, min(stop, len(document))):
+            text = document.load_page(page_num).get_text()
+            parts.append(text)
+            total += len(text)
+            if total >= max_chars:
+                break
+    return ''.join(parts)
+
+def extract_pdf_text(path: str, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS,
+                     pool_factory: Optional[Callable] = None,
+                     min_parallel_pages: int = PDF_PARALLEL_MIN_PAGES) -> str:
+    """从 PDF 文件中提取文本。
+
+    只处理前 max_pages 页，文本达到 max_chars 后停止并截断。页数不少于
+    min_parallel_pages 且 pool_factory 返回多进程的 ParsePool 时，把页面切成较小的
+    连续页段，每个进程同时最多处理一段，按页序收集结果；累计文本达到 max_chars
+    后不再提交新的页段并取消尚未开始的页段，每段最多提取提交时剩余的字符数。没有 pool_factory（单条提取的情况，只有批量提取会传入）
+    或其返回 None 时在当前线程中顺序提取。
+
+    Args:
+        path: PDF 文件路径。
+        max_pages: 最多处理的页数。
+        max_chars: 最多返回的字符数。
+        pool_factory: 返回 ParsePool 或 None 的函数，只在需要并行时调用，避免为小文件启动进程池。
+        min_parallel_pages: 启用并行提取的最少页数。
+
+    Returns:
+        str: 提取到的文本。
+    """
+    import fitz
+    with fitz.open(path) as document:
+        page_count = min(len(document), max_pages)
+    pool = pool_factory() if pool_factory is not None and page_count >= min_parallel_pages else None
+    workers = pool.max_workers if pool is not None else 0
+    if workers < 2:
+        return extract_pages(path, 0, page_count, max_chars)[:max_chars]
+
+    # 每个进程分到约 4 段，文本提前达到上限时少提取一些页面
+    step = -(-page_count // (workers * 4))
+    starts = iter(range(0, page_count, step))
+    pending = deque()
+    parts: List[str] = []
+    total = 0
+    while True:
+        while len(pending) < workers:
+            start = next(starts, None)
+            if start is None:
+                break
+            pending.append(pool.submit(extract_pages, path, start, min(start + step, page_count),
+                                       max_chars - total))
+        if not pending:
+            break
+        text = pending.popleft().result()
+        parts.append(text)
+        total += len(text)
+        if total >= max_chars:
+            for future in pending:
+                future.cancel()
+            break
+    return ''.join(parts)[:max_chars]
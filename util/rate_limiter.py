@@ -0,0 +1,267 @@
+# util/rate_limiter.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import time, threading
+from typing import Dict, Optional
+
+import requests
+
+from util.log_utils import logger
+
+from config.config import (
+    THROTTLE_INITIAL_RATE, THROTTLE_MIN_RATE, THROTTLE_MAX_RATE,
+    THROTTLE_INITIAL_CONCURRENCY, THROTTLE_MAX_CONCURRENCY, THROTTLE_COOLDOWN,
+)
+
+class TokenBucket:
+    """令牌桶限速器。
+
+    令牌以 rate 个/秒的速度生成，最多积累 capacity 个。每个请求消耗一个令牌，
+    令牌不足时阻塞等待。
+
+    Attributes:
+        rate: 每秒生成的令牌数。
+        capacity: 桶容量，决定允许的突发请求数。
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def set_rate(self, rate: float) -> None:
+        """调整生成速度，桶容量随之调整为 1 秒的令牌数。"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = max(1.0, rate)
+            self._tokens = min(self._tokens, self.capacity)
+
+    def pause(self, seconds: float) -> None:
+        """在接下来的 seconds 秒内不再发放令牌，用于响应 Retry-After。"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def acquire(self) -> float:
+        """获取一个令牌，必要时阻塞。
+
+        Returns:
+            float: 本次等待的秒数。
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(wait)
+            waited += wait
+
+
+class AdaptiveThrottle:
+    """面向单个主机的自适应限流器。
+
+    由令牌桶（限制请求速率）和 AIMD 并发控制（限制在途请求数）组成：
+    请求成功时速率与并发上限线性增加；遇到 HTTP 429、5xx、超时或连接错误时
+    两者减半（乘性减少），冷却时间内的多次失败只减半一次。
+
+    Attributes:
+        name: 限流器名称，通常为主机名。
+        limit: 当前并发上限。
+        throttle_events: 触发减速的次数。
+    """
+
+    def __init__(self, name: str, rate: float = THROTTLE_INITIAL_RATE,
+                 min_rate: float = THROTTLE_MIN_RATE, max_rate: float = THROTTLE_MAX_RATE,
+                 concurrency: float = THROTTLE_INITIAL_CONCURRENCY,
+                 max_concurrency: float = THROTTLE_MAX_CONCURRENCY,
+                 cooldown: float = THROTTLE_COOLDOWN, logger=logger):
+        """初始化 AdaptiveThrottle 实例。
+
+        Args:
+            name: 限流器名称。
+            rate: 初始速率（请求/秒）。
+            min_rate: 速率下限。
+            max_rate: 速率上限。
+            concurrency: 初始并发上限。
+            max_concurrency: 并发上限的最大值。
+            cooldown: 两次减速之间的最短间隔（秒）。
+        """
+        self.name = name
+        self.bucket = TokenBucket(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.limit = float(concurrency)
+        self.max_concurrency = float(max_concurrency)
+        self.cooldown = cooldown
+        self.logger = logger
+        self.in_flight = 0
+        self.requests = 0
+        self.throttle_events = 0
+        self.wait_time = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def set_max_rate(self, max_rate: float) -> None:
+        """调整速率上限，当前速率超过上限时立即降低。"""
+        with self._cond:
+            self.max_rate = max_rate
+            if self.bucket.rate > max_rate:
+                self.bucket.set_rate(max_rate)
+
+    def set_max_concurrency(self, max_concurrency: float) -> None:
+        """调整并发上限的最大值。"""
+        with self._cond:
+            self.max_concurrency = float(max_concurrency)
+            self.limit = min(self.limit, self.max_concurrency)
+
+    def slot(self) -> '_Slot':
+        """获取一个请求名额，用作上下文管理器。
+
+        Examples:
+            with throttle.slot() as slot:
+                response = session.get(url)
+                slot.record(response)
+        """
+        return _Slot(self)
+
+    def acquire(self) -> None:
+        """等待直到在途请求数低于并发上限且有可用令牌。"""
+        started = time.monotonic()
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            self.requests += 1
+        self.bucket.acquire()
+        self.wait_time += time.monotonic() - started
+
+    def release(self, throttled: bool, retry_after: Optional[float] = None, reason: str = '') -> None:
+        """归还请求名额并根据结果调整速率与并发上限。
+
+        Args:
+            throttled: 请求是否遇到限流信号（429、5xx、超时等）。
+            retry_after: 服务端通过 Retry-After 要求等待的秒数。
+            reason: 限流原因，用于日志。
+        """
+        with self._cond:
+            self.in_flight -= 1
+            rate = self.bucket.rate
+            if not throttled:
+                # 线性增加：每个成功请求使并发上限增加 1/limit，即每轮约增加 1
+                self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+                if rate < self.max_rate:
+                    self.bucket.set_rate(min(self.max_rate, rate + 1.0))
+            else:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self._last_decrease = now
+                    self.throttle_events += 1
+                    old_limit = self.limit
+                    self.limit = max(1.0, self.limit / 2)
+                    self.bucket.set_rate(max(self.min_rate, rate / 2))
+                    self.logger.log_info(
+                        f"【Throttle】{self.name} {reason}，并发上限 {old_limit:.1f} -> {self.limit:.1f}，"
+                        f"速率 {rate:.1f} -> {self.bucket.rate:.1f} 次/秒"
+                    )
+                if retry_after:
+                    self.bucket.pause(retry_after)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        """返回当前限流状态。"""
+        with self._cond:
+            return {
+                'limit': round(self.limit, 2),
+                'rate': round(self.bucket.rate, 2),
+                'in_flight': self.in_flight,
+                'requests': self.requests,
+                'throttle_events': self.throttle_events,
+                'wait_time': round(self.wait_time, 3),
+            }
+
+
+def throttle_reason(response=None, error: Optional[BaseException] = None) -> str:
+    """判断一次请求的结果是否为限流信号。
+
+    Args:
+        response: requests 的响应对象。
+        error: 请求抛出的异常。
+
+    Returns:
+        str: 限流原因，不是限流信号时返回空字符串。
+    """
+    if isinstance(error, requests.Timeout):
+        return '请求超时'
+    if isinstance(error, requests.ConnectionError):
+        return '连接错误'
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        response = error.response
+    status = getattr(response, 'status_code', None)
+    if isinstance(status, int) and (status == 429 or status >= 500):
+        return f'HTTP {status}'
+    return ''
+
+
+def _retry_after(response) -> Optional[float]:
+    """读取 Retry-After 头中的秒数，HTTP 日期格式或缺失时返回 None。"""
+    value = (getattr(response, 'headers', None) or {}).get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class _Slot:
+    """AdaptiveThrottle.slot() 返回的上下文管理器。"""
+
+    def __init__(self, throttle: AdaptiveThrottle):
+        self.throttle = throttle
+        self.response = None
+
+    def record(self, response) -> None:
+        """记录响应，用于在退出时判断是否遇到限流。"""
+        self.response = response
+
+    def __enter__(self) -> '_Slot':
+        self.throttle.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        reason = throttle_reason(self.response, exc_value)
+        response = self.response
+        if response is None and isinstance(exc_value, requests.HTTPError):
+            response = exc_value.response
+        retry_after = _retry_after(response) if reason == 'HTTP 429' else None
+        self.throttle.release(bool(reason), retry_after, reason)
+        return False
+
+
+_throttles: Dict[str, AdaptiveThrottle] = {}
+_throttles_lock = threading.Lock()
+
+def get_throttle(name: str) -> AdaptiveThrottle:
+    """获取指定名称（通常为主机名）的共享限流器，不存在时创建。"""
+    with _throttles_lock:
+        throttle = _throttles.get(name)
+        if throttle is None:
+            throttle = _throttles[name] = AdaptiveThrottle(name)
+        return throttle
+
+
+def throttle_stats() -> Dict[str, Dict[str, float]]:
+    """返回所有限流器的状态。"""
+    with _throttles_lock:
+        throttles = list(_throttles.values())
+    return {throttle.name: throttle.stats() for throttle in throttles}
@@ -0,0 +1,26 @@
+# util/readability_extractor.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import copy
+
+from readability import Document
+
+# readability 导入较慢，本模块只在第一次使用 readability 提取时导入
+
+
+class TreeReadability(Document):
+    """从共享 lxml 树开始提取的 readability Document，并保留最终选中的正文节点。
+
+    summary() 每一轮都会重新调用 _parse，这里每轮深拷贝传入的树而不是重新解析 HTML，
+    传入的树本身不会被修改。
+    """
+    article_node = None
+
+    def _parse(self, input):
+        return super()._parse(copy.deepcopy(input))
+
+    def sanitize(self, node, candidates, keep_all_images=False):
+        html = super().sanitize(node, candidates, keep_all_images)
+        self.article_node = node
+        return html
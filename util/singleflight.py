@@ -0,0 +1,67 @@
+# util/singleflight.py
+import sys,os
+sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+class _Call:
+    """一次正在进行的调用。"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """合并并发的重复调用。
+
+    同一个 key 的调用正在进行时，其他线程对该 key 的调用不会重复执行，而是
+    等待并共享第一次调用的结果（或异常）。调用完成后 key 即被释放，之后的
+    调用会重新执行，因此它只负责去重在途请求，不负责缓存。
+
+    Attributes:
+        coalesced: 被合并（未实际执行）的调用次数。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """执行 func，同一 key 的并发调用只执行一次。
+
+        Args:
+            key: 用于识别重复调用的键。
+            func: 无参数的调用。
+
+        Returns:
+            func 的返回值。
+
+        Raises:
+            func 抛出的异常会传递给所有等待该 key 的调用方。
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
@@ -2,7 +2,10 @@ import sys,os
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
 
 import re
-from typing import Optional
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+from util.parse_pool import ParsePool
 from util.rule_patterns \
     import (
             HTML_TAG_PATTERN,
@@ -11,9 +14,35 @@ from util.rule_patterns \
             HALF_ANGLE_ALPHABET,
             EMAIL_PATTERN,
             REDUNDANT_PATTERN,
-            IP_ADDRESS_PATTERN
+            IP_SINGLE
         )
 
+from config.config import CLEAN_MAX_WORKERS, CLEAN_CHUNK_SIZE, CLEAN_MAX_PENDING
+
+# 前后不是数字的 IP 地址；(?<!...) 在文本开头也成立，不必在文本两端补字符
+IP_ADDRESS_PATTERN = ''.join(
+    [r'(?<![0-9])(?:', IP_SINGLE, r'\.', IP_SINGLE, r'\.', IP_SINGLE, r'\.', IP_SINGLE, r')(?![0-9])'])
+
+
+class CleanTable(dict):
+    """str.translate 使用的字符映射：删除异常字符，并把全角字符转换为半角。
+
+    异常字符由一个不可穷举的字符类定义，因此不预先生成映射，而是在第一次遇到
+    某个字符时用 exception_pattern 判断并缓存结果，之后查表即可。
+    """
+
+    def __init__(self, exception_pattern: re.Pattern, full2half: dict) -> None:
+        super().__init__()
+        self.exception_pattern = exception_pattern
+        self.full2half = full2half
+
+    def __missing__(self, code: int):
+        char = chr(code)
+        value = None if self.exception_pattern.match(char) else self.full2half.get(code, code)
+        self[code] = value
+        return value
+
+
 class TextCleaner:
     """文本清理类，用于移除文本中的HTML标签和URL。
 
@@ -23,6 +52,8 @@ class TextCleaner:
     Attributes:
         html_tag_pattern (re.Pattern): 匹配HTML标签的正则表达式模式。
         url_pattern (re.Pattern): 匹配URL的正则表达式模式。
+        clean_table (CleanTable): 同时删除异常字符与全角转半角的 translate 映射。
+        collapse_ip_pattern (re.Pattern): 同时匹配冗余字符与 IP 地址的正则表达式模式。
     """
 
     def __init__(self) -> None:
@@ -37,7 +68,16 @@ class TextCleaner:
         self.redundant_pattern = self.generate_redundant_pattern()
         self.full_angle_pattern = str.maketrans(FULL_ANGLE_ALPHABET, HALF_ANGLE_ALPHABET)
         self.ip_address_pattern = re.compile(IP_ADDRESS_PATTERN)
-        
+        # clean_text 使用的合并规则：异常字符与全角转半角合并为一次 translate，
+        # 冗余字符与 IP 地址合并为一次扫描
+        self.clean_table = CleanTable(self.exception_pattern, self.full_angle_pattern)
+        # 先用前瞻排除既不是冗余字符也不是数字的位置，避免逐个位置尝试 IP 规则的后顾
+        redundant_class = ''.join(re.escape(char) for char in REDUNDANT_PATTERN)
+        self.collapse_pattern: re.Pattern = re.compile(f'(?P<char>[{redundant_class}])(?P=char)+')
+        self.collapse_ip_pattern: re.Pattern = re.compile(
+            f'(?=[{redundant_class}0-9])(?:{IP_ADDRESS_PATTERN}|(?P<char>[{redundant_class}])(?P=char)+)'
+        )
+
     def generate_redundant_pattern(self, redundant_chars=None):
         pattern_list = list()
         if redundant_chars is None:
@@ -62,7 +102,6 @@ class TextCleaner:
             str: 移除HTML标签后的文本。
         """
         cleaned_text = self.html_tag_pattern.sub('', text)
-        print(f"HTML标签已移除: {cleaned_text}")  # 打印移除标签后的文本
         return cleaned_text
 
     def remove_urls(self, text: str) -> str:
@@ -75,7 +114,6 @@ class TextCleaner:
             str: 移除URL后的文本。
         """
         cleaned_text = self.url_pattern.sub('', text)
-        print(f"URL已移除: {cleaned_text}")  # 打印移除URL后的文本
         return cleaned_text
 
     def remove_exception_char(self, text: str) -> str:
@@ -88,7 +126,6 @@ class TextCleaner:
             str: 移除异常字符后的文本。
         """
         cleaned_text = self.exception_pattern.sub('', text)
-        print(f"异常字符已移除: {cleaned_text}")
         return cleaned_text
 
     def convert_full2half(self, text):
@@ -107,7 +144,6 @@ class TextCleaner:
             str: 移除邮箱地址后的文本。
         """
         cleaned_text = self.email_pattern.sub('', text)
-        print(f"邮箱地址已移除: {cleaned_text}")
         return cleaned_text
     
     def remove_redundant_char(self, text):
@@ -134,12 +170,14 @@ class TextCleaner:
             str: 删除 ip 地址后的文本
 
         """
-            
-        text = ''.join(['#', text, '#'])
-        return self.ip_address_pattern.sub('', text)[1:-1]
+        return self.ip_address_pattern.sub('', text)
     
     def clean_text(self, text: Optional[str]) -> str:
-        """清理文本，移除HTML标签和URL。
+        """清理文本，依次移除 HTML 标签、URL、异常字符、邮箱，全角转半角，去除冗余字符与 IP 地址。
+
+        结果与依次调用各个 remove_* 方法相同，但尽量减少扫描次数：文本中不含
+        某一步的触发字符（"<"、"://"、"@"）时跳过该步；异常字符与全角转半角
+        在同一次 translate 中完成；冗余字符与 IP 地址在同一次正则扫描中删除。
 
         Args:
             text (Optional[str]): 需要清理的文本。如果为None，则返回空字符串。
@@ -148,20 +186,100 @@ class TextCleaner:
             str: 完成清理后的文本。
         """
         if not text:
-            print("输入文本为空或无效。")  # 打印无效输入提示
             return ''
 
-        # 依次调用移除HTML标签和URL的函数
-        cleaned_text = self.remove_html_tags(text)
-        cleaned_text = self.remove_urls(cleaned_text)
-        cleaned_text = self.remove_exception_char(cleaned_text)
-        cleaned_text = self.remove_email(cleaned_text)
-        cleaned_text = self.convert_full2half(cleaned_text)
-        cleaned_text = self.remove_redundant_char(cleaned_text)
-        cleaned_text = self.remove_ip_address(cleaned_text)
-        
-        print(f"清理后的文本: {cleaned_text}")  # 打印清理后的最终文本
-        return cleaned_text
+        if '<' in text and '>' in text:
+            text = self.html_tag_pattern.sub('', text)
+        if '://' in text:
+            text = self.url_pattern.sub('', text)
+        if '@' in text:
+            # 邮箱规则依赖删除异常字符之后、全角转半角之前的文本，不能合并
+            text = self.exception_pattern.sub('', text)
+            text = self.email_pattern.sub('', text)
+        text = text.translate(self.clean_table)
+        # 冗余字符与 IP 地址互不重叠，也不改变相邻字符是否为数字，可以一次扫描完成
+        pattern = self.collapse_ip_pattern if '.' in text else self.collapse_pattern
+        return pattern.sub(r'\g<char>', text)
+
+    def clean_many(self, texts: List) -> List[str]:
+        """清理一组文本，不是字符串的值（如 pandas 中的 NaN）清理为空字符串。"""
+        return [self.clean_text(text) if isinstance(text, str) else '' for text in texts]
+
+    def clean_batch(self, texts: Iterable, chunk_size: int = CLEAN_CHUNK_SIZE,
+                    max_workers: int = CLEAN_MAX_WORKERS, max_pending: int = CLEAN_MAX_PENDING,
+                    pool: Optional[ParsePool] = None) -> Iterator[str]:
+        """
+        在进程池中批量清理文本，按输入顺序逐条返回结果。
+
+        texts 按 chunk_size 条切块提交给进程池，每个进程在启动时创建一个 TextCleaner，
+        正则只编译一次。同时排队的块不超过 max_workers × max_pending 个，读取输入与
+        返回结果都是流式的，内存占用取决于块大小而不是文本总量，texts 可以是生成器。
+
+        Args:
+            texts (Iterable): 待清理的文本，可以是列表、生成器或 pandas Series。
+            chunk_size (int): 每个任务包含的文本条数。
+            max_workers (int): 清理进程数，0 表示在当前进程中清理。
+            max_pending (int): 每个进程最多排队的任务数。
+            pool (Optional[ParsePool]): 以 init_clean_worker 初始化的进程池，多次调用时可以复用；
+                默认按 max_workers 新建，迭代结束后关闭。
+
+        Returns:
+            Iterator[str]: 与 texts 顺序一致的清理结果。
+        """
+        chunk_size = max(1, chunk_size)
+        iterator = iter(texts)
+        if pool is None and max_workers <= 0:
+            for chunk in iter(lambda: list(islice(iterator, chunk_size)), []):
+                yield from self.clean_many(chunk)
+            return
+
+        owned = pool is None
+        if owned:
+            pool = ParsePool(max_workers, initializer=init_clean_worker)
+        limit = max(1, pool.max_workers) * max(1, max_pending)
+        pending = deque()
+        try:
+            for chunk in iter(lambda: list(islice(iterator, chunk_size)), []):
+                if len(pending) >= limit:
+                    yield from pending.popleft().result()
+                pending.append(pool.submit(clean_chunk, chunk))
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            if owned:
+                pool.shutdown(wait=True)
+
+    def clean_series(self, series, **kwargs):
+        """
+        批量清理 pandas Series，返回索引与名称不变的新 Series。
+
+        Args:
+            series (pandas.Series): 待清理的文本。
+            **kwargs: 传给 clean_batch 的参数。
+
+        Returns:
+            pandas.Series: 清理后的文本。
+        """
+        import pandas as pd  # pandas 是可选依赖，只在清理 Series 时导入
+        return pd.Series(list(self.clean_batch(series, **kwargs)), index=series.index, name=series.name,
+                         dtype=object)
+
+
+# 清理进程中常驻的 TextCleaner，由 init_clean_worker 创建
+_clean_worker = None
+
+def init_clean_worker():
+    """清理进程的初始化函数：创建常驻的 TextCleaner，正则在每个进程中只编译一次。"""
+    global _clean_worker
+    _clean_worker = TextCleaner()
+
+def clean_chunk(texts: List) -> List[str]:
+    """在清理进程中清理一块文本。"""
+    if _clean_worker is None:
+        init_clean_worker()
+    return _clean_worker.clean_many(texts)
 
 
 # 验证步骤：测试TextCleaner类
@@ -1,33 +1,123 @@
 import sys,os
 sys.path.append(os.path.abspath(os.path.dirname(__file__) + '/' + '..'))
 
-import time
+import time, random, threading
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from functools import wraps
+from typing import Callable, Dict, Optional
+
+import requests
+
+### 截止时间 ###
+# 当前调用链的截止时间（time.monotonic() 时刻），由 deadline() 设置，随上下文传递
+_deadline: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+@contextmanager
+def deadline(seconds: float):
+    """在 with 块内设置截止时间，与外层已有的截止时间取较早者。
+
+    截止时间保存在 contextvars 中，嵌套的 retry 与 HttpTransport 的超时都以它为上限，
+    通过 HostScheduler 提交的任务也会继承提交时的截止时间。
+
+    Args:
+        seconds: 从现在起可用的秒数。
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def time_left() -> Optional[float]:
+    """返回距截止时间的秒数，没有设置截止时间时返回 None。"""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
 
 ### 重试装饰器 ###
-class EmptyContentError(Exception):
-    """Custom exception raised when the content is empty or None."""
-    pass
-def retry(retries=3, delay=2, exceptions=(Exception,), logger=None):
+# 值得重试的 HTTP 状态码：超时、限流与服务端错误
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+def is_retryable(exc: BaseException) -> bool:
+    """判断异常是否值得重试：超时、连接错误与 5xx/429 重试，4xx 与解析错误不重试。"""
+    if isinstance(exc, requests.HTTPError):
+        return getattr(exc.response, 'status_code', None) in RETRYABLE_STATUS
+    return isinstance(exc, (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError))
+
+_retry_stats: Dict[str, Dict[str, int]] = {}
+_retry_stats_lock = threading.Lock()
+
+def _count(name: str, key: str) -> None:
+    with _retry_stats_lock:
+        stats = _retry_stats.setdefault(
+            name, {'calls': 0, 'attempts': 0, 'retries': 0, 'failures': 0, 'deadline_exceeded': 0}
+        )
+        stats[key] += 1
+
+def retry_stats() -> Dict[str, Dict[str, int]]:
+    """按函数返回调用数、尝试数、重试数、放弃数以及因截止时间放弃的次数。"""
+    with _retry_stats_lock:
+        return {name: dict(stats) for name, stats in _retry_stats.items()}
+
+def retry(retries=3, delay=0.5, max_delay=10.0, budget: Optional[float] = None,
+          retry_on: Callable[[BaseException], bool] = is_retryable, default='', logger=None):
+    """重试装饰器：指数退避加随机抖动，只重试 retry_on 认可的异常，不超过截止时间。
+
+    第 n 次重试前等待 [0, min(max_delay, delay * 2^(n-1))] 内的随机时长。函数正常返回
+    （包括返回空值）时直接返回；异常不可重试、次数用尽或剩余时间不足以等待下一次
+    重试时放弃并返回 default。
+
+    Args:
+        retries: 最多尝试的次数。
+        delay: 第一次重试前等待时长的上限（秒）。
+        max_delay: 单次等待时长的上限（秒）。
+        budget: 单次调用（含所有重试）的时间预算，与外层截止时间取较早者。
+        retry_on: 判断异常是否值得重试的函数。
+        default: 放弃时的返回值。
+        logger: 记录异常的 logger，为 None 时打印。
+    """
     def decorator_retry(func):
+        name = func.__qualname__
+
+        def log(message: str, exception: bool = False) -> None:
+            if logger is None:
+                print(message)
+            elif exception:
+                logger.log_exception()
+            else:
+                logger.log_info(message)
+
         @wraps(func)
         def wrapper_retry(*args, **kwargs):
-            for attempt in range(retries):
-                try:
-                    ret = func(*args, **kwargs)
-                    if not ret:
-                        raise EmptyContentError("Returned value is empty or None")
-                    return ret
-                except exceptions as e:
-                    if logger:
-                        logger.log_exception()
-                    else:
-                        print(f"Attempt {attempt + 1} failed with error: {e}. Retrying in {delay} seconds...")
-                    time.sleep(delay)
-            if logger:
-                logger.log_info(f"All {retries} attempts failed.")
-            else:
-                print(f"All {retries} attempts failed.")
-            return ''
+            _count(name, 'calls')
+            with deadline(budget) if budget is not None else nullcontext():
+                for attempt in range(retries):
+                    left = time_left()
+                    if left is not None and left <= 0:
+                        _count(name, 'deadline_exceeded')
+                        log(f"{name}: deadline exceeded after {attempt} attempts.")
+                        break
+                    _count(name, 'attempts')
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as e:
+                        log(f"Attempt {attempt + 1} of {name} failed with error: {e}", exception=True)
+                        if not retry_on(e):
+                            break
+                    if attempt == retries - 1:
+                        log(f"All {retries} attempts of {name} failed.")
+                        break
+                    pause = random.uniform(0, min(max_delay, delay * 2 ** attempt))
+                    left = time_left()
+                    if left is not None and pause >= left:
+                        _count(name, 'deadline_exceeded')
+                        log(f"{name}: no time left to retry after {attempt + 1} attempts.")
+                        break
+                    _count(name, 'retries')
+                    time.sleep(pause)
+            _count(name, 'failures')
+            return default
         return wrapper_retry
-    return decorator_retry
\ No newline at end of file
+    return decorator_retry